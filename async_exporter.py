@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from export_checkpoint import ExportCheckpoint
+from metadata_cache import KIND_ALBUM, KIND_ARTIST
+from playlist_exporter import (
+    ALBUMS_BATCH_SIZE,
+    ARTISTS_BATCH_SIZE,
+    ALBUM_LOOKUP_FIELDS,
+    ARTIST_LOOKUP_FIELDS,
+    EXTENDED_TRACK_FIELDS,
+    SPOTIFY_ALBUMS_URL,
+    SPOTIFY_ARTISTS_URL,
+    _archive_export,
+    _build_playlist_meta,
+    _collect_album_and_artist_ids,
+    _extract_page_tracks,
+    _fetch_audio_features,
+    _fetch_entities_batched,
+    _fetch_page_tracks,
+    _fetch_playlist_head,
+    _follow_next_pages,
+    _iter_extended_tracks,
+    _open_export_checkpoint,
+    _page_size_at,
+    _remaining_page_offsets,
+    _resolve_genre_info,
+)
+from config import get_settings
+
+
+# ---------------------------------------------------------------------------
+# Async-Export-Engine
+# ---------------------------------------------------------------------------
+#
+# Alternative zu playlist_exporter.fetch_playlist_tracks_extended(): statt
+# Paging -> Audio-Features -> Genres nacheinander abzuarbeiten, startet jede
+# geladene Playlist-Seite sofort ihre Audio-Features- und Album-/Artist-
+# Batches. Alle Requests laufen unter einem globalen Concurrency-Limit; die
+# Rate begrenzt der prozessweite Token-Bucket im HTTP-Layer (rate_limiter).
+#
+# Die eigentlichen HTTP-Aufrufe bleiben die synchronen Helfer aus
+# playlist_exporter (gemeinsame Session, Retries, Token-Handling,
+# Metadaten-Cache) und laufen per asyncio.to_thread. Dadurch braucht die
+# Engine keine zusätzliche Abhängigkeit (z. B. aiohttp) und liefert exakt
+# dieselbe Struktur { playlist: {...}, tracks: [...] }.
+
+T = TypeVar("T")
+
+
+class _AsyncExportRun:
+    """
+    Zustand eines asynchronen Exports: Limits, gestartete Anreicherungs-Tasks
+    und die bereits gesammelten Ergebnisse.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        max_concurrency: int,
+    ) -> None:
+        self.access_token = access_token
+        # wird nach dem Laden des Playlist-Objekts gesetzt (snapshot_id)
+        self.checkpoint: Optional[ExportCheckpoint] = None
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        self.tasks: List[asyncio.Task[Any]] = []
+        self.audio_features_by_id: Dict[str, Dict[str, Any]] = {}
+        self.albums_by_id: Dict[str, Dict[str, Any]] = {}
+        self.artists_by_id: Dict[str, Dict[str, Any]] = {}
+
+        # Album-/Artist-IDs, die noch auf einen vollen Batch warten
+        self._seen_album_ids: set[str] = set()
+        self._seen_artist_ids: set[str] = set()
+        self._pending_album_ids: List[str] = []
+        self._pending_artist_ids: List[str] = []
+
+    async def call(self, func: Callable[..., T], *args: Any) -> T:
+        """Führt einen synchronen Request-Helfer unter der Semaphore aus."""
+        async with self.semaphore:
+            return await asyncio.to_thread(func, *args)
+
+    # --- Anreicherung -------------------------------------------------------
+
+    def enqueue_tracks(self, tracks: List[Dict[str, Any]]) -> None:
+        """
+        Startet für eine frisch geladene Seite die Audio-Features-Abfrage
+        (eine Seite = ein Batch) und füllt die Album-/Artist-Batches auf.
+        """
+        track_ids = [t["id"] for t in tracks if t.get("id")]
+        if track_ids:
+            self._spawn(self._load_audio_features(track_ids))
+
+        album_ids, artist_ids = _collect_album_and_artist_ids(tracks)
+        for album_id in album_ids:
+            if album_id not in self._seen_album_ids:
+                self._seen_album_ids.add(album_id)
+                self._pending_album_ids.append(album_id)
+        for artist_id in artist_ids:
+            if artist_id not in self._seen_artist_ids:
+                self._seen_artist_ids.add(artist_id)
+                self._pending_artist_ids.append(artist_id)
+
+        self._flush_lookups(final=False)
+
+    def _flush_lookups(self, final: bool) -> None:
+        """Startet volle Album-/Artist-Batches (final=True: auch den Rest)."""
+        while len(self._pending_album_ids) >= ALBUMS_BATCH_SIZE or (
+            final and self._pending_album_ids
+        ):
+            chunk = self._pending_album_ids[:ALBUMS_BATCH_SIZE]
+            del self._pending_album_ids[:ALBUMS_BATCH_SIZE]
+            self._spawn(self._load_albums(chunk))
+
+        while len(self._pending_artist_ids) >= ARTISTS_BATCH_SIZE or (
+            final and self._pending_artist_ids
+        ):
+            chunk = self._pending_artist_ids[:ARTISTS_BATCH_SIZE]
+            del self._pending_artist_ids[:ARTISTS_BATCH_SIZE]
+            self._spawn(self._load_artists(chunk))
+
+    def _spawn(self, coro: Any) -> None:
+        self.tasks.append(asyncio.create_task(coro))
+
+    async def _load_audio_features(self, track_ids: List[str]) -> None:
+        features = await self.call(
+            _fetch_audio_features, self.access_token, track_ids, self.checkpoint
+        )
+        self.audio_features_by_id.update(features)
+
+    async def _load_albums(self, album_ids: List[str]) -> None:
+        albums = await self.call(
+            _fetch_entities_batched,
+            self.access_token,
+            SPOTIFY_ALBUMS_URL,
+            album_ids,
+            ALBUMS_BATCH_SIZE,
+            "albums",
+            KIND_ALBUM,
+            ALBUM_LOOKUP_FIELDS,
+            self.checkpoint,
+        )
+        self.albums_by_id.update(albums)
+
+    async def _load_artists(self, artist_ids: List[str]) -> None:
+        artists = await self.call(
+            _fetch_entities_batched,
+            self.access_token,
+            SPOTIFY_ARTISTS_URL,
+            artist_ids,
+            ARTISTS_BATCH_SIZE,
+            "artists",
+            KIND_ARTIST,
+            ARTIST_LOOKUP_FIELDS,
+            self.checkpoint,
+        )
+        self.artists_by_id.update(artists)
+
+    async def wait_for_enrichment(self) -> None:
+        """Startet die restlichen Batches und wartet auf alle Tasks."""
+        self._flush_lookups(final=True)
+        await asyncio.gather(*self.tasks)
+
+    # --- Paging -------------------------------------------------------------
+
+    async def load_page(
+        self,
+        playlist_id: str,
+        offset: int,
+        limit: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        saved = self.checkpoint.load_page(offset) if self.checkpoint else None
+        if saved is not None:
+            # Aus dem Checkpoint: kein Request, keine Semaphore nötig
+            tracks = saved
+        else:
+            tracks = await self.call(
+                _fetch_page_tracks,
+                self.access_token,
+                playlist_id,
+                offset,
+                True,
+                _page_size_at(offset, limit),
+                EXTENDED_TRACK_FIELDS,
+                self.checkpoint,
+            )
+        self.enqueue_tracks(tracks)
+        return tracks
+
+
+async def fetch_playlist_tracks_extended_async(
+    access_token: str,
+    playlist_id: str,
+    max_concurrency: int | None = None,
+    limit: int | None = None,
+    stream_tracks: bool = False,
+    archive: bool = False,
+    checkpoint: bool = False,
+) -> Dict[str, Any]:
+    """
+    Async-Pendant zu playlist_exporter.fetch_playlist_tracks_extended().
+
+    - max_concurrency: globale Obergrenze gleichzeitiger Requests
+      (Default: AsyncMaxConcurrency)
+    - limit: nur die ersten 'limit' Tracks laden und anreichern
+    - stream_tracks: 'tracks' als Generator liefern (für den Streaming-Writer)
+    - archive: Rohdaten zusätzlich im response_archive ablegen
+    - checkpoint: Seiten und Batches im export_checkpoint sichern bzw.
+      übernehmen (gleiches Format wie die Sync-Engine)
+    """
+    run = _AsyncExportRun(
+        access_token,
+        get_settings().async_max_concurrency if max_concurrency is None else max_concurrency,
+    )
+
+    playlist_full = await run.call(_fetch_playlist_head, access_token, playlist_id)
+    if checkpoint:
+        run.checkpoint = _open_export_checkpoint(playlist_id, playlist_full, limit)
+    track_page = playlist_full.get("tracks") or {}
+
+    first_tracks = _extract_page_tracks(track_page)[:limit]
+    run.enqueue_tracks(first_tracks)
+
+    offsets = _remaining_page_offsets(track_page, limit)
+    pages: List[List[Dict[str, Any]]]
+    if offsets is None:
+        # Ohne 'tracks.total' bleibt nur das serielle Paging über 'next'
+        rest = await run.call(
+            _follow_next_pages,
+            access_token,
+            track_page,
+            True,
+            None if limit is None else limit - len(first_tracks),
+        )
+        if limit is not None:
+            rest = rest[: limit - len(first_tracks)]
+        run.enqueue_tracks(rest)
+        pages = [rest]
+    else:
+        # gather() liefert die Seiten in Reihenfolge der Offsets
+        pages = await asyncio.gather(
+            *(run.load_page(playlist_id, offset, limit) for offset in offsets)
+        )
+
+    all_tracks: List[Dict[str, Any]] = list(first_tracks)
+    for page_tracks in pages:
+        all_tracks.extend(page_tracks)
+    all_tracks = all_tracks[:limit]
+    playlist_full["__all_tracks__"] = all_tracks
+
+    await run.wait_for_enrichment()
+
+    genre_info_by_track_id: Dict[str, Dict[str, Any]] = {}
+    for t in all_tracks:
+        track_id: Optional[str] = t.get("id")
+        if track_id:
+            genre_info_by_track_id[track_id] = _resolve_genre_info(
+                t, run.albums_by_id, run.artists_by_id
+            )
+
+    if archive:
+        _archive_export(
+            playlist_id,
+            playlist_full,
+            run.audio_features_by_id,
+            run.albums_by_id,
+            run.artists_by_id,
+            limit=limit,
+        )
+
+    extended_tracks = _iter_extended_tracks(
+        playlist_full,
+        run.audio_features_by_id,
+        genre_info_by_track_id,
+    )
+
+    return {
+        "playlist": _build_playlist_meta(
+            playlist_id, playlist_full, len(all_tracks), limit
+        ),
+        "tracks": extended_tracks if stream_tracks else list(extended_tracks),
+    }
+
+
+def run_fetch_playlist_tracks_extended_async(
+    access_token: str,
+    playlist_id: str,
+    max_concurrency: int | None = None,
+    limit: int | None = None,
+    stream_tracks: bool = False,
+    archive: bool = False,
+    checkpoint: bool = False,
+) -> Dict[str, Any]:
+    """Synchroner Einstiegspunkt (asyncio.run) für CLI und Exporter."""
+    return asyncio.run(
+        fetch_playlist_tracks_extended_async(
+            access_token,
+            playlist_id,
+            max_concurrency=max_concurrency,
+            limit=limit,
+            stream_tracks=stream_tracks,
+            archive=archive,
+            checkpoint=checkpoint,
+        )
+    )
@@ -0,0 +1,163 @@
+"""
+Benchmark: Download-Engines von run-downloads im Vergleich.
+
+Lädt N kleine Audiodateien von einem lokalen HTTP-Server (keine
+YouTube-Anfragen) einmal mit yt-dlp als Subprozess pro Track und einmal über
+die In-Process-Engine (ytdlp_engine.py) und misst:
+- den ersten Track (inkl. Prozessstart bzw. Start des Worker-Pools)
+- die übrigen Tracks (Median) = Overhead pro Track im laufenden Betrieb
+- die Gesamtzeit
+
+Beide Wege nutzen denselben Format-Selector und dasselbe Ausgabe-Template
+(yt_dlp_runner._download_job). Voraussetzung: `yt-dlp` im PATH und das
+Python-Paket yt_dlp.
+
+Aufruf (im Projektordner):
+    python -m benchmarks.bench_download_engine --tracks 20
+    python -m benchmarks.bench_download_engine --tracks 40 --jobs 4 --size-kb 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from yt_dlp_runner import DownloadJob, _download_job, build_format_selector
+from ytdlp_engine import InProcessEngine, is_available
+
+
+def _make_handler(payload: bytes) -> type:
+    class _AudioHandler(BaseHTTPRequestHandler):
+        def _send_headers(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mp4")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+
+        def do_HEAD(self) -> None:  # noqa: N802
+            self._send_headers()
+
+        def do_GET(self) -> None:  # noqa: N802
+            self._send_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            pass
+
+    return _AudioHandler
+
+
+def _jobs(base_url: str, target_dir: Path, count: int) -> List[DownloadJob]:
+    target_dir.mkdir(parents=True, exist_ok=True)
+    return [
+        DownloadJob(
+            playlist_id="bench",
+            track_index=i,
+            title=f"Track {i}",
+            primary_artist="Bench",
+            search_query=f"{base_url}/track_{i:04d}.m4a",
+            target_dir=target_dir,
+            output_stem=f"{i + 1:04d} Track {i}",
+        )
+        for i in range(count)
+    ]
+
+
+def _run_engine(
+    jobs: List[DownloadJob],
+    workers: int,
+    engine: Optional[InProcessEngine],
+) -> Tuple[List[float], float, int]:
+    """Zeiten pro Track (in Job-Reihenfolge), Gesamtzeit, Anzahl Fehler."""
+    durations = [0.0] * len(jobs)
+    failures = 0
+
+    def run_one(index: int) -> int:
+        start = time.perf_counter()
+        result = _download_job(jobs[index], engine)
+        durations[index] = time.perf_counter() - start
+        if result.returncode != 0:
+            print(f"[BENCH] Fehler bei {jobs[index].search_query}: {result.stderr.strip()}")
+            return 1
+        return 0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        failures = sum(pool.map(run_one, range(len(jobs))))
+    total = time.perf_counter() - start
+    return durations, total, failures
+
+
+def _print_row(label: str, durations: List[float], total: float) -> None:
+    first_ms = durations[0] * 1000
+    rest = durations[1:] or durations
+    median_ms = statistics.median(rest) * 1000
+    print(f"{label:<14} {first_ms:>10.0f} ms {median_ms:>12.1f} ms {total:>10.2f} s")
+
+
+def run(args: argparse.Namespace) -> int:
+    if not is_available():
+        print("[BENCH] Das Python-Paket yt_dlp ist nicht installiert (pip install yt-dlp).")
+        return 2
+
+    payload = bytes(args.size_kb * 1024)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(payload))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    failed = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs_sub = _jobs(base_url, Path(tmp) / "subprocess", args.tracks)
+            sub_durations, sub_total, sub_failed = _run_engine(jobs_sub, args.jobs, None)
+
+            jobs_inp = _jobs(base_url, Path(tmp) / "inprocess", args.tracks)
+            with InProcessEngine(build_format_selector(), args.jobs) as engine:
+                inp_durations, inp_total, inp_failed = _run_engine(
+                    jobs_inp, args.jobs, engine
+                )
+            failed = sub_failed + inp_failed
+    finally:
+        server.shutdown()
+
+    print(
+        f"[BENCH] {args.tracks} Track(s) à {args.size_kb} KB, "
+        f"{args.jobs} Worker, lokaler HTTP-Server"
+    )
+    print(f"{'Engine':<14} {'1. Track':>13} {'Median danach':>15} {'Gesamt':>12}")
+    _print_row("subprocess", sub_durations, sub_total)
+    _print_row("inprocess", inp_durations, inp_total)
+
+    saved_ms = (
+        statistics.median(sub_durations[1:] or sub_durations)
+        - statistics.median(inp_durations[1:] or inp_durations)
+    ) * 1000
+    print()
+    print(f"Overhead pro Track gespart (Median): {saved_ms:.1f} ms")
+
+    if failed:
+        print(f"[BENCH] {failed} Download(s) fehlgeschlagen.")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der yt-dlp-Download-Engines.")
+    parser.add_argument("--tracks", type=int, default=20, help="Anzahl Downloads pro Engine")
+    parser.add_argument("--jobs", type=int, default=1, help="parallele Downloads")
+    parser.add_argument("--size-kb", type=int, default=256, help="Größe einer Datei in KB")
+    args = parser.parse_args()
+
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
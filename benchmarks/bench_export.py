@@ -0,0 +1,178 @@
+"""
+Benchmark: Extended-Export gegen den lokalen Stand-in-Server.
+
+Startet benchmarks.spotify_standin mit einer synthetischen (oder
+aufgezeichneten) Playlist, lenkt den Exporter per SPOTIFY_API_BASE_URL /
+SPOTIFY_TOKEN_URL darauf um und misst pro Lauf:
+- Dauer und Tracks/s
+- Requests pro Endpunkt (Sicht des Servers) inkl. 429 und 304
+- erwartete Mindestanzahl Requests (Regression: mehr Requests = Exit-Code 1)
+
+Laufzeitdaten (Token-, Metadaten-, ETag-Cache) landen in einem temporären
+TRACKBRIDGE_DATA_DIR; --warm wiederholt den Export mit gefülltem Cache.
+
+Aufruf (im Projektordner):
+    python -m benchmarks.bench_export --tracks 20000
+    python -m benchmarks.bench_export --tracks 50000 --engine async --latency-ms 30
+    python -m benchmarks.bench_export --tracks 10000 --throttle-every 200 --rate 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.spotify_standin import (
+    MAX_IDS_BY_ENDPOINT,
+    MAX_PAGE_SIZE,
+    StandinFixtures,
+    StandinOptions,
+    StandinServer,
+    synthetic_fixtures,
+)
+
+
+def expected_requests(fixtures: StandinFixtures, playlist_id: str) -> Dict[str, int]:
+    """Mindestanzahl Requests für einen Export mit leerem Cache."""
+    tracks = [
+        item.get("track") or {}
+        for item in fixtures.playlists[playlist_id]["items"]
+    ]
+    track_ids = {t["id"] for t in tracks if t.get("id")}
+    album_ids = {(t.get("album") or {}).get("id") for t in tracks} - {None}
+    artist_ids = {a.get("id") for t in tracks for a in t.get("artists") or []} - {None}
+    pages = max(1, math.ceil(len(tracks) / MAX_PAGE_SIZE))
+
+    return {
+        "playlist": 1,
+        "playlist_tracks": pages - 1,
+        "audio-features": math.ceil(len(track_ids) / MAX_IDS_BY_ENDPOINT["audio-features"]),
+        "albums": math.ceil(len(album_ids) / MAX_IDS_BY_ENDPOINT["albums"]),
+        "artists": math.ceil(len(artist_ids) / MAX_IDS_BY_ENDPOINT["artists"]),
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    if args.fixtures:
+        fixtures = StandinFixtures.load(args.fixtures)
+        playlist_id = args.playlist_id or next(iter(fixtures.playlists))
+    else:
+        playlist_id = args.playlist_id or "standin"
+        fixtures = synthetic_fixtures(playlist_id, args.tracks)
+    track_count = len(fixtures.playlists[playlist_id]["items"])
+
+    options = StandinOptions(
+        latency_ms=args.latency_ms,
+        throttle_every=args.throttle_every,
+        retry_after=args.retry_after,
+        etags=not args.no_etags,
+    )
+
+    with StandinServer(fixtures, options) as server, tempfile.TemporaryDirectory() as tmp:
+        # Muss vor dem ersten Import von config/playlist_exporter passieren
+        os.environ["SPOTIFY_API_BASE_URL"] = server.api_base_url
+        os.environ["SPOTIFY_TOKEN_URL"] = server.token_url
+        os.environ["SPOTIFY_CLIENT_ID"] = "standin"
+        os.environ["SPOTIFY_CLIENT_SECRET"] = "standin"
+        os.environ["TRACKBRIDGE_DATA_DIR"] = str(Path(tmp) / "data")
+
+        from playlist_exporter import export_playlist_to_json
+        from playlist_store import iter_playlist_tracks
+        from rate_limiter import configure_rate_limiter
+
+        if args.rate is not None:
+            configure_rate_limiter(args.rate)
+
+        expected = expected_requests(fixtures, playlist_id)
+        results: List[Dict[str, Any]] = []
+        failed = False
+
+        for label in ("kalt", "warm") if args.warm else ("kalt",):
+            server.reset_stats()
+            output_path = Path(tmp) / f"export_{label}.json"
+
+            start = time.perf_counter()
+            export_playlist_to_json(playlist_id, output_path=output_path, engine=args.engine)
+            seconds = time.perf_counter() - start
+
+            written = sum(1 for _ in iter_playlist_tracks(output_path))
+            requests = dict(server.stats.requests)
+            results.append(
+                {
+                    "label": label,
+                    "seconds": seconds,
+                    "tracks": written,
+                    "requests": requests,
+                    "throttled": server.stats.throttled,
+                    "not_modified": server.stats.not_modified,
+                    "kib": server.stats.bytes_sent / 1024,
+                }
+            )
+
+            if written != track_count:
+                print(f"[BENCH] FEHLER: {written} statt {track_count} Tracks geschrieben")
+                failed = True
+            if label == "kalt":
+                for endpoint, minimum in expected.items():
+                    # 429-Antworten zählen als Request, werden aber wiederholt
+                    allowed = minimum + server.stats.throttled
+                    if requests.get(endpoint, 0) > allowed:
+                        print(
+                            f"[BENCH] REGRESSION: {endpoint} {requests.get(endpoint, 0)} "
+                            f"Requests, erwartet <= {allowed}"
+                        )
+                        failed = True
+
+    print()
+    print(
+        f"[BENCH] Export {playlist_id} ({track_count} Tracks) | Engine: "
+        f"{args.engine or 'Config'} | Latenz: {args.latency_ms:g} ms | "
+        f"429 alle {args.throttle_every or '-'} Requests"
+    )
+    print(
+        f"{'Lauf':<6} {'Dauer':>8} {'Tracks/s':>9} {'Requests':>9} {'429':>5} "
+        f"{'304':>5} {'Daten':>11}"
+    )
+    for r in results:
+        api_requests = sum(v for k, v in r["requests"].items() if k != "token")
+        print(
+            f"{r['label']:<6} {r['seconds']:>7.2f}s {r['tracks'] / r['seconds']:>9.0f} "
+            f"{api_requests:>9} {r['throttled']:>5} {r['not_modified']:>5} "
+            f"{r['kib']:>7.0f} KiB"
+        )
+        print(f"       {json.dumps(r['requests'], sort_keys=True)}")
+    print(f"Erwartet (kalt, min.): {json.dumps(expected, sort_keys=True)}")
+
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des Extended-Exports (offline).")
+    parser.add_argument("--tracks", type=int, default=10000, help="Tracks der synthetischen Playlist")
+    parser.add_argument("--fixtures", type=Path, help="aufgezeichnete Fixtures statt synthetisch")
+    parser.add_argument("--playlist-id", help="Playlist aus den Fixtures (Default: erste)")
+    parser.add_argument("--engine", choices=["sync", "async"], help="Export-Engine")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Zusatzlatenz pro Request")
+    parser.add_argument("--throttle-every", type=int, default=0, help="jeder N-te Request -> 429")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="Retry-After bei 429 (s)")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Requests/s des Rate-Limiters (Default: SpotifyRateLimitPerSecond, 0 = aus)",
+    )
+    parser.add_argument("--no-etags", action="store_true", help="Stand-in ohne ETags / 304")
+    parser.add_argument("--warm", action="store_true", help="zweiter Lauf mit gefülltem Cache")
+    args = parser.parse_args()
+
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
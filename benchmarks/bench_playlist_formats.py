@@ -0,0 +1,146 @@
+"""
+Benchmark: Extended-Playlist-Formate im Vergleich.
+
+Erzeugt eine synthetische Playlist und misst pro Format:
+- Schreiben (write_playlist_file)
+- Dateigröße
+- Komplett laden (read_playlist_file)
+- Alle Tracks streamen (iter_playlist_tracks)
+- Erste 20 Tracks (wie `plan-downloads --limit 20`)
+
+Aufruf (im Projektordner):
+    python -m benchmarks.bench_playlist_formats --tracks 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from playlist_store import (
+    iter_playlist_tracks,
+    read_playlist_file,
+    write_playlist_file,
+)
+
+# (Bezeichnung, Dateiname, compact)
+VARIANTS = [
+    ("json (indent=2)", "bench.json", False),
+    ("json kompakt", "bench_compact.json", True),
+    ("json.gz kompakt", "bench_compact.json.gz", True),
+    ("jsonl", "bench.jsonl", False),
+    ("jsonl kompakt", "bench_compact.jsonl", True),
+    ("jsonl.gz kompakt", "bench_compact.jsonl.gz", True),
+]
+
+
+def _synthetic_track(i: int) -> Dict[str, Any]:
+    """Track im Aufbau von playlist_exporter._iter_extended_tracks."""
+    features = {
+        "id": f"track{i:022d}",
+        "tempo": 120.0 + i % 40,
+        "key": i % 12,
+        "mode": i % 2,
+        "time_signature": 4,
+        "danceability": 0.5,
+        "energy": 0.7,
+        "loudness": -6.5,
+        "speechiness": 0.05,
+        "acousticness": 0.01,
+        "instrumentalness": 0.8,
+        "liveness": 0.1,
+        "valence": 0.4,
+        "duration_ms": 200000 + i,
+    }
+    return {
+        "spotify_track_id": f"track{i:022d}",
+        "spotify_url": f"https://open.spotify.com/track/track{i:022d}",
+        "title": f"Song Nummer {i} (Extended Mix)",
+        "artists": [f"Artist {i % 500}", f"Feature {i % 77}"],
+        "primary_artist": f"Artist {i % 500}",
+        "album": f"Album {i % 2000}",
+        "album_artist": f"Artist {i % 500}",
+        "release_date": "2021-05-14",
+        "track_number": i % 12 + 1,
+        "disc_number": 1,
+        "total_tracks": 12,
+        "explicit": False,
+        "duration_ms": 200000 + i,
+        "isrc": f"DEXX{i:08d}",
+        "cover_url": f"https://i.scdn.co/image/{i:040d}",
+        "bpm": features["tempo"],
+        "key_index": features["key"],
+        "mode_index": features["mode"],
+        "time_signature": 4,
+        "audio_features": features,
+        "key_notation": None,
+        "key_camelot": None,
+        "primary_genre": "deep house",
+        "genres_album": None,
+        "genres_artist": ["deep house", "house", "tech house"],
+        "genres_combined": ["deep house", "house", "tech house"],
+        "suggested_filename": f"{i % 12 + 1:02d} Song Nummer {i}.m4a",
+    }
+
+
+def _tracks(count: int) -> Iterator[Dict[str, Any]]:
+    return (_synthetic_track(i) for i in range(count))
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(track_count: int) -> List[Dict[str, Any]]:
+    playlist = {"playlist_id": "bench", "name": "Benchmark", "total_tracks": track_count}
+    results: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, filename, compact in VARIANTS:
+            path = Path(tmp) / filename
+            write_s = _timed(
+                lambda: write_playlist_file(
+                    path, playlist, _tracks(track_count), compact=compact
+                )
+            )
+            results.append(
+                {
+                    "label": label,
+                    "size_kib": path.stat().st_size / 1024,
+                    "write_s": write_s,
+                    "load_s": _timed(lambda: read_playlist_file(path)),
+                    "stream_s": _timed(lambda: sum(1 for _ in iter_playlist_tracks(path))),
+                    "head_s": _timed(lambda: list(islice(iter_playlist_tracks(path), 20))),
+                }
+            )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der Extended-Playlist-Formate.")
+    parser.add_argument("--tracks", type=int, default=20000, help="Anzahl Tracks")
+    args = parser.parse_args()
+
+    results = run(args.tracks)
+
+    print(f"[BENCH] Extended-Playlist mit {args.tracks} Tracks")
+    print(
+        f"{'Format':<18} {'Größe':>11} {'Schreiben':>10} {'Laden':>8} "
+        f"{'Streamen':>9} {'Erste 20':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['label']:<18} {r['size_kib']:>7.0f} KiB {r['write_s']:>9.2f}s "
+            f"{r['load_s']:>7.2f}s {r['stream_s']:>8.2f}s {r['head_s'] * 1000:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
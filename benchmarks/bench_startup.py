@@ -0,0 +1,142 @@
+"""
+Benchmark: Startzeit der CLI (main.py).
+
+Startet `python -X importtime main.py <Befehl>` mehrfach als eigenen Prozess
+und misst:
+- Wanduhrzeit (Median) gegenüber einem nackten `python -c pass`
+- die teuersten Importe (kumuliert, aus -X importtime)
+- ob schwere Module geladen wurden, die der Befehl nicht braucht
+
+Regression (Exit-Code 1): mehr als --budget-ms über dem Interpreter-Start
+oder ein verbotenes Modul geladen (für `--help` z. B. requests, mutagen,
+sqlite3). Laufzeitdaten landen in einem temporären TRACKBRIDGE_DATA_DIR.
+
+Aufruf (im Projektordner):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --budget-ms 20 --runs 15
+    python -m benchmarks.bench_startup --command debug-registry --allow sqlite3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# Module, die ein Befehl ohne Netzwerk/Audio/Registry nicht laden soll
+DEFAULT_FORBIDDEN = ["requests", "urllib3", "mutagen", "sqlite3", "yt_dlp", "dotenv"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> Tuple[Dict[str, int], List[Tuple[str, int]]]:
+    """
+    Wertet die Ausgabe von -X importtime aus.
+
+    Rückgabe: (alle geladenen Module -> kumulierte µs,
+    Top-Level-Importe sortiert nach kumulierter Zeit)
+    """
+    modules: Dict[str, int] = {}
+    top_level: List[Tuple[str, int]] = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative = int(match.group(2))
+        name = match.group(4)
+        modules[name] = cumulative
+        # Einrückung = Tiefe; eine Ebene (1 Leerzeichen) = direkt importiert
+        if len(match.group(3)) <= 1:
+            top_level.append((name, cumulative))
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    return modules, top_level
+
+
+def _time_process(args: List[str], env: Dict[str, str], runs: int) -> Tuple[float, str]:
+    """Median der Wanduhrzeit (ms) und stderr des letzten Laufs."""
+    samples: List[float] = []
+    stderr = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, *args],
+            cwd=PROJECT_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+        stderr = proc.stderr
+    return statistics.median(samples), stderr
+
+
+def run(args: argparse.Namespace) -> int:
+    command = args.command.split()
+    allowed = set(args.allow or [])
+    forbidden = [m for m in DEFAULT_FORBIDDEN + (args.forbid or []) if m not in allowed]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["TRACKBRIDGE_DATA_DIR"] = str(Path(tmp) / "data")
+
+        baseline_ms, _ = _time_process(["-c", "pass"], env, args.runs)
+        cli_ms, _ = _time_process(["main.py", *command], env, args.runs)
+        _, stderr = _time_process(["-X", "importtime", "main.py", *command], env, 1)
+
+    modules, top_level = parse_importtime(stderr)
+    overhead_ms = cli_ms - baseline_ms
+    loaded_forbidden = [m for m in forbidden if m in modules]
+
+    print(f"[BENCH] Start von main.py {' '.join(command)} ({args.runs} Läufe, Median)")
+    print(f"{'python -c pass':<28} {baseline_ms:>8.1f} ms")
+    print(f"{'main.py ' + ' '.join(command):<28} {cli_ms:>8.1f} ms")
+    print(f"{'Overhead':<28} {overhead_ms:>8.1f} ms (Budget: {args.budget_ms:g} ms)")
+    print()
+    print(f"Teuerste Importe (kumuliert, {len(modules)} Module geladen):")
+    for name, micros in top_level[: args.top]:
+        print(f"  {name:<32} {micros / 1000:>7.1f} ms")
+
+    failed = False
+    if overhead_ms > args.budget_ms:
+        print(f"[BENCH] REGRESSION: Overhead {overhead_ms:.1f} ms > {args.budget_ms:g} ms")
+        failed = True
+    if loaded_forbidden:
+        print(f"[BENCH] REGRESSION: unnötig geladen: {', '.join(loaded_forbidden)}")
+        failed = True
+
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der CLI-Startzeit.")
+    parser.add_argument(
+        "--command",
+        default="--help",
+        help="Argumente für main.py (Default: --help)",
+    )
+    parser.add_argument("--runs", type=int, default=9, help="Läufe pro Messung")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=30.0,
+        help="erlaubter Overhead über 'python -c pass' in ms",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Anzahl angezeigter Importe")
+    parser.add_argument("--forbid", nargs="*", help="zusätzlich verbotene Module")
+    parser.add_argument("--allow", nargs="*", help="für diesen Befehl erlaubte Module")
+    args = parser.parse_args()
+
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,658 @@
+"""
+Lokaler Stand-in für die Spotify Web API (Export-Benchmarks, Offline-Tests).
+
+Bedient die Endpunkte, die der Export nutzt:
+- POST /api/token                      (Client-Credentials)
+- GET  /v1/playlists/{id}              (inkl. erster Track-Seite, 'fields')
+- GET  /v1/playlists/{id}/tracks       (offset/limit/'fields', 'next'-Links)
+- GET  /v1/audio-features?ids=...      (max. 100 IDs)
+- GET  /v1/albums?ids=...              (max. 20 IDs)
+- GET  /v1/artists?ids=...             (max. 50 IDs)
+
+GET-Antworten tragen einen ETag; If-None-Match mit passendem ETag ergibt 304.
+
+Die Daten kommen aus Fixtures: synthetisch erzeugt (synthetic_fixtures,
+10k–100k Tracks in Sekunden) oder einmalig von der echten API aufgezeichnet
+(record_fixtures) und als JSON(.gz) abgelegt. Latenz und 429-Antworten mit
+Retry-After lassen sich gezielt einstreuen.
+
+Den Exporter auf den Stand-in umlenken (vor dem Start setzen):
+    SPOTIFY_API_BASE_URL=http://127.0.0.1:8765/v1
+    SPOTIFY_TOKEN_URL=http://127.0.0.1:8765/api/token
+
+Server starten (im Projektordner):
+    python -m benchmarks.spotify_standin --tracks 20000 --port 8765
+    python -m benchmarks.spotify_standin --fixtures fixtures.json.gz --latency-ms 40
+
+Fixtures von der echten API aufzeichnen:
+    python -m benchmarks.spotify_standin --record <ID1> <ID2> --fixtures fixtures.json.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+# Obergrenzen der echten API pro Request
+MAX_PAGE_SIZE = 100
+MAX_IDS_BY_ENDPOINT = {"audio-features": 100, "albums": 20, "artists": 50}
+
+STANDIN_TOKEN = "standin-token"
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@dataclass
+class StandinFixtures:
+    """
+    Daten des Stand-ins, im Aufbau der Web-API-Objekte:
+    - playlists: id -> {"meta": Playlist-Objekt ohne 'tracks', "items": [...]}
+    - albums / artists / audio_features: id -> Objekt
+    """
+    playlists: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    albums: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    artists: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    audio_features: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def merge(self, other: "StandinFixtures") -> None:
+        self.playlists.update(other.playlists)
+        self.albums.update(other.albums)
+        self.artists.update(other.artists)
+        self.audio_features.update(other.audio_features)
+
+    def save(self, path: Path) -> None:
+        """Schreibt die Fixtures als JSON (gzip, wenn 'path' auf .gz endet)."""
+        data = json.dumps(
+            {
+                "playlists": self.playlists,
+                "albums": self.albums,
+                "artists": self.artists,
+                "audio_features": self.audio_features,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(gzip.compress(data) if path.suffix == ".gz" else data)
+
+    @classmethod
+    def load(cls, path: Path) -> "StandinFixtures":
+        raw = path.read_bytes()
+        if path.suffix == ".gz":
+            raw = gzip.decompress(raw)
+        data = json.loads(raw.decode("utf-8"))
+        return cls(
+            playlists=data.get("playlists") or {},
+            albums=data.get("albums") or {},
+            artists=data.get("artists") or {},
+            audio_features=data.get("audio_features") or {},
+        )
+
+
+def _synthetic_id(prefix: str, index: int) -> str:
+    """22 Zeichen wie echte Spotify-IDs."""
+    return f"{prefix}{index:0{22 - len(prefix)}d}"
+
+
+def synthetic_fixtures(
+    playlist_id: str = "standin",
+    track_count: int = 10000,
+    tracks_per_album: int = 10,
+    artist_count: int | None = None,
+    seed: int = 0,
+    id_offset: int = 0,
+) -> StandinFixtures:
+    """
+    Erzeugt eine deterministische Playlist mit 'track_count' Tracks samt
+    Alben, Artists und Audio-Features (vollständige Objekte inkl.
+    available_markets, damit 'fields'-Filter messbar Bytes sparen).
+
+    'id_offset' verschiebt alle IDs, damit sich mehrere synthetische
+    Playlists per merge() kombinieren lassen, ohne dass IDs kollidieren.
+    """
+    rng = random.Random(seed)
+    markets = ["DE", "AT", "CH", "NL", "BE", "FR", "GB", "US", "SE", "NO"] * 8
+    album_count = max(1, track_count // max(1, tracks_per_album))
+    artist_count = artist_count or max(1, track_count // 4)
+    genres = ["deep house", "tech house", "techno", "house", "minimal", "disco"]
+
+    fixtures = StandinFixtures()
+
+    for a in range(artist_count):
+        artist_id = _synthetic_id("ar", id_offset + a)
+        fixtures.artists[artist_id] = {
+            "id": artist_id,
+            "name": f"Artist {id_offset + a}",
+            "type": "artist",
+            "uri": f"spotify:artist:{artist_id}",
+            "genres": rng.sample(genres, k=rng.randint(0, 3)),
+            "popularity": rng.randint(0, 100),
+            "followers": {"href": None, "total": rng.randint(0, 100000)},
+            "external_urls": {"spotify": f"https://open.spotify.com/artist/{artist_id}"},
+        }
+
+    for al in range(album_count):
+        album_id = _synthetic_id("al", id_offset + al)
+        artist_id = _synthetic_id("ar", id_offset + al % artist_count)
+        fixtures.albums[album_id] = {
+            "id": album_id,
+            "name": f"Album {al}",
+            "type": "album",
+            "album_type": "album",
+            "uri": f"spotify:album:{album_id}",
+            "genres": [],
+            "label": f"Label {al % 50}",
+            "popularity": rng.randint(0, 100),
+            "release_date": f"{2000 + al % 25}-{al % 12 + 1:02d}-01",
+            "total_tracks": tracks_per_album,
+            "artists": [{"id": artist_id, "name": fixtures.artists[artist_id]["name"]}],
+            "available_markets": markets,
+            "images": [{"url": f"https://i.scdn.co/image/{album_id}", "height": 640, "width": 640}],
+            "external_urls": {"spotify": f"https://open.spotify.com/album/{album_id}"},
+        }
+
+    items: List[Dict[str, Any]] = []
+    for i in range(track_count):
+        track_id = _synthetic_id("tr", id_offset + i)
+        album_id = _synthetic_id("al", id_offset + i % album_count)
+        album = fixtures.albums[album_id]
+        artist_ids = [_synthetic_id("ar", id_offset + i % artist_count)]
+        if i % 5 == 0:
+            artist_ids.append(_synthetic_id("ar", id_offset + (i * 7 + 1) % artist_count))
+
+        items.append(
+            {
+                "added_at": "2024-01-01T00:00:00Z",
+                "is_local": False,
+                "track": {
+                    "id": track_id,
+                    "name": f"Song {i}",
+                    "type": "track",
+                    "uri": f"spotify:track:{track_id}",
+                    "track_number": i % tracks_per_album + 1,
+                    "disc_number": 1,
+                    "explicit": False,
+                    "popularity": rng.randint(0, 100),
+                    "duration_ms": rng.randint(150000, 480000),
+                    "external_ids": {"isrc": f"DEXX{i:08d}"},
+                    "external_urls": {"spotify": f"https://open.spotify.com/track/{track_id}"},
+                    "available_markets": markets,
+                    "artists": [
+                        {"id": a, "name": fixtures.artists[a]["name"]} for a in artist_ids
+                    ],
+                    "album": {
+                        key: album[key]
+                        for key in (
+                            "id", "name", "album_type", "release_date",
+                            "total_tracks", "images", "artists", "available_markets",
+                        )
+                    },
+                },
+            }
+        )
+        fixtures.audio_features[track_id] = {
+            "id": track_id,
+            "tempo": round(rng.uniform(90, 140), 3),
+            "key": rng.randint(0, 11),
+            "mode": rng.randint(0, 1),
+            "time_signature": 4,
+            "danceability": round(rng.random(), 3),
+            "energy": round(rng.random(), 3),
+            "loudness": round(rng.uniform(-14, -3), 3),
+            "duration_ms": items[-1]["track"]["duration_ms"],
+        }
+
+    fixtures.playlists[playlist_id] = {
+        "meta": {
+            "id": playlist_id,
+            "name": f"Stand-in ({track_count} Tracks)",
+            "description": "Synthetische Playlist",
+            "owner": {"display_name": "TrackBridge"},
+            "external_urls": {"spotify": f"https://open.spotify.com/playlist/{playlist_id}"},
+            "snapshot_id": f"standin-{seed}-{track_count}",
+        },
+        "items": items,
+    }
+    return fixtures
+
+
+def record_fixtures(playlist_ids: List[str]) -> StandinFixtures:
+    """
+    Zeichnet Playlists samt Audio-Features, Alben und Artists von der
+    echten Web API auf (ungefilterte Objekte, damit jede Projektion passt).
+    """
+    from playlist_exporter import SPOTIFY_PLAYLIST_URL, _fetch_playlist_full
+    from spotify_client import get_access_token, spotify_get
+    from config import SPOTIFY_API_BASE_URL
+
+    token = get_access_token()
+    fixtures = StandinFixtures()
+
+    for playlist_id in playlist_ids:
+        resp = spotify_get(
+            SPOTIFY_PLAYLIST_URL.format(playlist_id=playlist_id),
+            params={"fields": "id,name,description,owner,external_urls,snapshot_id"},
+            access_token=token,
+        )
+        resp.raise_for_status()
+        meta = resp.json()
+
+        full = _fetch_playlist_full(token, playlist_id, project_fields=False)
+        tracks = full.get("__all_tracks__", [])
+        fixtures.playlists[playlist_id] = {
+            "meta": meta,
+            "items": [{"track": t} for t in tracks],
+        }
+
+        wanted = {
+            "audio-features": [t["id"] for t in tracks if t.get("id")],
+            "albums": [(t.get("album") or {}).get("id") for t in tracks],
+            "artists": [a.get("id") for t in tracks for a in t.get("artists") or []],
+        }
+        for endpoint, ids in wanted.items():
+            target = {
+                "audio-features": fixtures.audio_features,
+                "albums": fixtures.albums,
+                "artists": fixtures.artists,
+            }[endpoint]
+            missing = [i for i in dict.fromkeys(ids) if i and i not in target]
+            size = MAX_IDS_BY_ENDPOINT[endpoint]
+            for start in range(0, len(missing), size):
+                resp = spotify_get(
+                    f"{SPOTIFY_API_BASE_URL}/{endpoint}",
+                    params={"ids": ",".join(missing[start : start + size])},
+                    access_token=token,
+                )
+                if resp.status_code == 403:
+                    print(f"[STANDIN] {endpoint}: 403 – wird nicht aufgezeichnet.")
+                    break
+                resp.raise_for_status()
+                key = "audio_features" if endpoint == "audio-features" else endpoint
+                for obj in resp.json().get(key) or []:
+                    if obj and obj.get("id"):
+                        target[obj["id"]] = obj
+
+        print(f"[STANDIN] Aufgezeichnet: {playlist_id} ({len(tracks)} Tracks)")
+
+    return fixtures
+
+
+# ---------------------------------------------------------------------------
+# 'fields'-Filter der Web API
+# ---------------------------------------------------------------------------
+
+def parse_fields(value: str) -> Dict[str, Any]:
+    """
+    Parst die 'fields'-Syntax der Web API in eine Feld-Spezifikation,
+    z. B. "id,album(name)" -> {"id": None, "album": {"name": None}}.
+    Die Punkt-Schreibweise "tracks.next" entspricht "tracks(next)".
+    """
+    spec, pos = _parse_field_list(value, 0)
+    if pos != len(value):
+        raise ValueError(f"Ungültiger fields-Filter bei Position {pos}: {value!r}")
+    return spec
+
+
+def _parse_field_list(value: str, pos: int) -> tuple[Dict[str, Any], int]:
+    spec: Dict[str, Any] = {}
+    while pos < len(value) and value[pos] != ")":
+        start = pos
+        while pos < len(value) and value[pos] not in ",()":
+            pos += 1
+        name = value[start:pos].strip()
+        sub: Optional[Dict[str, Any]] = None
+        if pos < len(value) and value[pos] == "(":
+            sub, pos = _parse_field_list(value, pos + 1)
+            if pos >= len(value) or value[pos] != ")":
+                raise ValueError(f"Fehlende ')' im fields-Filter: {value!r}")
+            pos += 1
+        if name:
+            *parents, leaf = name.split(".")
+            target = spec
+            for parent in parents:
+                existing = target.get(parent)
+                if existing is None:
+                    existing = target[parent] = {}
+                target = existing
+            if sub is not None and isinstance(target.get(leaf), dict):
+                target[leaf].update(sub)
+            else:
+                target[leaf] = sub
+        if pos < len(value) and value[pos] == ",":
+            pos += 1
+    return spec, pos
+
+
+def project_fields(obj: Any, spec: Optional[Dict[str, Any]]) -> Any:
+    """Wendet eine Feld-Spezifikation an (Listen elementweise)."""
+    if spec is None or obj is None:
+        return obj
+    if isinstance(obj, list):
+        return [project_fields(v, spec) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    return {key: project_fields(obj[key], sub) for key, sub in spec.items() if key in obj}
+
+
+# ---------------------------------------------------------------------------
+# HTTP-Server
+# ---------------------------------------------------------------------------
+
+@dataclass
+class StandinOptions:
+    """Verhalten des Stand-ins."""
+    latency_ms: float = 0.0  # Zusatzlatenz pro Request
+    throttle_every: int = 0  # jeder N-te API-Request -> 429 (0 = nie)
+    retry_after: float = 1.0  # Retry-After der 429-Antworten (Sekunden)
+    audio_features_forbidden: bool = False  # /audio-features -> 403
+    etags: bool = True  # ETag senden, If-None-Match -> 304
+
+
+@dataclass
+class StandinStats:
+    """Request-Zähler pro Endpunkt."""
+    requests: Dict[str, int] = field(default_factory=dict)
+    throttled: int = 0
+    not_modified: int = 0
+    bytes_sent: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.requests.values())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_StandinHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def _send_json(self, status: int, payload: Any, headers: Dict[str, str] | None = None) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        headers = dict(headers or {})
+
+        if status == 200 and self.command == "GET" and self.server.standin.options.etags:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                self.server.standin.count_not_modified()
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.standin.count_bytes(len(body))
+
+    def _error(self, status: int, message: str) -> None:
+        self._send_json(status, {"error": {"status": status, "message": message}})
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        standin = self.server.standin
+        standin.count("token")
+        if urlparse(self.path).path != "/api/token":
+            return self._error(404, "Not found")
+        self._send_json(
+            200,
+            {"access_token": STANDIN_TOKEN, "token_type": "Bearer", "expires_in": 3600},
+        )
+
+    def do_GET(self) -> None:  # noqa: N802
+        standin = self.server.standin
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+
+        if len(parts) < 2 or parts[0] != "v1":
+            standin.count("unknown")
+            return self._error(404, "Not found")
+
+        endpoint = parts[1] if parts[1] != "playlists" else (
+            "playlist_tracks" if len(parts) == 4 and parts[3] == "tracks" else "playlist"
+        )
+        standin.count(endpoint)
+
+        if standin.options.latency_ms > 0:
+            time.sleep(standin.options.latency_ms / 1000)
+
+        if standin.should_throttle():
+            return self._send_json(
+                429,
+                {"error": {"status": 429, "message": "API rate limit exceeded"}},
+                headers={"Retry-After": f"{standin.options.retry_after:g}"},
+            )
+
+        if self.headers.get("Authorization") != f"Bearer {STANDIN_TOKEN}":
+            return self._error(401, "Invalid access token")
+
+        try:
+            fields = parse_fields(query["fields"]) if query.get("fields") else None
+        except ValueError as exc:
+            return self._error(400, str(exc))
+
+        if endpoint in ("playlist", "playlist_tracks"):
+            playlist = standin.fixtures.playlists.get(parts[2])
+            if playlist is None:
+                return self._error(404, "Not found")
+            if endpoint == "playlist":
+                obj = dict(playlist["meta"])
+                obj["tracks"] = standin.track_page(parts[2], 0, MAX_PAGE_SIZE)
+            else:
+                try:
+                    offset = int(query.get("offset", 0))
+                    limit = int(query.get("limit", MAX_PAGE_SIZE))
+                except ValueError:
+                    return self._error(400, "Invalid offset/limit")
+                if not 1 <= limit <= MAX_PAGE_SIZE:
+                    return self._error(400, "Invalid limit")
+                obj = standin.track_page(parts[2], offset, limit)
+            return self._send_json(200, project_fields(obj, fields))
+
+        if endpoint in MAX_IDS_BY_ENDPOINT:
+            if endpoint == "audio-features" and standin.options.audio_features_forbidden:
+                return self._error(403, "Forbidden")
+            ids = [i for i in query.get("ids", "").split(",") if i]
+            if not ids or len(ids) > MAX_IDS_BY_ENDPOINT[endpoint]:
+                return self._error(400, "Invalid ids")
+            source = {
+                "audio-features": standin.fixtures.audio_features,
+                "albums": standin.fixtures.albums,
+                "artists": standin.fixtures.artists,
+            }[endpoint]
+            key = "audio_features" if endpoint == "audio-features" else endpoint
+            return self._send_json(
+                200, project_fields({key: [source.get(i) for i in ids]}, fields)
+            )
+
+        return self._error(404, "Not found")
+
+
+class _StandinHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    standin: "StandinServer"
+
+
+class StandinServer:
+    """
+    Stand-in-Server in einem Hintergrund-Thread. Als Context-Manager:
+
+        with StandinServer(synthetic_fixtures(track_count=20000)) as server:
+            os.environ["SPOTIFY_API_BASE_URL"] = server.api_base_url
+            ...
+    """
+
+    def __init__(
+        self,
+        fixtures: StandinFixtures,
+        options: StandinOptions | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.fixtures = fixtures
+        self.options = options or StandinOptions()
+        self.stats = StandinStats()
+        self._lock = threading.Lock()
+        self._api_requests = 0
+
+        self._httpd = _StandinHTTPServer((host, port), _Handler)
+        self._httpd.standin = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_base_url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    @property
+    def token_url(self) -> str:
+        return f"{self.base_url}/api/token"
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # --- Zähler / Verhalten -------------------------------------------------
+
+    def count(self, endpoint: str) -> None:
+        with self._lock:
+            self.stats.requests[endpoint] = self.stats.requests.get(endpoint, 0) + 1
+
+    def count_not_modified(self) -> None:
+        with self._lock:
+            self.stats.not_modified += 1
+
+    def count_bytes(self, size: int) -> None:
+        with self._lock:
+            self.stats.bytes_sent += size
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = StandinStats()
+            self._api_requests = 0
+
+    def should_throttle(self) -> bool:
+        """True, wenn dieser API-Request mit 429 beantwortet werden soll."""
+        every = self.options.throttle_every
+        with self._lock:
+            self._api_requests += 1
+            if every > 0 and self._api_requests % every == 0:
+                self.stats.throttled += 1
+                return True
+        return False
+
+    def track_page(self, playlist_id: str, offset: int, limit: int) -> Dict[str, Any]:
+        """Track-Seite im Format von /playlists/{id}/tracks."""
+        items = self.fixtures.playlists[playlist_id]["items"]
+        total = len(items)
+        next_url = None
+        if offset + limit < total:
+            query = urlencode({"offset": offset + limit, "limit": limit})
+            next_url = f"{self.api_base_url}/playlists/{playlist_id}/tracks?{query}"
+        return {
+            "href": f"{self.api_base_url}/playlists/{playlist_id}/tracks",
+            "items": items[offset : offset + limit],
+            "limit": limit,
+            "next": next_url,
+            "offset": offset,
+            "previous": None,
+            "total": total,
+        }
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lokaler Stand-in für die Spotify Web API.")
+    parser.add_argument("--port", type=int, default=8765, help="Port (Default: 8765)")
+    parser.add_argument("--fixtures", type=Path, help="Fixture-Datei (.json/.json.gz)")
+    parser.add_argument(
+        "--record",
+        nargs="+",
+        metavar="PLAYLIST_ID",
+        help="Playlists von der echten API nach --fixtures aufzeichnen und beenden",
+    )
+    parser.add_argument("--playlist-id", default="standin", help="ID der synthetischen Playlist")
+    parser.add_argument("--tracks", type=int, default=10000, help="Tracks der synthetischen Playlist")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Zusatzlatenz pro Request")
+    parser.add_argument("--throttle-every", type=int, default=0, help="jeder N-te Request -> 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After bei 429 (s)")
+    parser.add_argument("--no-etags", action="store_true", help="keine ETags / 304 liefern")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.fixtures:
+            parser.error("--record braucht --fixtures als Ziel")
+        record_fixtures(args.record).save(args.fixtures)
+        print(f"[STANDIN] Fixtures gespeichert: {args.fixtures}")
+        return
+
+    if args.fixtures:
+        fixtures = StandinFixtures.load(args.fixtures)
+    else:
+        fixtures = synthetic_fixtures(args.playlist_id, args.tracks)
+
+    server = StandinServer(
+        fixtures,
+        StandinOptions(
+            latency_ms=args.latency_ms,
+            throttle_every=args.throttle_every,
+            retry_after=args.retry_after,
+            etags=not args.no_etags,
+        ),
+        port=args.port,
+    )
+    print(f"[STANDIN] Playlists: {', '.join(fixtures.playlists)}")
+    print(f"[STANDIN] SPOTIFY_API_BASE_URL={server.api_base_url}")
+    print(f"[STANDIN] SPOTIFY_TOKEN_URL={server.token_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Dict, List
 
-from config import (
-    OUTPUT_DIRECTORY,
-    KNOWN_AUDIO_EXTENSIONS,
-    DJ_COMPATIBILITY_PROFILE,
-)
+from config import get_settings
 from format_profiles import is_ext_compatible_with_active_profile
 
 
@@ -16,18 +12,19 @@ def analyze_playlist_folder(playlist_id: str) -> None:
     Analysiert den Zielordner einer Playlist und gibt eine Übersicht
     über vorhandene Dateien, Formate und DJ-Kompatibilität aus.
 
-    - Scannt OUTPUT_DIRECTORY/<playlist_id>
+    - Scannt OutputDirectory/<playlist_id>
     - Zählt Dateien pro Extension
     - Markiert inkompatible Formate basierend auf dem aktiven DJ-Profil
     """
 
-    base_dir = Path(OUTPUT_DIRECTORY)
+    settings = get_settings()
+    base_dir = Path(settings.output_directory)
     playlist_dir = base_dir / playlist_id
 
     print("========== PLAYLIST-ANALYSE ==========")
     print(f"Output-Basis:  {base_dir}")
     print(f"Playlist-Ordner: {playlist_dir}")
-    print(f"DJ-Profil:     {DJ_COMPATIBILITY_PROFILE}")
+    print(f"DJ-Profil:     {settings.dj_compatibility_profile}")
     print("======================================")
 
     if not playlist_dir.exists() or not playlist_dir.is_dir():
@@ -37,7 +34,7 @@ def analyze_playlist_folder(playlist_id: str) -> None:
 
     # Alle bekannten Audio-Dateien einsammeln
     audio_files: List[Path] = []
-    for ext in KNOWN_AUDIO_EXTENSIONS:
+    for ext in settings.known_audio_extensions:
         audio_files.extend(playlist_dir.glob(f"*.{ext}"))
 
     if not audio_files:
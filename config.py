@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field, fields, replace
 from pathlib import Path
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, Mapping, Optional, Tuple
 import os
-from dotenv import load_dotenv
 
 
 
@@ -18,6 +18,26 @@ BASE_DIR = Path(__file__).resolve().parent
 # Pfad zur config.json
 CONFIG_PATH = BASE_DIR / "config.json"
 
+# Umgebungsvariablen überschreiben config.json: TRACKBRIDGE_<FELDNAME>,
+# z. B. TRACKBRIDGE_MAX_PARALLEL_DOWNLOADS=4 oder TRACKBRIDGE_DATA_DIR=/tmp/tb
+ENV_PREFIX = "TRACKBRIDGE_"
+
+# Zusätzliche (historische) Umgebungsvariablen pro Feld
+ENV_ALIASES: Dict[str, str] = {
+    "spotify_client_id": "SPOTIFY_CLIENT_ID",
+    "spotify_client_secret": "SPOTIFY_CLIENT_SECRET",
+    "spotify_token_url": "SPOTIFY_TOKEN_URL",
+    "spotify_api_base_url": "SPOTIFY_API_BASE_URL",
+}
+
+# Abweichende Schreibweisen in älteren config.json-Dateien:
+# Schlüssel laut config.example.json -> frühere Schreibweisen
+CONFIG_KEY_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "DJCompatibilityProfile": ("DjCompatibilityProfile",),
+    "DownloadMaxRetries": ("MaxRetriesPerJob",),
+    "DenyWAVCompletely": ("DenyWavCompletely",),
+}
+
 
 def _load_config() -> Dict[str, Any]:
     """
@@ -33,165 +53,357 @@ def _load_config() -> Dict[str, Any]:
     return data
 
 
-# Globale CONFIG, die du im restlichen Modul nutzen kannst
+# Rohdaten aus config.json (einziger Lesezugriff pro Prozess)
 CONFIG: Dict[str, Any] = _load_config()
 
 
-# ---------------------------------------------------------------------------
-# Spotify-Einstellungen
-# ---------------------------------------------------------------------------
-
-SPOTIFY_CLIENT_ID: str = CONFIG.get("SpotifyClientId", "")
-SPOTIFY_CLIENT_SECRET: str = CONFIG.get("SpotifyClientSecret", "")
-SPOTIFY_TOKEN_URL: str = CONFIG.get(
-    "SpotifyTokenUrl",
-    "https://accounts.spotify.com/api/token",
-)
-SPOTIFY_API_BASE_URL: str = CONFIG.get(
-    "SpotifyApiBaseUrl",
-    "https://api.spotify.com/v1",
-)
-
-
-# ---------------------------------------------------------------------------
-# Output / Download / Audio-Formate
-# ---------------------------------------------------------------------------
-
-OUTPUT_DIRECTORY: Path = Path(
-    CONFIG.get("OutputDirectory", BASE_DIR / "output")
-).resolve()
-
-AUDIO_PREFERRED_FORMATS = CONFIG.get("AudioPreferredFormats", ["m4a", "mp3"])
-
-MAX_PARALLEL_DOWNLOADS: int = int(CONFIG.get("MaxParallelDownloads", 2))
-MAX_RETRIES_PER_JOB: int = int(CONFIG.get("MaxRetriesPerJob", 2))
-
-SKIP_EXISTING_FILES: bool = bool(CONFIG.get("SkipExistingFiles", True))
-
-DJ_COMPATIBILITY_PROFILE: str | None = CONFIG.get("DjCompatibilityProfile")
-ALLOW_REENCODE_FOR_INCOMPATIBLE: bool = bool(
-    CONFIG.get("AllowReencodeForIncompatible", True)
-)
-
-REGISTRY_ENABLED: bool = bool(CONFIG.get("RegistryEnabled", False))
-REGISTRY_STORE_SPOTIFY_URL: bool = bool(CONFIG.get("RegistryStoreSpotifyUrl", True))
-
-
 # --- .env laden --------------------------------------------------------------
 
 env_file = BASE_DIR / ".env"
 if env_file.exists():
-    load_dotenv(env_file)
+    # python-dotenv nur importieren, wenn es auch etwas zu laden gibt
+    from dotenv import load_dotenv
 
-SPOTIFY_CLIENT_ID: str = (
-    os.getenv("SPOTIFY_CLIENT_ID")
-    or CONFIG.get("SpotifyClientId")
-    or ""
-).strip()
-
-SPOTIFY_CLIENT_SECRET: str = (
-    os.getenv("SPOTIFY_CLIENT_SECRET")
-    or CONFIG.get("SpotifyClientSecret")
-    or ""
-).strip()
-
-
-# --- config.json laden -------------------------------------------------------
+    load_dotenv(env_file)
 
-CONFIG_JSON = BASE_DIR / "config.json"
 
-if not CONFIG_JSON.exists():
-    raise FileNotFoundError(f"config.json fehlt: {CONFIG_JSON}")
+# ---------------------------------------------------------------------------
+# Settings: typisiert, unveränderlich, einmal geladen
+# ---------------------------------------------------------------------------
 
-with CONFIG_JSON.open("r", encoding="utf-8") as f:
-    CONFIG = json.load(f)
+def _setting(key: str, default: Any) -> Any:
+    """Feld mit zugehörigem config.json-Schlüssel."""
+    return field(default=default, metadata={"key": key})
 
-# Basis-Einstellungen
-_raw_output_dir = CONFIG.get("OutputDirectory")
 
-if _raw_output_dir is None:
-    # Fallback auf Standard-Ordner im Projekt
-    OUTPUT_DIRECTORY: Path = (BASE_DIR / "output").resolve()
-else:
-    OUTPUT_DIRECTORY = Path(str(_raw_output_dir)).expanduser().resolve()
+@dataclass(frozen=True)
+class Settings:
+    """
+    Alle Einstellungen eines Laufs.
 
+    Reihenfolge: Default < config.json < Umgebung (TRACKBRIDGE_<FELD>) <
+    CLI (override_settings). Werte, die sich pro Lauf ändern dürfen (z. B.
+    --jobs), liest der Code zur Laufzeit über get_settings(); die
+    Modul-Konstanten unten sind der Stand beim Start.
+    """
+    # Laufzeitdaten (Registry-DB, Token-Cache, ...)
+    data_dir: Path = _setting("DataDirectory", BASE_DIR / "data")
+
+    # Spotify
+    spotify_client_id: str = _setting("SpotifyClientId", "")
+    spotify_client_secret: str = _setting("SpotifyClientSecret", "")
+    spotify_token_url: str = _setting(
+        "SpotifyTokenUrl", "https://accounts.spotify.com/api/token"
+    )
+    spotify_api_base_url: str = _setting(
+        "SpotifyApiBaseUrl", "https://api.spotify.com/v1"
+    )
+
+    # HTTP-Layer für die Web API (Keep-Alive-Pool, Retries bei 429/5xx)
+    spotify_http_pool_size: int = _setting("SpotifyHttpPoolSize", 10)
+    spotify_http_max_retries: int = _setting("SpotifyHttpMaxRetries", 4)
+    spotify_http_backoff_seconds: float = _setting("SpotifyHttpBackoffSeconds", 0.5)
+    spotify_http_timeout: float = _setting("SpotifyHttpTimeout", 10.0)
+
+    # Prozessweiter Token-Bucket für alle Web-API-Requests (<= 0 = unbegrenzt)
+    spotify_rate_limit_per_second: float = _setting("SpotifyRateLimitPerSecond", 10.0)
+    spotify_rate_limit_burst: int = _setting("SpotifyRateLimitBurst", 20)
+    spotify_rate_limit_min_per_second: float = _setting(
+        "SpotifyRateLimitMinPerSecond", 1.0
+    )
+
+    # Playlist-Paging: "parallel" (Offsets vorab berechnen) oder "serial" (tracks.next)
+    spotify_paging_mode: str = _setting("SpotifyPagingMode", "parallel")
+    spotify_paging_workers: int = _setting("SpotifyPagingWorkers", 4)
+
+    # Export-Engine: "sync" (Standard) oder "async" (asyncio, alle Stufen parallel)
+    export_engine: str = _setting("ExportEngine", "sync")
+    async_max_concurrency: int = _setting("AsyncMaxConcurrency", 8)
+
+    # Extended-JSON: kompakt (ohne Einrückung/rohe Audio-Features) und/oder gzip
+    export_compact_json: bool = _setting("ExportCompactJson", False)
+    export_gzip: bool = _setting("ExportGzip", False)
+
+    # export-many: Anzahl Playlists, die gleichzeitig exportiert werden
+    export_many_workers: int = _setting("ExportManyWorkers", 4)
+
+    # Persistenter Metadaten-Cache (data/metadata_cache.db)
+    metadata_cache_enabled: bool = _setting("MetadataCacheEnabled", True)
+    metadata_cache_album_ttl_days: float = _setting("MetadataCacheAlbumTtlDays", 30.0)
+    metadata_cache_artist_ttl_days: float = _setting("MetadataCacheArtistTtlDays", 7.0)
+    metadata_cache_audio_features_ttl_days: float = _setting(
+        "MetadataCacheAudioFeaturesTtlDays", 180.0
+    )
+    metadata_cache_negative_ttl_hours: float = _setting(
+        "MetadataCacheNegativeTtlHours", 24.0
+    )
+    metadata_cache_max_entries: int = _setting("MetadataCacheMaxEntries", 200000)
+
+    # ETag-Cache für bedingte Requests (data/etag_cache.db)
+    etag_cache_enabled: bool = _setting("EtagCacheEnabled", True)
+    etag_cache_max_entries: int = _setting("EtagCacheMaxEntries", 20000)
+
+    # Rohdaten-Archiv für rebuild-extended (data/archive)
+    response_archive_enabled: bool = _setting("ResponseArchiveEnabled", False)
+
+    # Checkpoints laufender Exporte (data/checkpoints), Wiederaufnahme nach Abbruch
+    export_checkpoints_enabled: bool = _setting("ExportCheckpointsEnabled", True)
+
+    # Output / Formate
+    output_directory: Path = _setting("OutputDirectory", BASE_DIR / "output")
+    default_format: str = _setting("DefaultFormat", "json")
+    ytdlp_textfile_pattern: str = _setting(
+        "YTDLP_TextFilePattern", "spotify_{playlist_id}_yt-dlp.txt"
+    )
+
+    # Downloads
+    audio_preferred_formats: Tuple[str, ...] = _setting(
+        "AudioPreferredFormats", ("m4a", "mp3", "aac", "opus", "flac")
+    )
+    max_parallel_downloads: int = _setting("MaxParallelDownloads", 2)
+    download_max_retries: int = _setting("DownloadMaxRetries", 2)
+    # "subprocess" (ein yt-dlp-Prozess pro Track) oder "inprocess" (ytdlp_engine.py)
+    download_engine: str = _setting("DownloadEngine", "subprocess")
+
+    # Suchauflösung vor dem Download (search_resolver.py, data/search_cache.db)
+    search_resolve_enabled: bool = _setting("SearchResolveEnabled", True)
+    search_resolve_workers: int = _setting("SearchResolveWorkers", 4)
+    search_cache_ttl_days: float = _setting("SearchCacheTtlDays", 90.0)
+    search_cache_negative_ttl_hours: float = _setting("SearchCacheNegativeTtlHours", 24.0)
+    skip_existing_files: bool = _setting("SkipExistingFiles", True)
+    known_audio_extensions: Tuple[str, ...] = _setting(
+        "KnownAudioExtensions",
+        ("m4a", "aac", "mp3", "flac", "alac", "aiff", "aif", "wav", "webm", "opus"),
+    )
+
+    # Audio-Dateinamen & Pfadlängen
+    audio_output_extension: str = _setting("AudioOutputExtension", "m4a")
+    audio_filename_template: str = _setting(
+        "AudioFilenameTemplate", "{track_number_padded} {title_sanitized}"
+    )
+    max_filename_length: int = _setting("MaxFilenameLength", 80)
+
+    # Registry
+    registry_enabled: bool = _setting("RegistryEnabled", False)
+    registry_store_spotify_url: bool = _setting("RegistryStoreSpotifyUrl", True)
+
+    # DJ-Kompatibilität / Reencode
+    dj_compatibility_profile: str = _setting("DJCompatibilityProfile", "none")
+    dj_warn_on_incompatible: bool = _setting("DJWarnOnIncompatible", True)
+    deny_wav_completely: bool = _setting("DenyWAVCompletely", False)
+    allow_reencode_for_incompatible: bool = _setting(
+        "AllowReencodeForIncompatible", False
+    )
+    preferred_high_quality_target: str = _setting("PreferredHighQualityTarget", "aiff")
+    remove_source_after_reencode: bool = _setting("RemoveSourceAfterReencode", True)
+    # Reencode-Scheduler: gleichzeitige ffmpeg-Prozesse (0 = CPU-Kerne),
+    # ffmpeg -threads (0 = Kerne / Worker), nice-Wert der ffmpeg-Prozesse
+    reencode_workers: int = _setting("ReencodeWorkers", 0)
+    reencode_ffmpeg_threads: int = _setting("ReencodeFfmpegThreads", 0)
+    reencode_niceness: int = _setting("ReencodeNiceness", 10)
+
+    # Download-Pipeline (download_pipeline.py): Tagging-Worker, Queue-Plätze je Stufe
+    tag_workers: int = _setting("TagWorkers", 2)
+    pipeline_queue_size: int = _setting("PipelineQueueSize", 4)
+
+    def __post_init__(self) -> None:
+        for name in (
+            "max_parallel_downloads",
+            "download_max_retries",
+            "reencode_workers",
+            "reencode_ffmpeg_threads",
+            "reencode_niceness",
+            "search_resolve_workers",
+            "tag_workers",
+            "pipeline_queue_size",
+        ):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} darf nicht negativ sein: {getattr(self, name)}")
+
+
+_MISSING = object()
+
+
+def _config_value(config: Mapping[str, Any], key: str) -> Any:
+    """Wert zu 'key' inkl. früherer Schreibweisen (CONFIG_KEY_ALIASES)."""
+    for candidate in (key, *CONFIG_KEY_ALIASES.get(key, ())):
+        if candidate in config:
+            return config[candidate]
+    return _MISSING
+
+
+def _env_value(environ: Mapping[str, str], name: str) -> Any:
+    """Wert aus TRACKBRIDGE_<FELD> bzw. der historischen Variable (leer = nicht gesetzt)."""
+    for candidate in (ENV_PREFIX + name.upper(), ENV_ALIASES.get(name)):
+        if candidate and (environ.get(candidate) or "").strip():
+            return environ[candidate].strip()
+    return _MISSING
+
+
+def _coerce(name: str, value: Any, default: Any) -> Any:
+    """Wandelt 'value' in den Typ des Defaults (Strings aus der Umgebung inklusive)."""
+    try:
+        if isinstance(default, bool):
+            if isinstance(value, str):
+                return value.strip().lower() in ("1", "true", "yes", "on", "ja")
+            return bool(value)
+        if isinstance(default, int):
+            return int(value)
+        if isinstance(default, float):
+            return float(value)
+        if isinstance(default, Path):
+            return Path(str(value)).expanduser().resolve()
+        if isinstance(default, tuple):
+            if isinstance(value, str):
+                value = [part.strip() for part in value.split(",")]
+            return tuple(str(v) for v in value if v)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Ungültiger Wert für {name}: {value!r}") from exc
+    return str(value)
+
+
+def _normalize(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Vereinheitlicht Schreibweisen (Groß-/Kleinschreibung, Slash am Ende)."""
+    values["spotify_client_id"] = values["spotify_client_id"].strip()
+    values["spotify_client_secret"] = values["spotify_client_secret"].strip()
+    values["spotify_api_base_url"] = values["spotify_api_base_url"].rstrip("/")
+    values["spotify_paging_mode"] = values["spotify_paging_mode"].lower()
+    values["export_engine"] = values["export_engine"].lower()
+    values["download_engine"] = values["download_engine"].lower()
+    return values
+
+
+def load_settings(
+    config: Optional[Mapping[str, Any]] = None,
+    environ: Optional[Mapping[str, str]] = None,
+    **overrides: Any,
+) -> Settings:
+    """
+    Baut Settings aus config.json ('config', Default: CONFIG), Umgebung
+    ('environ', Default: os.environ) und expliziten Overrides (None = nicht
+    gesetzt).
+    """
+    config = CONFIG if config is None else config
+    environ = os.environ if environ is None else environ
 
-DEFAULT_FORMAT = CONFIG.get("DefaultFormat", "json")
+    values: Dict[str, Any] = {}
+    for f in fields(Settings):
+        raw = _env_value(environ, f.name)
+        if raw is _MISSING:
+            raw = _config_value(config, f.metadata["key"])
+        if raw is _MISSING or raw is None:
+            raw = f.default
+        values[f.name] = _coerce(f.name, raw, f.default)
 
-# yt-dlp-bezogene Settings
-YTDLP_TEXTFILE_PATTERN = CONFIG.get(
-    "YTDLP_TextFilePattern",
-    "spotify_{playlist_id}_yt-dlp.txt",
-)
+    for name, value in overrides.items():
+        if value is not None:
+            values[name] = value
+    return Settings(**_normalize(values))
 
-AUDIO_PREFERRED_FORMATS = CONFIG.get(
-    "AudioPreferredFormats",
-    ["m4a", "mp3", "aac", "opus", "flac"],
-)
 
+_settings: Settings = load_settings()
 
-MAX_PARALLEL_DOWNLOADS = int(CONFIG.get("MaxParallelDownloads", 2))
 
-# Audio-Dateinamen & Pfadlängen
-AUDIO_OUTPUT_EXTENSION = CONFIG.get("AudioOutputExtension", "m4a")
-AUDIO_FILENAME_TEMPLATE = CONFIG.get(
-    "AudioFilenameTemplate",
-    "{track_number_padded} {title_sanitized}",
-)
-MAX_FILENAME_LENGTH = int(CONFIG.get("MaxFilenameLength", 80))
-
-# Download-Retries
-DOWNLOAD_MAX_RETRIES = int(CONFIG.get("DownloadMaxRetries", 2))
-
-"""
-# Timeout-Einstellungen (für yt-dlp)
-YTDLP_SOCKET_TIMEOUT = int(CONFIG.get("YTDLP_SocketTimeout", 15))
-YTDLP_READ_TIMEOUT = int(CONFIG.get("YTDLP_ReadTimeout", 30))
-YTDLP_CONNECT_TIMEOUT = int(CONFIG.get("YTDLP_ConnectTimeout", 15))
-# Proxy-Einstellungen
-YTDLP_HTTP_PROXY = CONFIG.get("YTDLP_HttpProxy", None)
-YTDLP_HTTPS_PROXY = CONFIG.get("YTDLP_HttpsProxy", None)
-YTDLP_PROXY = CONFIG.get("YTDLP_Proxy", None)
-"""
-
-SKIP_EXISTING_FILES = bool(CONFIG.get("SkipExistingFiles", True))
-
-KNOWN_AUDIO_EXTENSIONS: list[str] = CONFIG.get(
-    "KnownAudioExtensions",
-    [
-        "m4a",
-        "aac",
-        "mp3",
-        "flac",
-        "alac",
-        "aiff",
-        "aif",
-        "wav",
-        "webm",
-        "opus",
-    ],
-)
+def get_settings() -> Settings:
+    """Aktuelle prozessweite Settings (inkl. CLI-Overrides)."""
+    return _settings
 
-DJ_COMPATIBILITY_PROFILE = CONFIG.get(
-    "DJCompatibilityProfile",
-    "none"
-)
 
-DJ_WARN_ON_INCOMPATIBLE = bool(
-    CONFIG.get("DJWarnOnIncompatible", True))
+def override_settings(**changes: Any) -> Settings:
+    """
+    Ersetzt die prozessweiten Settings für diesen Lauf, z. B. mit
+    `run-downloads --jobs 4`. None-Werte werden ignoriert; config.json
+    bleibt unverändert.
+    """
+    global _settings
 
-ALLOW_REENCODE_FOR_INCOMPATIBLE = bool(
-    CONFIG.get("AllowReencodeForIncompatible", False)
-)
-PREFERRED_HIGH_QUALITY_TARGET = CONFIG.get(
-    "PreferredHighQualityTarget",
-    "aiff",
-)
+    changes = {k: v for k, v in changes.items() if v is not None}
+    if changes:
+        _settings = replace(_settings, **changes)
+    return _settings
 
-REMOVE_SOURCE_AFTER_REENCODE = bool(
-    CONFIG.get("RemoveSourceAfterReencode", True)
-)
 
-DENY_WAV_COMPLETELY = bool(
-    CONFIG.get("DenyWavCompletely", False)
+# ---------------------------------------------------------------------------
+# Modul-Konstanten (Stand beim Start, für bestehende Importe)
+# ---------------------------------------------------------------------------
+#
+# Nur noch Aliase für ältere Importe: spätere override_settings()-Aufrufe
+# (CLI) sehen sie nicht. Einstellungen zur Laufzeit über get_settings()
+# lesen; feste Pfade (DATA_DIR) und die API-Basis-URL bleiben Konstanten.
+
+DATA_DIR: Path = _settings.data_dir
+
+SPOTIFY_CLIENT_ID: str = _settings.spotify_client_id
+SPOTIFY_CLIENT_SECRET: str = _settings.spotify_client_secret
+SPOTIFY_TOKEN_URL: str = _settings.spotify_token_url
+SPOTIFY_API_BASE_URL: str = _settings.spotify_api_base_url
+
+SPOTIFY_HTTP_POOL_SIZE: int = _settings.spotify_http_pool_size
+SPOTIFY_HTTP_MAX_RETRIES: int = _settings.spotify_http_max_retries
+SPOTIFY_HTTP_BACKOFF_SECONDS: float = _settings.spotify_http_backoff_seconds
+SPOTIFY_HTTP_TIMEOUT: float = _settings.spotify_http_timeout
+
+SPOTIFY_RATE_LIMIT_PER_SECOND: float = _settings.spotify_rate_limit_per_second
+SPOTIFY_RATE_LIMIT_BURST: int = _settings.spotify_rate_limit_burst
+SPOTIFY_RATE_LIMIT_MIN_PER_SECOND: float = _settings.spotify_rate_limit_min_per_second
+
+SPOTIFY_PAGING_MODE: str = _settings.spotify_paging_mode
+SPOTIFY_PAGING_WORKERS: int = _settings.spotify_paging_workers
+
+EXPORT_ENGINE: str = _settings.export_engine
+ASYNC_MAX_CONCURRENCY: int = _settings.async_max_concurrency
+EXPORT_COMPACT_JSON: bool = _settings.export_compact_json
+EXPORT_GZIP: bool = _settings.export_gzip
+EXPORT_MANY_WORKERS: int = _settings.export_many_workers
+
+METADATA_CACHE_ENABLED: bool = _settings.metadata_cache_enabled
+METADATA_CACHE_ALBUM_TTL_DAYS: float = _settings.metadata_cache_album_ttl_days
+METADATA_CACHE_ARTIST_TTL_DAYS: float = _settings.metadata_cache_artist_ttl_days
+METADATA_CACHE_AUDIO_FEATURES_TTL_DAYS: float = (
+    _settings.metadata_cache_audio_features_ttl_days
 )
+METADATA_CACHE_NEGATIVE_TTL_HOURS: float = _settings.metadata_cache_negative_ttl_hours
+METADATA_CACHE_MAX_ENTRIES: int = _settings.metadata_cache_max_entries
+
+ETAG_CACHE_ENABLED: bool = _settings.etag_cache_enabled
+ETAG_CACHE_MAX_ENTRIES: int = _settings.etag_cache_max_entries
+
+RESPONSE_ARCHIVE_ENABLED: bool = _settings.response_archive_enabled
+EXPORT_CHECKPOINTS_ENABLED: bool = _settings.export_checkpoints_enabled
+
+OUTPUT_DIRECTORY: Path = _settings.output_directory
+DEFAULT_FORMAT: str = _settings.default_format
+YTDLP_TEXTFILE_PATTERN: str = _settings.ytdlp_textfile_pattern
+
+AUDIO_PREFERRED_FORMATS: Tuple[str, ...] = _settings.audio_preferred_formats
+MAX_PARALLEL_DOWNLOADS: int = _settings.max_parallel_downloads
+DOWNLOAD_MAX_RETRIES: int = _settings.download_max_retries
+MAX_RETRIES_PER_JOB: int = DOWNLOAD_MAX_RETRIES  # frühere Bezeichnung
+DOWNLOAD_ENGINE: str = _settings.download_engine
+
+SEARCH_RESOLVE_ENABLED: bool = _settings.search_resolve_enabled
+SEARCH_RESOLVE_WORKERS: int = _settings.search_resolve_workers
+SEARCH_CACHE_TTL_DAYS: float = _settings.search_cache_ttl_days
+SEARCH_CACHE_NEGATIVE_TTL_HOURS: float = _settings.search_cache_negative_ttl_hours
+SKIP_EXISTING_FILES: bool = _settings.skip_existing_files
+KNOWN_AUDIO_EXTENSIONS: Tuple[str, ...] = _settings.known_audio_extensions
+
+AUDIO_OUTPUT_EXTENSION: str = _settings.audio_output_extension
+AUDIO_FILENAME_TEMPLATE: str = _settings.audio_filename_template
+MAX_FILENAME_LENGTH: int = _settings.max_filename_length
+
+REGISTRY_ENABLED: bool = _settings.registry_enabled
+REGISTRY_STORE_SPOTIFY_URL: bool = _settings.registry_store_spotify_url
+
+DJ_COMPATIBILITY_PROFILE: str = _settings.dj_compatibility_profile
+DJ_WARN_ON_INCOMPATIBLE: bool = _settings.dj_warn_on_incompatible
+DENY_WAV_COMPLETELY: bool = _settings.deny_wav_completely
+ALLOW_REENCODE_FOR_INCOMPATIBLE: bool = _settings.allow_reencode_for_incompatible
+PREFERRED_HIGH_QUALITY_TARGET: str = _settings.preferred_high_quality_target
+REMOVE_SOURCE_AFTER_REENCODE: bool = _settings.remove_source_after_reencode
+REENCODE_WORKERS: int = _settings.reencode_workers
+REENCODE_FFMPEG_THREADS: int = _settings.reencode_ffmpeg_threads
+REENCODE_NICENESS: int = _settings.reencode_niceness
+
+TAG_WORKERS: int = _settings.tag_workers
+PIPELINE_QUEUE_SIZE: int = _settings.pipeline_queue_size
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from queue import Queue
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# ---------------------------------------------------------------------------
+# Stufen-Pipeline mit begrenzten Queues
+# ---------------------------------------------------------------------------
+#
+# run-downloads verarbeitet jeden Track in mehreren Stufen (Download ->
+# Reencode -> Tagging -> Registry). Jede Stufe hat einen eigenen Thread-Pool,
+# der unabhängig dimensioniert wird (netzwerk- vs. CPU-gebunden, SQLite mit
+# einem Schreiber). Zwischen den Stufen liegen Queues mit fester Größe:
+# - ein Download-Slot ist frei, sobald die Datei auf der Platte liegt
+# - ist eine spätere Stufe ausgelastet, blockiert put() die vorherige
+#   (Backpressure) – es stauen sich also höchstens queue_size Dateien
+#
+# Der Handler einer Stufe gibt das Element für die nächste Stufe zurück oder
+# None, wenn es dort nichts mehr zu tun gibt. Exceptions im Handler werden
+# gemeldet und verwerfen nur dieses Element.
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """Eine Pipeline-Stufe: Name, Anzahl Worker-Threads, Handler."""
+    name: str
+    workers: int
+    handler: Callable[[Any], Optional[Any]]
+
+
+@dataclass
+class StageStats:
+    """Zähler einer Stufe für einen Lauf."""
+    workers: int = 0
+    processed: int = 0
+    passed_on: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0  # Summe der Handler-Laufzeiten
+    blocked_seconds: float = 0.0  # Warten auf Platz in der nächsten Queue
+
+
+@dataclass
+class PipelineStats:
+    """Ergebnis von run_pipeline()."""
+    wall_seconds: float = 0.0
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+
+
+def run_pipeline(
+    items: Iterable[Any],
+    stages: List[Stage],
+    queue_size: int,
+) -> PipelineStats:
+    """
+    Schickt 'items' durch 'stages' und wartet, bis alle Stufen leer sind.
+
+    Vor jeder Stufe liegt eine Queue mit höchstens 'queue_size' Elementen
+    (mindestens 1), d. h. auch 'items' wird nur so schnell gelesen, wie die
+    erste Stufe abarbeitet.
+    """
+    maxsize = max(1, queue_size)
+    queues: List[Queue[Any]] = [Queue(maxsize=maxsize) for _ in stages]
+    stats = PipelineStats(
+        stages={s.name: StageStats(workers=max(1, s.workers)) for s in stages}
+    )
+    stats_lock = threading.Lock()
+
+    remaining = [max(1, s.workers) for s in stages]
+    remaining_lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        stage = stages[index]
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(stages) else None
+        stage_stats = stats.stages[stage.name]
+
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+
+            started = time.perf_counter()
+            try:
+                result = stage.handler(item)
+                failed = False
+            except Exception as exc:  # noqa: BLE001
+                print(f"[PIPELINE-ERROR] Stufe '{stage.name}': {exc}")
+                result = None
+                failed = True
+            busy = time.perf_counter() - started
+
+            blocked = 0.0
+            if outbox is not None and result is not None:
+                put_started = time.perf_counter()
+                outbox.put(result)
+                blocked = time.perf_counter() - put_started
+
+            with stats_lock:
+                stage_stats.processed += 1
+                stage_stats.errors += int(failed)
+                stage_stats.passed_on += int(result is not None)
+                stage_stats.busy_seconds += busy
+                stage_stats.blocked_seconds += blocked
+
+        # Letzter Worker dieser Stufe beendet die nächste Stufe
+        with remaining_lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+        if last and outbox is not None:
+            for _ in range(max(1, stages[index + 1].workers)):
+                outbox.put(_DONE)
+
+    started = time.perf_counter()
+    threads: List[threading.Thread] = []
+    for index, stage in enumerate(stages):
+        for n in range(max(1, stage.workers)):
+            t = threading.Thread(
+                target=worker,
+                args=(index,),
+                name=f"{stage.name}-{n + 1}",
+                daemon=True,
+            )
+            t.start()
+            threads.append(t)
+
+    if stages:
+        for item in items:
+            queues[0].put(item)
+        for _ in range(max(1, stages[0].workers)):
+            queues[0].put(_DONE)
+
+    for t in threads:
+        t.join()
+
+    stats.wall_seconds = time.perf_counter() - started
+    return stats
+
+
+def format_pipeline_stats(stats: PipelineStats) -> List[str]:
+    """Eine Zeile pro Stufe: Worker, Elemente, Auslastung, Warten auf Platz."""
+    lines = []
+    wall = stats.wall_seconds or 1e-9
+    for name, s in stats.stages.items():
+        utilization = s.busy_seconds / (wall * s.workers) * 100
+        lines.append(
+            f"{name:<10} {s.workers:>2} Worker | {s.processed:>4} Element(e) | "
+            f"Auslastung {utilization:5.1f} % | blockiert {s.blocked_seconds:6.1f} s"
+            + (f" | Fehler {s.errors}" if s.errors else "")
+        )
+    return lines
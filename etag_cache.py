@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+import zlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import requests
+
+from config import DATA_DIR, get_settings
+from sqlite_cache import CacheDatabase, StatsCounter
+
+
+# ---------------------------------------------------------------------------
+# ETag-Cache für bedingte Web-API-Requests (If-None-Match / 304)
+# ---------------------------------------------------------------------------
+#
+# Speichert zu jeder GET-URL (inkl. Query, ohne Token) die letzte Antwort mit
+# ETag in data/etag_cache.db. spotify_get() schickt beim nächsten Abruf
+# If-None-Match mit; antwortet Spotify mit 304, wird der gespeicherte Body als
+# normale 200-Response zurückgegeben – eine unveränderte Playlist-Seite oder
+# ein unveränderter Artist kostet dann nur noch einen Header-Roundtrip.
+#
+# Bodies werden zlib-komprimiert abgelegt; über EtagCacheMaxEntries hinaus
+# fliegen die am längsten nicht genutzten Einträge (evict).
+
+DB_PATH = DATA_DIR / "etag_cache.db"
+
+# Markiert Responses, die aus dem Cache stammen (304 -> gespeicherter Body)
+REVALIDATED_HEADER = "X-TrackBridge-Revalidated"
+
+# Eviction nicht bei jedem Schreiben prüfen, sondern nur alle N Einträge
+_EVICTION_CHECK_INTERVAL = 200
+
+
+@dataclass
+class EtagStats:
+    """Zähler für einen Lauf."""
+    revalidated: int = 0  # 304 -> gespeicherter Body
+    changed: int = 0  # ETag gesendet, aber neuer Body (200)
+    misses: int = 0  # kein gespeicherter ETag
+    stored: int = 0
+    bytes_saved: int = 0  # Größe der nicht erneut übertragenen Bodies
+
+
+@dataclass
+class CachedResponse:
+    """Gespeicherte Antwort zu einer URL."""
+    etag: str
+    body: bytes
+    content_type: str
+
+
+_stats = StatsCounter(EtagStats)
+
+
+def get_etag_stats() -> Dict[str, int]:
+    """Liefert eine Kopie der ETag-Zähler."""
+    return _stats.get()
+
+
+def reset_etag_stats() -> None:
+    """Setzt die ETag-Zähler zurück (z. B. zu Beginn eines Exports)."""
+    _stats.reset()
+
+
+def format_etag_stats() -> str:
+    """Kompakte, einzeilige Darstellung der ETag-Zähler inkl. Quoten."""
+    stats = get_etag_stats()
+    total = stats["revalidated"] + stats["changed"] + stats["misses"]
+    if not total:
+        return "keine bedingten Requests"
+
+    def pct(value: int) -> str:
+        return f"{value / total * 100:.0f}%"
+
+    return (
+        f"304: {stats['revalidated']} ({pct(stats['revalidated'])}) | "
+        f"Geändert: {stats['changed']} ({pct(stats['changed'])}) | "
+        f"Miss: {stats['misses']} ({pct(stats['misses'])}) | "
+        f"Gespart: {stats['bytes_saved'] / 1024:.1f} KiB"
+    )
+
+
+# ---------------------------------------------------------------------------
+# SQLite-Helfer
+# ---------------------------------------------------------------------------
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Legt Tabelle und Index an (idempotent)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS responses (
+            url           TEXT PRIMARY KEY,
+            etag          TEXT NOT NULL,
+            content_type  TEXT,
+            body          BLOB NOT NULL,
+            stored_at     REAL NOT NULL,
+            last_access   REAL NOT NULL
+        );
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_responses_last_access "
+        "ON responses(last_access);"
+    )
+
+
+_db = CacheDatabase(DB_PATH, _init_schema)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def request_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Cache-Schlüssel: vollständige URL inkl. Query (wie requests sie baut)."""
+    prepared = requests.Request("GET", url, params=params).prepare()
+    return str(prepared.url)
+
+
+def lookup(key: str) -> Optional[CachedResponse]:
+    """Gespeicherte Antwort zu 'key' oder None."""
+    if not get_settings().etag_cache_enabled:
+        return None
+
+    try:
+        with _db.connect() as conn:
+            row = conn.execute(
+                "SELECT etag, content_type, body FROM responses WHERE url = ?;",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE responses SET last_access = ? WHERE url = ?;",
+                (time.time(), key),
+            )
+        return CachedResponse(
+            etag=row[0],
+            body=zlib.decompress(row[2]),
+            content_type=row[1] or "application/json",
+        )
+    except (sqlite3.Error, zlib.error) as exc:
+        print(f"[CACHE-WARN] ETag-Cache nicht lesbar: {exc}")
+        return None
+
+
+def store(key: str, resp: requests.Response) -> None:
+    """Speichert eine 200-Antwort mit ETag (ohne ETag: nichts zu tun)."""
+    etag = resp.headers.get("ETag")
+    if not get_settings().etag_cache_enabled or not etag or resp.status_code != 200:
+        return
+
+    now = time.time()
+    try:
+        with _db.connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (url, etag, content_type, body, stored_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?);
+                """,
+                (
+                    key,
+                    etag,
+                    resp.headers.get("Content-Type"),
+                    zlib.compress(resp.content),
+                    now,
+                    now,
+                ),
+            )
+    except sqlite3.Error as exc:
+        print(f"[CACHE-WARN] ETag-Cache nicht beschreibbar: {exc}")
+        return
+
+    _stats.count(stored=1)
+
+    if _db.note_writes(1, _EVICTION_CHECK_INTERVAL):
+        evict()
+
+
+def resolve(
+    key: str,
+    cached: Optional[CachedResponse],
+    resp: requests.Response,
+) -> requests.Response:
+    """
+    Wertet die Antwort auf einen (ggf. bedingten) Request aus:
+    - 304 + gespeicherte Antwort -> 200-Response mit dem gespeicherten Body
+    - 200 mit ETag -> speichern
+    Alle anderen Antworten werden unverändert durchgereicht.
+    """
+    if resp.status_code == 304 and cached is not None:
+        _stats.count(revalidated=1, bytes_saved=len(cached.body))
+        return _replay(resp, cached)
+
+    if resp.status_code == 200:
+        _stats.count(**({"changed": 1} if cached is not None else {"misses": 1}))
+        store(key, resp)
+
+    return resp
+
+
+def _replay(resp: requests.Response, cached: CachedResponse) -> requests.Response:
+    """Baut aus einer 304-Antwort eine 200-Response mit gespeichertem Body."""
+    replay = requests.Response()
+    replay.status_code = 200
+    replay.reason = "OK"
+    replay.url = resp.url
+    replay.request = resp.request
+    replay.elapsed = resp.elapsed
+    replay.headers.update(resp.headers)
+    replay.headers["Content-Type"] = cached.content_type
+    replay.headers["Content-Length"] = str(len(cached.body))
+    replay.headers["ETag"] = resp.headers.get("ETag") or cached.etag
+    replay.headers[REVALIDATED_HEADER] = "1"
+    replay._content = cached.body
+    replay.encoding = "utf-8"
+    return replay
+
+
+def evict(max_entries: int | None = None) -> int:
+    """
+    Begrenzt den Cache auf 'max_entries' (Default: EtagCacheMaxEntries),
+    die am längsten nicht genutzten Einträge fliegen zuerst.
+    Gibt die Anzahl gelöschter Zeilen zurück.
+    """
+    if max_entries is None:
+        limit = get_settings().etag_cache_max_entries
+    else:
+        limit = max_entries
+
+    try:
+        with _db.connect() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM responses;").fetchone()
+            overflow = int(count) - limit
+            if overflow <= 0:
+                return 0
+            cur = conn.execute(
+                """
+                DELETE FROM responses WHERE rowid IN (
+                    SELECT rowid FROM responses
+                    ORDER BY last_access ASC
+                    LIMIT ?
+                );
+                """,
+                (overflow,),
+            )
+            return cur.rowcount or 0
+    except sqlite3.Error as exc:
+        print(f"[CACHE-WARN] ETag-Eviction fehlgeschlagen: {exc}")
+        return 0
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import json
+import shutil
+import threading
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from config import DATA_DIR
+from util_files import atomic_write, file_lock
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints laufender Exporte (Wiederaufnahme nach Abbruch)
+# ---------------------------------------------------------------------------
+#
+# Bricht ein großer Export ab (Seite 80 von 100, ein Feature-Batch, Strg+C),
+# liegt alles bereits Geholte unter data/checkpoints/<playlist_id>/:
+# - state.json: snapshot_id, Track-Limit und 'fields'-Filter des Laufs
+# - pages/<offset>.json: Tracks einer Playlist-Seite (ab der zweiten Seite)
+# - <kind>/<n>.json: je ein Batch Audio-Features / Alben / Artists
+#   (kind wie im metadata_cache; null = "Spotify kennt dazu nichts")
+#
+# Der nächste Export derselben Playlist setzt dort fort und fragt nur fehlende
+# Seiten und IDs an. Passt state.json nicht mehr (Playlist geändert, anderes
+# Limit oder andere Projektion), wird der Checkpoint verworfen. Nach dem
+# atomaren Schreiben der Extended-Datei löscht der Exporter ihn
+# (clear_checkpoint).
+#
+# Paging über 'tracks.next' (SpotifyPagingMode "serial" bzw. ohne
+# 'tracks.total') wird nicht gesichert, die Anreicherung schon.
+#
+# Prüfen/Verwerfen und Löschen laufen unter einer Lock-Datei
+# (<playlist_id>.lock neben dem Ordner), damit ein zweiter Prozess nicht den
+# Checkpoint löscht, während der erste ihn gerade anlegt. Gleichzeitige
+# Exporte derselben Playlist werden darüber hinaus nicht koordiniert: sie
+# teilen sich einen passenden Checkpoint, und der zuerst fertige räumt ihn weg.
+
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+PAGES_DIR_NAME = "pages"
+STATE_FILE_NAME = "state.json"
+
+# Warten auf den Checkpoint-Lock; ältere Lock-Dateien gelten als verwaist
+CHECKPOINT_LOCK_TIMEOUT_SECONDS = 15.0
+CHECKPOINT_LOCK_STALE_SECONDS = 30
+
+
+def _checkpoint_path(playlist_id: str) -> Path:
+    return CHECKPOINT_DIR / playlist_id
+
+
+def _checkpoint_lock(playlist_id: str) -> AbstractContextManager[bool]:
+    return file_lock(
+        CHECKPOINT_DIR / f"{playlist_id}.lock",
+        CHECKPOINT_LOCK_TIMEOUT_SECONDS,
+        CHECKPOINT_LOCK_STALE_SECONDS,
+    )
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    atomic_write(
+        path,
+        json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+    )
+
+
+def _read_json(path: Path) -> Any:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ExportCheckpoint:
+    """
+    Checkpoint eines Exports. Threadsicher: parallele Paging-Worker und
+    die Async-Engine schreiben gleichzeitig hinein.
+    """
+
+    def __init__(self, playlist_id: str, path: Path) -> None:
+        self.playlist_id = playlist_id
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._pages: Dict[int, List[Dict[str, Any]]] = {}
+        self._entities: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+        self._batch_counter = 0
+
+    def _load(self) -> None:
+        """Liest bereits gesicherte Seiten und Batches ein."""
+        for entry in sorted(self.path.iterdir()):
+            if not entry.is_dir():
+                continue
+            for file in sorted(entry.glob("*.json")):
+                try:
+                    data = _read_json(file)
+                except (OSError, ValueError):
+                    # halb geschriebene Dateien gibt es wegen atomic_write
+                    # nicht; unlesbare Dateien werden einfach neu geholt
+                    continue
+                if entry.name == PAGES_DIR_NAME:
+                    self._pages[int(file.stem)] = data
+                else:
+                    self._entities.setdefault(entry.name, {}).update(data)
+                    self._batch_counter = max(self._batch_counter, int(file.stem) + 1)
+
+    @property
+    def resumed(self) -> bool:
+        """True, wenn der Checkpoint Daten eines früheren Laufs enthält."""
+        with self._lock:
+            return bool(self._pages or any(self._entities.values()))
+
+    def summary(self) -> str:
+        """Kurzbeschreibung des gesicherten Stands für die CLI."""
+        with self._lock:
+            parts = [f"{len(self._pages)} Seite(n)"]
+            parts.extend(
+                f"{len(entries)} {kind}" for kind, entries in sorted(self._entities.items())
+            )
+        return ", ".join(parts)
+
+    # --- Seiten -------------------------------------------------------------
+
+    def load_page(self, offset: int) -> Optional[List[Dict[str, Any]]]:
+        """Tracks der Seite ab 'offset' oder None, wenn sie noch fehlt."""
+        with self._lock:
+            return self._pages.get(offset)
+
+    def save_page(self, offset: int, tracks: List[Dict[str, Any]]) -> None:
+        """Sichert die Tracks einer vollständig geladenen Seite."""
+        _write_json(self.path / PAGES_DIR_NAME / f"{offset:08d}.json", tracks)
+        with self._lock:
+            self._pages[offset] = tracks
+
+    # --- Anreicherung -------------------------------------------------------
+
+    def load_entities(
+        self,
+        kind: str,
+        ids: List[str],
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Bereits gesicherte Einträge zu 'ids' (Werte können None sein =
+        Spotify hat zu dieser ID nichts geliefert).
+        """
+        with self._lock:
+            known = self._entities.get(kind) or {}
+            return {i: known[i] for i in ids if i in known}
+
+    def save_entities(
+        self,
+        kind: str,
+        entries: Mapping[str, Optional[Dict[str, Any]]],
+    ) -> None:
+        """Sichert einen erfolgreich abgefragten Batch."""
+        if not entries:
+            return
+
+        with self._lock:
+            number = self._batch_counter
+            self._batch_counter += 1
+        _write_json(self.path / kind / f"{number:06d}.json", dict(entries))
+        with self._lock:
+            self._entities.setdefault(kind, {}).update(entries)
+
+
+def open_checkpoint(
+    playlist_id: str,
+    snapshot_id: Optional[str],
+    fields: str,
+    limit: int | None = None,
+) -> Optional[ExportCheckpoint]:
+    """
+    Öffnet den Checkpoint eines Exports bzw. legt ihn neu an.
+
+    Ein vorhandener Checkpoint wird nur übernommen, wenn snapshot_id,
+    'fields'-Filter und Limit übereinstimmen. Ohne snapshot_id lässt sich
+    das nicht prüfen – dann gibt es keinen Checkpoint (None). Hält ein
+    anderer Export den Lock länger als CHECKPOINT_LOCK_TIMEOUT_SECONDS,
+    gibt es TimeoutError (ein OSError).
+    """
+    if not snapshot_id:
+        return None
+
+    path = _checkpoint_path(playlist_id)
+    state = {
+        "version": CHECKPOINT_FORMAT_VERSION,
+        "playlist_id": playlist_id,
+        "snapshot_id": snapshot_id,
+        "fields": fields,
+        "track_limit": limit,
+    }
+
+    with _checkpoint_lock(playlist_id) as locked:
+        if not locked:
+            raise TimeoutError(
+                f"Checkpoint von {playlist_id} ist durch einen anderen Export gesperrt"
+            )
+
+        checkpoint = ExportCheckpoint(playlist_id, path)
+        try:
+            previous = _read_json(path / STATE_FILE_NAME)
+        except (OSError, ValueError):
+            previous = None
+
+        if previous == state:
+            checkpoint._load()
+            if checkpoint.resumed:
+                print(
+                    f"[CHECKPOINT] Setze Export von {playlist_id} fort: "
+                    f"{checkpoint.summary()} bereits geladen."
+                )
+            return checkpoint
+
+        if path.exists():
+            if previous is not None:
+                print(
+                    f"[CHECKPOINT] Checkpoint von {playlist_id} passt nicht mehr "
+                    "(Playlist oder Export-Optionen geändert) – starte neu."
+                )
+            shutil.rmtree(path, ignore_errors=True)
+        _write_json(path / STATE_FILE_NAME, state)
+        return checkpoint
+
+
+def clear_checkpoint(playlist_id: str) -> None:
+    """Löscht den Checkpoint einer Playlist (nach erfolgreichem Schreiben)."""
+    with _checkpoint_lock(playlist_id) as locked:
+        if not locked:
+            print(
+                f"[WARN] Checkpoint von {playlist_id} ist gesperrt und bleibt liegen "
+                "(wird beim nächsten Export geprüft)."
+            )
+            return
+        shutil.rmtree(_checkpoint_path(playlist_id), ignore_errors=True)
+
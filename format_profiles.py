@@ -3,8 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Optional
 
-from config import DJ_COMPATIBILITY_PROFILE
-from config import DENY_WAV_COMPLETELY
+from config import get_settings
 
 # Bekannte, CDJ-2000NXS2-kompatible Endungen (Container/Codecs)
 CDJ2000NXS2_COMPATIBLE_EXTENSIONS = {
@@ -16,14 +15,15 @@ CDJ2000NXS2_COMPATIBLE_EXTENSIONS = {
     "wav",          # allerletzter fallback – tags sehr eingeschränkt
 }
 
-if DENY_WAV_COMPLETELY:
-    CDJ2000NXS2_COMPATIBLE_EXTENSIONS.discard("wav")
-
 def is_cdj2000nxs2_compatible(ext: str) -> bool:
     """
-    Prüft, ob eine Dateiendung für CDJ-2000NXS2 als kompatibel gilt.
+    Prüft, ob eine Dateiendung für CDJ-2000NXS2 als kompatibel gilt
+    (WAV nicht bei DenyWAVCompletely).
     """
-    return ext.lower() in CDJ2000NXS2_COMPATIBLE_EXTENSIONS
+    ext = ext.lower()
+    if ext == "wav" and get_settings().deny_wav_completely:
+        return False
+    return ext in CDJ2000NXS2_COMPATIBLE_EXTENSIONS
 
 
 def is_ext_compatible_with_active_profile(ext: str) -> bool:
@@ -33,7 +33,7 @@ def is_ext_compatible_with_active_profile(ext: str) -> bool:
     - "cdj2000nxs2" -> nutzt is_cdj2000nxs2_compatible
     - "none" oder unbekannt -> immer True (kein Check)
     """
-    profile = (DJ_COMPATIBILITY_PROFILE or "").lower()
+    profile = (get_settings().dj_compatibility_profile or "").lower()
 
     if profile == "cdj2000nxs2":
         return is_cdj2000nxs2_compatible(ext)
@@ -1,19 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import time
 from pathlib import Path
 
-from playlist_exporter import (
-    export_playlist_to_json,
-    export_playlist_to_ytdlp_txt,
-)
-from yt_dlp_runner import (
-    plan_downloads_for_playlist,
-    print_download_plan,
-    run_downloads_for_playlist,
-)
-from spotify_client import get_access_token, SpotifyAuthError
-from collection_analyzer import analyze_playlist_folder
+
+# Die Subcommand-Module (requests, mutagen, SQLite, ...) werden erst im
+# jeweiligen Handler importiert: `--help` und einfache Befehle starten so ohne
+# diese Kosten (Messung: benchmarks/bench_startup.py).
 
 
 def sanity_check() -> bool:
@@ -22,6 +16,8 @@ def sanity_check() -> bool:
     - .env korrekt geladen wird
     - ein Access-Token von Spotify geholt werden kann
     """
+    from spotify_client import SpotifyAuthError, get_access_token
+
     try:
         token = get_access_token()
     except SpotifyAuthError as exc:
@@ -42,7 +38,10 @@ def build_parser() -> argparse.ArgumentParser:
     Subcommands:
     - sanity-check
     - export
+    - export-many
     - export-ytdlp
+    - convert-playlist
+    - rebuild-extended
     - plan-downloads
     - run-downloads
     - analyze-playlist
@@ -59,8 +58,8 @@ def build_parser() -> argparse.ArgumentParser:
         title="Befehle",
         dest="command",
     metavar=(
-        "{sanity-check,export,export-ytdlp,"
-        "plan-downloads,run-downloads,tag-playlist,analyze-playlist,debug-registry}"
+        "{sanity-check,export,export-many,export-ytdlp,convert-playlist,"
+        "rebuild-extended,plan-downloads,run-downloads,tag-playlist,analyze-playlist,debug-registry}"
     ),
 
     )
@@ -101,8 +100,113 @@ def build_parser() -> argparse.ArgumentParser:
             "basierend auf der config.json verwendet."
         ),
     )
+    export_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Bestehende Extended-JSON weiterverwenden: bei unveränderter "
+            "snapshot_id kein Neuexport, sonst nur neue Tracks anreichern."
+        ),
+    )
+    export_parser.add_argument(
+        "--engine",
+        choices=["sync", "async"],
+        default=None,
+        help=(
+            "Export-Engine: 'sync' (seriell) oder 'async' (Seiten, Audio-Features "
+            "und Genres gleichzeitig). Standard: ExportEngine aus config.json."
+        ),
+    )
+    export_parser.add_argument(
+        "--compact",
+        action="store_true",
+        default=None,
+        help=(
+            "Kompakte Extended-JSON: ohne Einrückung und ohne rohes "
+            "'audio_features'-Dict (Standard: ExportCompactJson)."
+        ),
+    )
+    export_parser.add_argument(
+        "--gzip",
+        action="store_true",
+        default=None,
+        help="Extended-JSON gzip-komprimiert als .json.gz schreiben (Standard: ExportGzip).",
+    )
+    export_parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default=None,
+        help=(
+            "Dateiformat: 'json' (eine JSON-Datei) oder 'jsonl' (JSON Lines, "
+            "schneller zu laden). Standard: DefaultFormat aus config.json."
+        ),
+    )
+    export_parser.add_argument(
+        "--with-ytdlp",
+        action="store_true",
+        help="Zusätzlich die yt-dlp-Trackliste schreiben (ohne zweiten Spotify-Abruf).",
+    )
+    export_parser.add_argument(
+        "--archive",
+        action="store_true",
+        default=None,
+        help=(
+            "Rohdaten der API zusätzlich archivieren (für rebuild-extended). "
+            "Standard: ResponseArchiveEnabled."
+        ),
+    )
     export_parser.set_defaults(func=handle_export_playlist)
 
+    # ------------------------------------------------------------------
+    # export-many
+    # ------------------------------------------------------------------
+    export_many_parser = subparsers.add_parser(
+        "export-many",
+        help=(
+            "Exportiert mehrere Playlists in einem Prozess "
+            "(gemeinsamer Token, Session und Album-/Artist-Cache)."
+        ),
+    )
+    export_many_source = export_many_parser.add_mutually_exclusive_group(
+        required=True
+    )
+    export_many_source.add_argument(
+        "--playlist-ids",
+        nargs="+",
+        default=None,
+        help="Liste von Spotify-Playlist-IDs (durch Leerzeichen getrennt).",
+    )
+    export_many_source.add_argument(
+        "--file",
+        type=str,
+        default=None,
+        help="Textdatei mit einer Playlist-ID pro Zeile (# = Kommentar).",
+    )
+    export_many_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Anzahl parallel exportierter Playlists (Standard: ExportManyWorkers).",
+    )
+    export_many_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Wie bei `export`: unveränderte Playlists (snapshot_id) überspringen.",
+    )
+    export_many_parser.add_argument(
+        "--engine",
+        choices=["sync", "async"],
+        default=None,
+        help="Export-Engine pro Playlist (Standard: ExportEngine aus config.json).",
+    )
+    export_many_parser.add_argument(
+        "--archive",
+        action="store_true",
+        default=None,
+        help="Rohdaten der API zusätzlich archivieren (Standard: ResponseArchiveEnabled).",
+    )
+    export_many_parser.set_defaults(func=handle_export_many)
+
     # ------------------------------------------------------------------
     # export-ytdlp
     # ------------------------------------------------------------------
@@ -135,6 +239,95 @@ def build_parser() -> argparse.ArgumentParser:
     )
     export_ytdlp_parser.set_defaults(func=handle_export_ytdlp)
 
+    # ------------------------------------------------------------------
+    # convert-playlist
+    # ------------------------------------------------------------------
+    convert_parser = subparsers.add_parser(
+        "convert-playlist",
+        help=(
+            "Konvertiert eine vorhandene Extended-Datei zwischen JSON und "
+            "JSON Lines (optional gzip/kompakt)."
+        ),
+    )
+    convert_source = convert_parser.add_mutually_exclusive_group(required=True)
+    convert_source.add_argument(
+        "--playlist-id",
+        help="Spotify-Playlist-ID; die neueste vorhandene Extended-Datei wird konvertiert.",
+    )
+    convert_source.add_argument(
+        "--input",
+        type=str,
+        help="Pfad zur Quelldatei (.json, .jsonl, jeweils auch .gz).",
+    )
+    convert_parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        required=True,
+        help="Zielformat.",
+    )
+    convert_parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Zieldatei gzip-komprimiert schreiben.",
+    )
+    convert_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Ohne Einrückung und ohne rohes 'audio_features'-Dict schreiben.",
+    )
+    convert_parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help=(
+            "Optional: Zieldatei. Standard: Standardpfad der Playlist bzw. "
+            "Quelldatei mit neuer Endung."
+        ),
+    )
+    convert_parser.set_defaults(func=handle_convert_playlist)
+
+    # ------------------------------------------------------------------
+    # rebuild-extended
+    # ------------------------------------------------------------------
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-extended",
+        help=(
+            "Baut Extended-Dateien offline aus dem Rohdaten-Archiv neu "
+            "(nach Änderungen an Feldern, Dateinamen- oder Genre-Regeln)."
+        ),
+    )
+    rebuild_source = rebuild_parser.add_mutually_exclusive_group(required=True)
+    rebuild_source.add_argument(
+        "--playlist-ids",
+        nargs="+",
+        default=None,
+        help="Liste von Spotify-Playlist-IDs (durch Leerzeichen getrennt).",
+    )
+    rebuild_source.add_argument(
+        "--all",
+        action="store_true",
+        help="Alle Playlists mit Archiv neu bauen.",
+    )
+    rebuild_parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default=None,
+        help="Dateiformat (Standard: DefaultFormat aus config.json).",
+    )
+    rebuild_parser.add_argument(
+        "--gzip",
+        action="store_true",
+        default=None,
+        help="gzip-komprimiert schreiben (Standard: ExportGzip).",
+    )
+    rebuild_parser.add_argument(
+        "--compact",
+        action="store_true",
+        default=None,
+        help="Kompakt schreiben (Standard: ExportCompactJson).",
+    )
+    rebuild_parser.set_defaults(func=handle_rebuild_extended)
+
     # ------------------------------------------------------------------
     # plan-downloads
     # ------------------------------------------------------------------
@@ -168,6 +361,15 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional: maximale Anzahl geplanter Downloads (Standard: alle).",
     )
+    plan_parser.add_argument(
+        "--resolve",
+        action="store_true",
+        help=(
+            "Noch nicht aufgelöste Tracks jetzt auf YouTube suchen (nur Metadaten) "
+            "und das Ergebnis cachen. Ohne diese Option zeigt der Plan nur "
+            "bereits gecachte Ziele."
+        ),
+    )
     plan_parser.set_defaults(func=handle_plan_downloads)
 
     # ------------------------------------------------------------------
@@ -203,6 +405,43 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional: maximale Anzahl tatsächlicher Downloads (Standard: alle).",
     )
+    run_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Parallele Downloads für diesen Lauf (Standard: MaxParallelDownloads).",
+    )
+    run_parser.add_argument(
+        "--retries",
+        type=int,
+        default=None,
+        help="Wiederholungen pro fehlgeschlagenem Job (Standard: DownloadMaxRetries).",
+    )
+    run_parser.add_argument(
+        "--reencode-workers",
+        type=int,
+        default=None,
+        help=(
+            "Max. gleichzeitige ffmpeg-Reencodes (Standard: ReencodeWorkers, "
+            "0 = Anzahl CPU-Kerne)."
+        ),
+    )
+    run_parser.add_argument(
+        "--tag-workers",
+        type=int,
+        default=None,
+        help="Parallele Tagging-Worker der Download-Pipeline (Standard: TagWorkers).",
+    )
+    run_parser.add_argument(
+        "--engine",
+        choices=["subprocess", "inprocess"],
+        default=None,
+        help=(
+            "Download-Engine: 'subprocess' (ein yt-dlp-Prozess pro Track) oder "
+            "'inprocess' (yt-dlp als Bibliothek in langlebigen Worker-Prozessen). "
+            "Standard: DownloadEngine aus config.json."
+        ),
+    )
     run_parser.set_defaults(func=handle_run_downloads)
 
     # ------------------------------------------------------------------
@@ -232,6 +471,27 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Registry-Update für diesen Lauf deaktivieren.",
     )
+    tag_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Anzahl gleichzeitig getaggter Dateien (Standard: TagWorkers).",
+    )
+    tag_parser.add_argument(
+        "--retries",
+        type=int,
+        default=None,
+        help="Wiederholungen pro fehlgeschlagener Datei (Standard: DownloadMaxRetries).",
+    )
+    tag_parser.add_argument(
+        "--reencode-workers",
+        type=int,
+        default=None,
+        help=(
+            "Max. gleichzeitige ffmpeg-Reencodes inkompatibler Dateien "
+            "(Standard: ReencodeWorkers, 0 = Anzahl CPU-Kerne)."
+        ),
+    )
 
     tag_parser.set_defaults(func=handle_tag_playlist)
 
@@ -305,9 +565,18 @@ def handle_export_playlist(args: argparse.Namespace) -> None:
     """
     Handler für `export`.
     """
+    from playlist_exporter import export_playlist_to_json
+
     playlist_id: str = args.playlist_id
     output_arg: str | None = args.output
     limit: int | None = getattr(args, "limit", None)
+    incremental: bool = getattr(args, "incremental", False)
+    engine: str | None = getattr(args, "engine", None)
+    compact: bool | None = getattr(args, "compact", None)
+    gzip_output: bool | None = getattr(args, "gzip", None)
+    fmt: str | None = getattr(args, "format", None)
+    with_ytdlp: bool = getattr(args, "with_ytdlp", False)
+    archive: bool | None = getattr(args, "archive", None)
 
     output_path = Path(output_arg) if output_arg else None
 
@@ -316,6 +585,13 @@ def handle_export_playlist(args: argparse.Namespace) -> None:
             playlist_id=playlist_id,
             output_path=output_path,
             limit=limit,
+            incremental=incremental,
+            engine=engine,
+            compact=compact,
+            gzip_output=gzip_output,
+            fmt=fmt,
+            with_ytdlp=with_ytdlp,
+            archive=archive,
         )
     except Exception as exc:  # noqa: BLE001
         print(f"[CLI] Fehler beim JSON-Export: {exc}")
@@ -326,10 +602,66 @@ def handle_export_playlist(args: argparse.Namespace) -> None:
     print(f"[CLI] Ausgabe: {json_path.resolve()}")
 
 
+def handle_export_many(args: argparse.Namespace) -> None:
+    """
+    Handler für `export-many`.
+    """
+    from playlist_exporter import export_many_playlists, read_playlist_ids_file
+
+    if args.file:
+        try:
+            playlist_ids = read_playlist_ids_file(Path(args.file))
+        except OSError as exc:
+            print(f"[CLI] Datei mit Playlist-IDs nicht lesbar: {exc}")
+            return
+    else:
+        playlist_ids = list(args.playlist_ids or [])
+
+    if not playlist_ids:
+        print("[CLI] Keine Playlist-IDs angegeben.")
+        return
+
+    started = time.perf_counter()
+    try:
+        results = export_many_playlists(
+            playlist_ids,
+            workers=args.workers,
+            incremental=args.incremental,
+            engine=args.engine,
+            archive=args.archive,
+        )
+    except Exception as exc:  # noqa: BLE001
+        print(f"[CLI] Fehler beim Export: {exc}")
+        return
+
+    print("")
+    print("=== Export-Übersicht ===")
+    for r in results:
+        if r.error:
+            status = f"FEHLER: {r.error}"
+        elif r.unchanged:
+            status = "unverändert"
+        else:
+            status = f"{r.track_count or 0} Tracks – {r.name or ''}"
+        print(f"{r.playlist_id:<24} {r.seconds:7.2f}s  {status}")
+
+    failed = sum(1 for r in results if r.error)
+    total_seconds = sum(r.seconds for r in results)
+    print("------------------------")
+    print(
+        f"Playlists: {len(results)} | Fehler: {failed} | "
+        f"Gesamtdauer: {time.perf_counter() - started:.2f}s | "
+        f"Summe Einzelzeiten: {total_seconds:.2f}s"
+    )
+    print("========================")
+
+
 def handle_export_ytdlp(args: argparse.Namespace) -> None:
     """
     Handler für `export-ytdlp`.
     """
+    from playlist_exporter import export_playlist_to_ytdlp_txt
+
     playlist_id: str = args.playlist_id
     output_arg: str | None = args.output
     limit: int | None = getattr(args, "limit", None)
@@ -351,15 +683,93 @@ def handle_export_ytdlp(args: argparse.Namespace) -> None:
     print(f"[CLI] Ausgabe: {path.resolve()}")
 
 
+def handle_convert_playlist(args: argparse.Namespace) -> None:
+    """
+    Handler für `convert-playlist`.
+    """
+    from playlist_store import convert_playlist_file, find_playlist_file, playlist_json_path
+
+    suffix = f".{args.format}.gz" if args.gzip else f".{args.format}"
+
+    if args.input:
+        source = Path(args.input)
+        base_name = source.name
+        for ext in (".gz", ".jsonl", ".json"):
+            base_name = base_name.removesuffix(ext)
+        default_target = source.with_name(base_name + suffix)
+    else:
+        found = find_playlist_file(args.playlist_id)
+        if found is None:
+            print(f"[CLI] Keine Extended-Datei für Playlist {args.playlist_id} gefunden.")
+            return
+        source = found
+        default_target = playlist_json_path(args.playlist_id, args.gzip, args.format)
+
+    target = Path(args.output) if args.output else default_target
+
+    try:
+        convert_playlist_file(source, target, compact=args.compact)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[CLI] Fehler bei der Konvertierung: {exc}")
+        return
+
+    print(f"[CLI] Konvertiert: {source} -> {target}")
+    print(
+        f"[CLI] Größe: {source.stat().st_size / 1024:.1f} KiB -> "
+        f"{target.stat().st_size / 1024:.1f} KiB"
+    )
+
+
+def handle_rebuild_extended(args: argparse.Namespace) -> None:
+    """
+    Handler für `rebuild-extended`.
+    """
+    from playlist_exporter import rebuild_extended_from_archive
+    from response_archive import list_archived_playlists
+
+    playlist_ids = list_archived_playlists() if args.all else list(args.playlist_ids or [])
+    if not playlist_ids:
+        print("[CLI] Keine archivierten Playlists gefunden.")
+        return
+
+    started = time.perf_counter()
+    failed = 0
+    for playlist_id in playlist_ids:
+        try:
+            path = rebuild_extended_from_archive(
+                playlist_id,
+                compact=args.compact,
+                gzip_output=args.gzip,
+                fmt=args.format,
+            )
+        except Exception as exc:  # noqa: BLE001
+            failed += 1
+            print(f"[CLI] {playlist_id}: FEHLER: {exc}")
+            continue
+        print(f"[CLI] {playlist_id}: {path}")
+
+    print(
+        f"[CLI] Neu gebaut: {len(playlist_ids) - failed} | Fehler: {failed} | "
+        f"Dauer: {time.perf_counter() - started:.2f}s"
+    )
+
+
 def handle_plan_downloads(args: argparse.Namespace) -> None:
     """
     Handler für `plan-downloads`.
     """
+    from yt_dlp_runner import (
+        plan_downloads_for_playlist,
+        print_download_plan,
+        resolve_download_targets,
+    )
+
     playlist_id: str = args.playlist_id
     limit: int | None = args.limit
 
     try:
         jobs = plan_downloads_for_playlist(playlist_id, limit=limit)
+        resolve_download_targets(jobs, search_missing=args.resolve)
     except FileNotFoundError as exc:
         print(f"[CLI] Fehler: {exc}")
         return
@@ -374,9 +784,24 @@ def handle_run_downloads(args: argparse.Namespace) -> None:
     """
     Handler für `run-downloads`.
     """
+    from config import override_settings
+    from yt_dlp_runner import run_downloads_for_playlist
+
     playlist_id: str = args.playlist_id
     limit: int | None = args.limit
 
+    try:
+        override_settings(
+            max_parallel_downloads=args.jobs,
+            download_max_retries=args.retries,
+            reencode_workers=args.reencode_workers,
+            tag_workers=args.tag_workers,
+            download_engine=args.engine,
+        )
+    except (TypeError, ValueError) as exc:
+        print(f"[CLI] Ungültige Einstellung: {exc}")
+        return
+
     try:
         run_downloads_for_playlist(playlist_id, limit=limit)
     except FileNotFoundError as exc:
@@ -389,6 +814,8 @@ def handle_analyze_playlist(args: argparse.Namespace) -> None:
     """
     Handler für `analyze-playlist`.
     """
+    from collection_analyzer import analyze_playlist_folder
+
     playlist_id: str = args.playlist_id
     analyze_playlist_folder(playlist_id)
 
@@ -400,15 +827,31 @@ def handle_tag_playlist(args: argparse.Namespace) -> None:
     Nutzt die Extended-JSON und die bereits vorhandenen Audiodateien,
     um Tagging und optional die Registry zu aktualisieren.
     """
+    from config import override_settings
     from yt_dlp_runner import retag_downloads_for_playlist
 
     update_registry = not getattr(args, "no_registry", False)
 
-    retag_downloads_for_playlist(
-        playlist_id=args.playlist_id,
-        limit=args.limit,
-        update_registry=update_registry,
-    )
+    try:
+        override_settings(
+            tag_workers=args.jobs,
+            download_max_retries=args.retries,
+            reencode_workers=args.reencode_workers,
+        )
+    except (TypeError, ValueError) as exc:
+        print(f"[CLI] Ungültige Einstellung: {exc}")
+        return
+
+    try:
+        retag_downloads_for_playlist(
+            playlist_id=args.playlist_id,
+            limit=args.limit,
+            update_registry=update_registry,
+        )
+    except FileNotFoundError as exc:
+        print(f"[CLI] Fehler: {exc}")
+    except Exception as exc:  # noqa: BLE001
+        print(f"[CLI] Unerwarteter Fehler beim Tagging: {exc}")
 
 
 def handle_debug_registry(args: argparse.Namespace) -> None:
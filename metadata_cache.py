@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from config import DATA_DIR, get_settings
+from sqlite_cache import CacheDatabase, StatsCounter
+
+
+# ---------------------------------------------------------------------------
+# Persistenter Cache für Spotify-Metadaten (Alben, Artists, Audio-Features)
+# ---------------------------------------------------------------------------
+#
+# Liegt neben der Track-Registry in data/metadata_cache.db und wird von allen
+# Exporten (auch parallel laufenden Prozessen) gemeinsam genutzt; Verbindungen
+# und Schema über sqlite_cache.CacheDatabase.
+#
+# Neben positiven Einträgen gibt es negative Einträge (payload = NULL), z. B.
+# "Album liefert 404" oder "Audio-Features-Endpoint ist für diesen Token
+# gesperrt". Negative Einträge laufen nach MetadataCacheNegativeTtlHours ab.
+
+DB_PATH = DATA_DIR / "metadata_cache.db"
+
+KIND_ALBUM = "album"
+KIND_ARTIST = "artist"
+KIND_AUDIO_FEATURES = "audio_features"
+KIND_ENDPOINT = "endpoint"
+
+# Eviction nicht bei jedem Schreiben prüfen, sondern nur alle N Einträge
+_EVICTION_CHECK_INTERVAL = 500
+
+# SQLite begrenzt die Anzahl Parameter pro Statement
+_SQL_CHUNK_SIZE = 400
+
+
+@dataclass
+class CacheStats:
+    """Trefferzähler für einen Lauf."""
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+
+
+_stats = StatsCounter(CacheStats)
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Liefert eine Kopie der Cache-Zähler."""
+    return _stats.get()
+
+
+def reset_cache_stats() -> None:
+    """Setzt die Cache-Zähler zurück (z. B. zu Beginn eines Exports)."""
+    _stats.reset()
+
+
+def format_cache_stats() -> str:
+    """Kompakte, einzeilige Darstellung der Cache-Zähler für die CLI."""
+    stats = get_cache_stats()
+    return (
+        f"Treffer: {stats['hits']} | Negativ-Treffer: {stats['negative_hits']} | "
+        f"Fehlend: {stats['misses']} | Gespeichert: {stats['stored']}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# SQLite-Helfer
+# ---------------------------------------------------------------------------
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Legt Tabelle und Indizes an (idempotent)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS entities (
+            kind         TEXT NOT NULL,
+            key          TEXT NOT NULL,
+            payload      TEXT,
+            fetched_at   REAL NOT NULL,
+            expires_at   REAL NOT NULL,
+            last_access  REAL NOT NULL,
+            PRIMARY KEY (kind, key)
+        );
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entities_last_access "
+        "ON entities(last_access);"
+    )
+
+
+_db = CacheDatabase(DB_PATH, _init_schema)
+
+
+def _ttl_seconds_by_kind() -> Dict[str, float]:
+    """Lebensdauer positiver Einträge pro Entity-Typ (Sekunden)."""
+    settings = get_settings()
+    return {
+        KIND_ALBUM: settings.metadata_cache_album_ttl_days * 86400,
+        KIND_ARTIST: settings.metadata_cache_artist_ttl_days * 86400,
+        KIND_AUDIO_FEATURES: settings.metadata_cache_audio_features_ttl_days * 86400,
+    }
+
+
+def _chunks(values: list[str]) -> Iterable[list[str]]:
+    for i in range(0, len(values), _SQL_CHUNK_SIZE):
+        yield values[i : i + _SQL_CHUNK_SIZE]
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def get_many(kind: str, keys: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Liest gültige (nicht abgelaufene) Einträge für 'keys'.
+
+    Rückgabe:
+    - key -> Dict: positiver Eintrag
+    - key -> None: negativer Eintrag (z. B. 404)
+    - Keys ohne gültigen Eintrag fehlen im Ergebnis.
+    """
+    wanted = list(dict.fromkeys(k for k in keys if k))
+    found = _read_entries(kind, wanted)
+
+    negative = sum(1 for v in found.values() if v is None)
+    _stats.count(
+        hits=len(found) - negative,
+        negative_hits=negative,
+        misses=len(wanted) - len(found),
+    )
+    return found
+
+
+def _read_entries(kind: str, wanted: list[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Liest Einträge ohne Statistik (siehe get_many)."""
+    if not get_settings().metadata_cache_enabled or not wanted:
+        return {}
+
+    now = time.time()
+    found: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    try:
+        with _db.connect() as conn:
+            for chunk in _chunks(wanted):
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"""
+                    SELECT key, payload FROM entities
+                    WHERE kind = ? AND expires_at > ? AND key IN ({placeholders});
+                    """,
+                    (kind, now, *chunk),
+                ).fetchall()
+                for key, payload in rows:
+                    found[key] = json.loads(payload) if payload is not None else None
+
+                if rows:
+                    hit_keys = [row[0] for row in rows]
+                    hit_placeholders = ",".join("?" for _ in hit_keys)
+                    conn.execute(
+                        f"""
+                        UPDATE entities SET last_access = ?
+                        WHERE kind = ? AND key IN ({hit_placeholders});
+                        """,
+                        (now, kind, *hit_keys),
+                    )
+    except (sqlite3.Error, ValueError) as exc:
+        print(f"[CACHE-WARN] Metadaten-Cache nicht lesbar: {exc}")
+        return {}
+
+    return found
+
+
+def put_many(
+    kind: str,
+    items: Mapping[str, Optional[Mapping[str, Any]]],
+    ttl_seconds: float | None = None,
+) -> None:
+    """
+    Schreibt Einträge in den Cache (vorhandene werden ersetzt).
+
+    Ein Wert None wird als negativer Eintrag mit MetadataCacheNegativeTtlHours
+    gespeichert; sonst gilt 'ttl_seconds' bzw. die TTL des Entity-Typs.
+    """
+    settings = get_settings()
+    if not settings.metadata_cache_enabled or not items:
+        return
+
+    now = time.time()
+    negative_ttl = settings.metadata_cache_negative_ttl_hours * 3600
+    positive_ttl = ttl_seconds
+    if positive_ttl is None:
+        positive_ttl = _ttl_seconds_by_kind().get(kind, negative_ttl)
+
+    rows = []
+    for key, value in items.items():
+        if not key:
+            continue
+        if value is None:
+            rows.append((kind, key, None, now, now + negative_ttl, now))
+        else:
+            payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+            rows.append((kind, key, payload, now, now + positive_ttl, now))
+
+    try:
+        with _db.connect() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO entities
+                    (kind, key, payload, fetched_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?);
+                """,
+                rows,
+            )
+    except sqlite3.Error as exc:
+        print(f"[CACHE-WARN] Metadaten-Cache nicht beschreibbar: {exc}")
+        return
+
+    _stats.count(stored=len(rows))
+
+    if _db.note_writes(len(rows), _EVICTION_CHECK_INTERVAL):
+        evict()
+
+
+def evict(max_entries: int | None = None) -> int:
+    """
+    Entfernt abgelaufene Einträge und begrenzt den Cache auf 'max_entries'
+    (Default: MetadataCacheMaxEntries), wobei die am längsten nicht mehr
+    genutzten Einträge zuerst fliegen. Gibt die Anzahl gelöschter Zeilen zurück.
+    """
+    if max_entries is None:
+        limit = get_settings().metadata_cache_max_entries
+    else:
+        limit = max_entries
+    removed = 0
+
+    try:
+        with _db.connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM entities WHERE expires_at <= ?;", (time.time(),)
+            )
+            removed += cur.rowcount or 0
+
+            (count,) = conn.execute("SELECT COUNT(*) FROM entities;").fetchone()
+            overflow = int(count) - limit
+            if overflow > 0:
+                cur = conn.execute(
+                    """
+                    DELETE FROM entities WHERE rowid IN (
+                        SELECT rowid FROM entities
+                        ORDER BY last_access ASC
+                        LIMIT ?
+                    );
+                    """,
+                    (overflow,),
+                )
+                removed += cur.rowcount or 0
+    except sqlite3.Error as exc:
+        print(f"[CACHE-WARN] Eviction fehlgeschlagen: {exc}")
+        return 0
+
+    _stats.count(evicted=removed)
+    return removed
+
+
+def mark_endpoint_forbidden(endpoint: str) -> None:
+    """Merkt sich (negativ, mit Negativ-TTL), dass ein Endpoint 403 liefert."""
+    put_many(KIND_ENDPOINT, {endpoint: None})
+
+
+def is_endpoint_forbidden(endpoint: str) -> bool:
+    """True, wenn für den Endpoint ein gültiger 403-Eintrag existiert."""
+    cached = _read_entries(KIND_ENDPOINT, [endpoint])
+    return endpoint in cached and cached[endpoint] is None
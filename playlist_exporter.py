@@ -1,87 +1,449 @@
 from __future__ import annotations
 
-import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
 
 import requests
 
-from spotify_client import get_access_token
-from config import OUTPUT_DIRECTORY, YTDLP_TEXTFILE_PATTERN
+import etag_cache
+import export_checkpoint
+import metadata_cache
+import response_archive
+from export_checkpoint import ExportCheckpoint
+from metadata_cache import KIND_ALBUM, KIND_ARTIST, KIND_AUDIO_FEATURES
+from spotify_client import (
+    format_http_stats,
+    get_access_token,
+    reset_http_stats,
+    spotify_get,
+)
+from playlist_store import (
+    find_playlist_file,
+    iter_playlist_tracks,
+    playlist_json_path,
+    read_playlist_file,
+    read_playlist_meta,
+    write_playlist_file,
+)
+from config import SPOTIFY_API_BASE_URL, get_settings
 from util_filenames import build_audio_filename
 
-SPOTIFY_PLAYLIST_URL = "https://api.spotify.com/v1/playlists/{playlist_id}"
-SPOTIFY_AUDIO_FEATURES_URL = "https://api.spotify.com/v1/audio-features"
-SPOTIFY_ALBUM_URL = "https://api.spotify.com/v1/albums/{album_id}"
-SPOTIFY_ARTIST_URL = "https://api.spotify.com/v1/artists/{artist_id}"
+# Basis-URL aus SpotifyApiBaseUrl (z. B. für einen lokalen Test-Server)
+SPOTIFY_PLAYLIST_URL = f"{SPOTIFY_API_BASE_URL}/playlists/{{playlist_id}}"
+SPOTIFY_PLAYLIST_TRACKS_URL = f"{SPOTIFY_API_BASE_URL}/playlists/{{playlist_id}}/tracks"
+SPOTIFY_AUDIO_FEATURES_URL = f"{SPOTIFY_API_BASE_URL}/audio-features"
+SPOTIFY_ALBUMS_URL = f"{SPOTIFY_API_BASE_URL}/albums"
+SPOTIFY_ARTISTS_URL = f"{SPOTIFY_API_BASE_URL}/artists"
+
+# Maximale Anzahl IDs pro Request an den Multi-ID-Endpoints
+ALBUMS_BATCH_SIZE = 20
+ARTISTS_BATCH_SIZE = 50
+
+# Seitengröße beim Paging über /playlists/{id}/tracks (API-Maximum)
+PLAYLIST_PAGE_SIZE = 100
+
+# ---------------------------------------------------------------------------
+# Feld-Projektion: zentrale Definition der genutzten Spotify-Felder
+# ---------------------------------------------------------------------------
+
+# Felder eines Track-Objekts, die _build_extended_tracks und die
+# Genre-Auflösung lesen. Daraus wird der 'fields'-Filter der Playlist-Requests
+# abgeleitet, und _build_extended_tracks sieht Tracks nur in genau dieser
+# Projektion – ein neues Feld muss also hier ergänzt werden, sonst fehlt es
+# sofort (nicht erst bei großen Playlists).
+# Wert None = Feld komplett übernehmen, Dict = nur diese Unterfelder.
+EXTENDED_TRACK_FIELDS: Dict[str, Any] = {
+    "id": None,
+    "name": None,
+    "track_number": None,
+    "disc_number": None,
+    "explicit": None,
+    "duration_ms": None,
+    "external_ids": {"isrc": None},
+    "external_urls": {"spotify": None},
+    "artists": {"id": None, "name": None},
+    "album": {
+        "id": None,
+        "name": None,
+        "release_date": None,
+        "total_tracks": None,
+        "images": {"url": None},
+        "artists": {"name": None},
+    },
+}
+
+# Felder, die export-ytdlp ohne Extended-JSON braucht ("Artist - Title")
+YTDLP_TRACK_FIELDS: Dict[str, Any] = {
+    "name": None,
+    "artists": {"name": None},
+}
+
+# Playlist-Metadaten für den 'playlist'-Block der Extended-JSON
+PLAYLIST_META_FIELDS: Dict[str, Any] = {
+    "name": None,
+    "description": None,
+    "owner": {"display_name": None},
+    "external_urls": {"spotify": None},
+    "snapshot_id": None,
+}
+
+
+def _fields_filter(spec: Mapping[str, Any]) -> str:
+    """
+    Wandelt eine Feld-Spezifikation in die 'fields'-Syntax der Web API um,
+    z. B. {"id": None, "album": {"name": None}} -> "id,album(name)".
+    """
+    parts: List[str] = []
+    for key, sub in spec.items():
+        if sub is None:
+            parts.append(key)
+        else:
+            parts.append(f"{key}({_fields_filter(sub)})")
+    return ",".join(parts)
+
+
+def _project(obj: Mapping[str, Any], spec: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Reduziert ein Spotify-Objekt auf die Felder aus 'spec' (wie der
+    'fields'-Filter der API, nur lokal). Listen werden elementweise projiziert.
+    """
+    result: Dict[str, Any] = {}
+    for key, sub in spec.items():
+        if key not in obj:
+            continue
+        value = obj[key]
+        if sub is None or value is None:
+            result[key] = value
+        elif isinstance(value, list):
+            result[key] = [
+                _project(v, sub) if isinstance(v, Mapping) else v for v in value
+            ]
+        elif isinstance(value, Mapping):
+            result[key] = _project(value, sub)
+        else:
+            result[key] = value
+    return result
+
+
+# Felder aus /albums bzw. /artists, die _resolve_genre_info liest
+# (nur diese Projektion wird im Metadaten-Cache gespeichert)
+ALBUM_LOOKUP_FIELDS: Dict[str, Any] = {
+    "id": None,
+    "name": None,
+    "genres": None,
+    "total_tracks": None,
+    "release_date": None,
+}
+ARTIST_LOOKUP_FIELDS: Dict[str, Any] = {
+    "id": None,
+    "name": None,
+    "genres": None,
+}
+
+# Schlüssel für den negativen Cache-Eintrag "Endpoint liefert 403"
+AUDIO_FEATURES_ENDPOINT = "audio-features"
+
+
+def _track_page_fields(track_fields: Mapping[str, Any] = EXTENDED_TRACK_FIELDS) -> str:
+    """'fields'-Filter für eine Track-Seite mit den Track-Feldern 'track_fields'."""
+    return f"total,offset,limit,next,items(track({_fields_filter(track_fields)}))"
+
+
+def _playlist_fields(track_fields: Mapping[str, Any] = EXTENDED_TRACK_FIELDS) -> str:
+    """'fields'-Filter für das Playlist-Objekt inkl. erster Track-Seite."""
+    return (
+        f"{_fields_filter(PLAYLIST_META_FIELDS)},"
+        f"tracks({_track_page_fields(track_fields)})"
+    )
+
 
 # ---------------------------------------------------------------------------
 # Low-Level: Playlist & Audio-Features holen
 # ---------------------------------------------------------------------------
 
-def _fetch_playlist_full(access_token: str, playlist_id: str) -> Dict[str, Any]:
+def _extract_page_tracks(track_page: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Liefert die Track-Objekte einer Playlist-Seite (leere Einträge entfallen)."""
+    tracks: List[Dict[str, Any]] = []
+    for item in track_page.get("items") or []:
+        track = (item or {}).get("track") or {}
+        if track:
+            tracks.append(track)
+    return tracks
+
+
+def _fetch_playlist_page(
+    access_token: str,
+    playlist_id: str,
+    offset: int,
+    project_fields: bool = True,
+    page_size: int = PLAYLIST_PAGE_SIZE,
+    track_fields: Mapping[str, Any] = EXTENDED_TRACK_FIELDS,
+) -> Dict[str, Any]:
+    """Holt eine einzelne Track-Seite der Playlist ab 'offset'."""
+    params: Dict[str, Any] = {"offset": offset, "limit": page_size}
+    if project_fields:
+        params["fields"] = _track_page_fields(track_fields)
+
+    resp = spotify_get(
+        SPOTIFY_PLAYLIST_TRACKS_URL.format(playlist_id=playlist_id),
+        params=params,
+        access_token=access_token,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _fetch_page_tracks(
+    access_token: str,
+    playlist_id: str,
+    offset: int,
+    project_fields: bool = True,
+    page_size: int = PLAYLIST_PAGE_SIZE,
+    track_fields: Mapping[str, Any] = EXTENDED_TRACK_FIELDS,
+    checkpoint: Optional[ExportCheckpoint] = None,
+) -> List[Dict[str, Any]]:
     """
-    Holt die komplette Playlist-Struktur inkl. Metadaten und Tracks.
-    Wir paginieren über 'tracks.next'.
+    Tracks der Seite ab 'offset' – aus dem Checkpoint, sonst per Request
+    (und dann im Checkpoint gesichert).
     """
-    headers = {"Authorization": f"Bearer {access_token}"}
-    url = SPOTIFY_PLAYLIST_URL.format(playlist_id=playlist_id)
+    if checkpoint is not None:
+        cached = checkpoint.load_page(offset)
+        if cached is not None:
+            return cached
+
+    tracks = _extract_page_tracks(
+        _fetch_playlist_page(
+            access_token, playlist_id, offset, project_fields, page_size, track_fields
+        )
+    )
+    if checkpoint is not None:
+        checkpoint.save_page(offset, tracks)
+    return tracks
+
 
-    resp = requests.get(url, headers=headers, timeout=10)
+def _fetch_playlist_head(
+    access_token: str,
+    playlist_id: str,
+    project_fields: bool = True,
+    track_fields: Mapping[str, Any] = EXTENDED_TRACK_FIELDS,
+) -> Dict[str, Any]:
+    """
+    Holt das Playlist-Objekt inkl. der ersten Track-Seite ('tracks').
+    Mit project_fields=True nur die Playlist-Metadaten und 'track_fields'.
+    """
+    resp = spotify_get(
+        SPOTIFY_PLAYLIST_URL.format(playlist_id=playlist_id),
+        params={"fields": _playlist_fields(track_fields)} if project_fields else None,
+        access_token=access_token,
+    )
     resp.raise_for_status()
-    playlist = resp.json()
+    return resp.json()
+
+
+def _remaining_page_offsets(
+    track_page: Mapping[str, Any],
+    limit: int | None = None,
+) -> Optional[List[int]]:
+    """
+    Berechnet aus der ersten Track-Seite die Offsets aller weiteren Seiten
+    (mit 'limit' nur bis zu dieser Position).
+
+    Gibt None zurück, wenn 'tracks.total' fehlt – dann bleibt nur das
+    klassische Paging über 'tracks.next'.
+    """
+    total = track_page.get("total")
+    if not isinstance(total, int):
+        return None
+    if not track_page.get("next"):
+        return []
+
+    end = total if limit is None else min(total, limit)
+    first_offset = int(track_page.get("offset") or 0)
+    first_items = len(track_page.get("items") or [])
+    return list(range(first_offset + first_items, end, PLAYLIST_PAGE_SIZE))
+
+
+def _page_size_at(offset: int, limit: int | None) -> int:
+    """Seitengröße für 'offset', damit die letzte Seite nicht über 'limit' hinausgeht."""
+    if limit is None:
+        return PLAYLIST_PAGE_SIZE
+    return max(1, min(PLAYLIST_PAGE_SIZE, limit - offset))
+
+
+def _fetch_playlist_full(
+    access_token: str,
+    playlist_id: str,
+    paging_mode: str | None = None,
+    project_fields: bool = True,
+    limit: int | None = None,
+    track_fields: Mapping[str, Any] = EXTENDED_TRACK_FIELDS,
+    head: Optional[Dict[str, Any]] = None,
+    checkpoint: Optional[ExportCheckpoint] = None,
+) -> Dict[str, Any]:
+    """
+    Holt die komplette Playlist-Struktur inkl. Metadaten und Tracks.
+
+    Mit 'limit' werden nur die ersten 'limit' Tracks geladen: es werden keine
+    Seiten hinter dieser Position angefragt (eine Vorschau mit --limit 20
+    kostet also genau einen Request).
+
+    Mit project_fields=True (Default) werden per 'fields'-Filter nur die
+    Felder aus EXTENDED_TRACK_FIELDS / PLAYLIST_META_FIELDS geladen
+    (u. a. ohne die großen 'available_markets'-Arrays). Für Analysen der
+    kompletten Objekte (spotify_field_inspector) project_fields=False setzen.
+    'track_fields' erlaubt eine noch kleinere Projektion (z. B.
+    YTDLP_TRACK_FIELDS für export-ytdlp).
+
+    Paging-Modi (Default aus SpotifyPagingMode):
+    - "parallel": Die erste Antwort liefert 'tracks.total'; alle weiteren
+      Offsets werden vorab berechnet und mit max. SpotifyPagingWorkers
+      Threads parallel geholt. Die Seiten werden in Offset-Reihenfolge
+      zusammengesetzt.
+    - "serial": Wir paginieren klassisch über 'tracks.next'.
+
+    'head': bereits geladenes Playlist-Objekt (_fetch_playlist_head), z. B.
+    weil damit vorher der Checkpoint geöffnet wurde. 'checkpoint': Seiten
+    im parallelen Modus aus dem Checkpoint nehmen bzw. dort sichern.
+    """
+    settings = get_settings()
+    mode = (paging_mode or settings.spotify_paging_mode).lower()
+
+    playlist = head if head is not None else _fetch_playlist_head(
+        access_token, playlist_id, project_fields, track_fields
+    )
 
-    tracks: List[Dict[str, Any]] = []
     track_page = playlist.get("tracks") or {}
-    while True:
-        items = track_page.get("items") or []
-        for item in items:
-            track = item.get("track") or {}
-            if track:
-                tracks.append(track)
+    tracks: List[Dict[str, Any]] = _extract_page_tracks(track_page)
+
+    offsets = _remaining_page_offsets(track_page, limit)
+
+    if mode == "parallel" and offsets:
+        worker_count = max(1, min(settings.spotify_paging_workers, len(offsets)))
+
+        with ThreadPoolExecutor(max_workers=worker_count) as pool:
+            # map() liefert die Ergebnisse in Reihenfolge der Offsets
+            pages = pool.map(
+                lambda offset: _fetch_page_tracks(
+                    access_token,
+                    playlist_id,
+                    offset,
+                    project_fields,
+                    _page_size_at(offset, limit),
+                    track_fields,
+                    checkpoint,
+                ),
+                offsets,
+            )
+            for page_tracks in pages:
+                tracks.extend(page_tracks)
+    elif offsets is None or mode != "parallel":
+        # Ohne 'tracks.total' bzw. im Modus "serial": Paging über 'next'
+        tracks.extend(
+            _follow_next_pages(
+                access_token,
+                track_page,
+                project_fields,
+                None if limit is None else limit - len(tracks),
+                track_fields,
+            )
+        )
+
+    playlist["__all_tracks__"] = tracks if limit is None else tracks[:limit]
+    return playlist
+
 
+def _follow_next_pages(
+    access_token: str,
+    track_page: Mapping[str, Any],
+    project_fields: bool = True,
+    limit: int | None = None,
+    track_fields: Mapping[str, Any] = EXTENDED_TRACK_FIELDS,
+) -> List[Dict[str, Any]]:
+    """
+    Serielles Paging über 'next' ab einer bereits geladenen Track-Seite.
+    Mit 'limit' wird abgebrochen, sobald genug Tracks geladen sind.
+    """
+    tracks: List[Dict[str, Any]] = []
+    while limit is None or len(tracks) < limit:
         next_url = track_page.get("next")
         if not next_url:
             break
 
-        resp = requests.get(next_url, headers=headers, timeout=10)
+        # 'next' enthält offset/limit, aber nicht den fields-Filter
+        resp = spotify_get(
+            next_url,
+            params={"fields": _track_page_fields(track_fields)} if project_fields else None,
+            access_token=access_token,
+        )
         resp.raise_for_status()
         track_page = resp.json()
-
-    playlist["__all_tracks__"] = tracks
-    return playlist
+        tracks.extend(_extract_page_tracks(track_page))
+    return tracks
 
 
 def _fetch_audio_features(
     access_token: str,
     track_ids: List[str],
+    checkpoint: Optional[ExportCheckpoint] = None,
 ) -> Dict[str, Dict[str, Any]]:
     """
     Holt Audio Features (u. a. BPM, Key, Mode) für eine Liste von Track-IDs.
 
-    Wenn Spotify 403 liefert (z. B. Endpoint nicht für diesen Token verfügbar),
-    geben wir ein leeres Dict zurück und lassen den Rest weiterlaufen.
+    Wenn Spotify 403 liefert (z. B. Endpoint nicht für diesen Token verfügbar)
+    oder ein Batch fehlschlägt, brechen wir ab und geben zurück, was bis dahin
+    vorliegt – Checkpoint-/Cache-Treffer und bereits geladene Batches bleiben
+    also erhalten. Der Rest des Exports läuft weiter.
+
+    Ergebnisse (auch "keine Features für diesen Track") und ein 403 werden
+    im persistenten Metadaten-Cache gespeichert, mit 'checkpoint' zusätzlich
+    im Checkpoint des laufenden Exports.
     """
-    headers = {"Authorization": f"Bearer {access_token}"}
     features_by_id: Dict[str, Dict[str, Any]] = {}
 
     if not track_ids:
         return features_by_id
 
+    cached: Dict[str, Optional[Dict[str, Any]]] = {}
+    if checkpoint is not None:
+        cached.update(checkpoint.load_entities(KIND_AUDIO_FEATURES, track_ids))
+    cached.update(
+        metadata_cache.get_many(
+            KIND_AUDIO_FEATURES, [tid for tid in track_ids if tid not in cached]
+        )
+    )
+    for tid, feat in cached.items():
+        if feat:
+            features_by_id[tid] = feat
+
+    missing = [tid for tid in dict.fromkeys(track_ids) if tid and tid not in cached]
+    if not missing:
+        return features_by_id
+
+    if metadata_cache.is_endpoint_forbidden(AUDIO_FEATURES_ENDPOINT):
+        print(
+            "[INFO] Audio-Features-API zuletzt mit 403 beantwortet (Cache) – "
+            "BPM/Key werden für neue Tracks nicht gesetzt."
+        )
+        return features_by_id
+
     chunk_size = 100
-    for i in range(0, len(track_ids), chunk_size):
-        chunk = track_ids[i : i + chunk_size]
+    for i in range(0, len(missing), chunk_size):
+        chunk = missing[i : i + chunk_size]
         if not chunk:
             continue
 
         params = {"ids": ",".join(chunk)}
         try:
-            resp = requests.get(
+            resp = spotify_get(
                 SPOTIFY_AUDIO_FEATURES_URL,
-                headers=headers,
                 params=params,
-                timeout=10,
+                access_token=access_token,
             )
             if resp.status_code == 403:
                 # Kein Zugriff auf Audio-Features -> wir arbeiten ohne BPM/Key
@@ -89,19 +451,25 @@ def _fetch_audio_features(
                     "[WARN] Audio-Features-API liefert 403 Forbidden – "
                     "BPM/Key werden für diese Playlist nicht gesetzt."
                 )
-                return {}
+                metadata_cache.mark_endpoint_forbidden(AUDIO_FEATURES_ENDPOINT)
+                return features_by_id
             resp.raise_for_status()
-        except requests.HTTPError as exc:
+        except requests.RequestException as exc:
             print(f"[WARN] Fehler beim Laden von Audio-Features: {exc}")
-            return {}
+            return features_by_id
 
         data = resp.json()
+        batch: Dict[str, Optional[Dict[str, Any]]] = {tid: None for tid in chunk}
         for feat in data.get("audio_features", []):
             if not feat:
                 continue
             tid = feat.get("id")
             if tid:
                 features_by_id[tid] = feat
+                batch[tid] = feat
+        metadata_cache.put_many(KIND_AUDIO_FEATURES, batch)
+        if checkpoint is not None:
+            checkpoint.save_entities(KIND_AUDIO_FEATURES, batch)
 
     return features_by_id
 
@@ -114,6 +482,373 @@ def _normalize_genre(value: str) -> str:
     return value[0].lower() + value[1:]
 
 
+# ---------------------------------------------------------------------------
+# Prozessweiter Lookup-Cache (export-many)
+# ---------------------------------------------------------------------------
+
+class SharedLookupCache:
+    """
+    In-Memory-Cache für Album-/Artist-Lookups, den sich alle Exporte eines
+    Prozesses teilen (siehe export_many_playlists).
+
+    IDs, die gerade von einem anderen Thread geladen werden ("in flight"),
+    werden nicht doppelt angefragt – der zweite Thread wartet auf das Ergebnis.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], dict[str, Any]] = {}
+        self._in_flight: dict[tuple[str, str], threading.Event] = {}
+        self.hits = 0
+        self.fetched = 0
+
+    def claim(
+        self,
+        kind: str,
+        ids: list[str],
+    ) -> tuple[dict[str, dict[str, Any]], list[str], list[str]]:
+        """
+        Teilt 'ids' auf in (bekannt, selbst zu laden, von anderen in Arbeit).
+        Die selbst zu ladenden IDs müssen per publish() freigegeben werden.
+        """
+        known: dict[str, dict[str, Any]] = {}
+        to_fetch: list[str] = []
+        pending: list[str] = []
+
+        with self._lock:
+            for entity_id in ids:
+                key = (kind, entity_id)
+                if key in self._entries:
+                    known[entity_id] = self._entries[key]
+                elif key in self._in_flight:
+                    pending.append(entity_id)
+                else:
+                    self._in_flight[key] = threading.Event()
+                    to_fetch.append(entity_id)
+            self.hits += len(known) + len(pending)
+            self.fetched += len(to_fetch)
+
+        return known, to_fetch, pending
+
+    def publish(
+        self,
+        kind: str,
+        ids: list[str],
+        entries: Mapping[str, dict[str, Any]],
+    ) -> None:
+        """
+        Legt Ergebnisse ab und weckt wartende Threads (auch bei Fehlern
+        aufrufen). IDs ohne Eintrag in 'entries' werden nur freigegeben und
+        beim nächsten claim() wieder zum Laden vergeben.
+        """
+        with self._lock:
+            for entity_id in ids:
+                key = (kind, entity_id)
+                if entity_id in entries:
+                    self._entries[key] = entries[entity_id]
+                event = self._in_flight.pop(key, None)
+                if event is not None:
+                    event.set()
+
+    def wait_for(self, kind: str, ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Wartet auf IDs, die ein anderer Thread lädt, und liefert sie zurück."""
+        result: dict[str, dict[str, Any]] = {}
+        for entity_id in ids:
+            key = (kind, entity_id)
+            with self._lock:
+                event = self._in_flight.get(key)
+            if event is not None:
+                event.wait()
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                result[entity_id] = entry
+        return result
+
+
+# Aktiv nur während export_many_playlists(); sonst None
+_shared_lookups: Optional[SharedLookupCache] = None
+
+
+def _fetch_entities_batched(
+    token: str,
+    url: str,
+    ids: list[str],
+    batch_size: int,
+    response_key: str,
+    cache_kind: str,
+    lookup_fields: Mapping[str, Any],
+    checkpoint: Optional[ExportCheckpoint] = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Holt Spotify-Objekte über einen Multi-ID-Endpoint (z. B. /albums?ids=...).
+
+    - IDs werden dedupliziert; bereits im Metadaten-Cache ('cache_kind')
+      vorhandene IDs werden nicht erneut abgefragt.
+    - Die übrigen IDs werden in Blöcken zu 'batch_size' geholt, auf
+      'lookup_fields' reduziert und im Cache abgelegt. IDs, die Spotify mit
+      null beantwortet (z. B. gelöschtes Album), werden negativ gecacht.
+    - IDs ohne Ergebnis werden mit einem leeren Dict belegt, damit Aufrufer
+      nicht erneut nachfragen.
+    - Während export_many_playlists() läuft zusätzlich der prozessweite
+      SharedLookupCache davor (keine doppelten Requests über Playlists hinweg).
+    - Mit 'checkpoint' werden bereits gesicherte Batches übernommen und neue
+      Batches dort gesichert.
+    """
+    unique_ids = list(dict.fromkeys(i for i in ids if i))
+
+    shared = _shared_lookups
+    if shared is None:
+        return _fetch_entities_uncached(
+            token,
+            url,
+            unique_ids,
+            batch_size,
+            response_key,
+            cache_kind,
+            lookup_fields,
+            checkpoint,
+        )
+
+    result, to_fetch, pending = shared.claim(cache_kind, unique_ids)
+    fetched: dict[str, dict[str, Any]] = {}
+    failed: set[str] = set()
+    try:
+        fetched = _fetch_entities_uncached(
+            token,
+            url,
+            to_fetch,
+            batch_size,
+            response_key,
+            cache_kind,
+            lookup_fields,
+            checkpoint,
+            failed,
+        )
+    finally:
+        # IDs fehlgeschlagener Batches nicht teilen: publish() gibt sie nur
+        # frei, die nächste Playlist fragt sie erneut an
+        shared.publish(
+            cache_kind,
+            to_fetch,
+            {k: v for k, v in fetched.items() if k not in failed},
+        )
+    result.update(fetched)
+
+    waited = shared.wait_for(cache_kind, pending)
+    for entity_id in pending:
+        result[entity_id] = waited.get(entity_id, {})
+
+    return result
+
+
+def _fetch_entities_uncached(
+    token: str,
+    url: str,
+    unique_ids: list[str],
+    batch_size: int,
+    response_key: str,
+    cache_kind: str,
+    lookup_fields: Mapping[str, Any],
+    checkpoint: Optional[ExportCheckpoint] = None,
+    failed: Optional[set[str]] = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Checkpoint + Metadaten-Cache + Multi-ID-Requests für deduplizierte IDs.
+
+    IDs aus Batches, die auch nach Retries fehlschlagen, erhalten ein leeres
+    Dict und werden – falls übergeben – in 'failed' gesammelt.
+    """
+    result: dict[str, dict[str, Any]] = {}
+    if not unique_ids:
+        return result
+
+    if checkpoint is not None:
+        for entity_id, saved in checkpoint.load_entities(cache_kind, unique_ids).items():
+            result[entity_id] = saved or {}
+    uncached = [i for i in unique_ids if i not in result]
+    for entity_id, cached in metadata_cache.get_many(cache_kind, uncached).items():
+        result[entity_id] = cached or {}
+    missing = [i for i in unique_ids if i not in result]
+
+    for i in range(0, len(missing), batch_size):
+        chunk = missing[i : i + batch_size]
+
+        try:
+            resp: Optional[requests.Response] = spotify_get(
+                url, params={"ids": ",".join(chunk)}, access_token=token
+            )
+        except requests.RequestException as exc:
+            # Verbindungsfehler/Timeout nach allen Retries: nur dieser Batch fehlt
+            print(
+                f"[WARN] {response_key}-Lookup fehlgeschlagen "
+                f"({exc}) für {len(chunk)} ID(s)."
+            )
+            resp = None
+
+        if resp is not None and resp.ok:
+            batch: dict[str, Optional[dict[str, Any]]] = {eid: None for eid in chunk}
+            for obj in resp.json().get(response_key) or []:
+                if obj and obj.get("id"):
+                    projected = _project(obj, lookup_fields)
+                    result[obj["id"]] = projected
+                    batch[obj["id"]] = projected
+            metadata_cache.put_many(cache_kind, batch)
+            if checkpoint is not None:
+                checkpoint.save_entities(cache_kind, batch)
+        else:
+            if resp is not None:
+                print(
+                    f"[WARN] {response_key}-Lookup fehlgeschlagen "
+                    f"(Status {resp.status_code}) für {len(chunk)} ID(s)."
+                )
+            if failed is not None:
+                failed.update(chunk)
+
+        for entity_id in chunk:
+            result.setdefault(entity_id, {})
+
+    return result
+
+
+def _collect_album_and_artist_ids(
+    tracks: list[dict[str, Any]],
+) -> tuple[list[str], list[str]]:
+    """
+    Sammelt die Album-IDs und die IDs der Primary Artists einer Trackliste
+    (in Reihenfolge des ersten Auftretens, ohne Duplikate).
+    """
+    album_ids: dict[str, None] = {}
+    artist_ids: dict[str, None] = {}
+
+    for t in tracks:
+        if not t.get("id"):
+            continue
+
+        album_id = (t.get("album") or {}).get("id")
+        if album_id:
+            album_ids[album_id] = None
+
+        artists = t.get("artists") or []
+        if artists and isinstance(artists[0], dict) and artists[0].get("id"):
+            artist_ids[artists[0]["id"]] = None
+
+    return list(album_ids), list(artist_ids)
+
+
+def _fetch_album_and_artist_lookups(
+    token: str,
+    tracks: list[dict[str, Any]],
+    checkpoint: Optional[ExportCheckpoint] = None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+    """
+    Holt alle Alben und Primary Artists einer Trackliste gebündelt über
+    /albums?ids= (max. 20 pro Request) und /artists?ids= (max. 50).
+    Bereits im persistenten Metadaten-Cache vorhandene Einträge werden
+    nicht erneut abgefragt.
+
+    Rückgabe: (albums_by_id, artists_by_id)
+    """
+    album_ids, artist_ids = _collect_album_and_artist_ids(tracks)
+
+    albums_by_id = _fetch_entities_batched(
+        token,
+        SPOTIFY_ALBUMS_URL,
+        album_ids,
+        ALBUMS_BATCH_SIZE,
+        "albums",
+        KIND_ALBUM,
+        ALBUM_LOOKUP_FIELDS,
+        checkpoint,
+    )
+    artists_by_id = _fetch_entities_batched(
+        token,
+        SPOTIFY_ARTISTS_URL,
+        artist_ids,
+        ARTISTS_BATCH_SIZE,
+        "artists",
+        KIND_ARTIST,
+        ARTIST_LOOKUP_FIELDS,
+        checkpoint,
+    )
+    return albums_by_id, artists_by_id
+
+
+def _resolve_genre_info(
+    track: Mapping[str, Any],
+    albums_by_id: Mapping[str, Mapping[str, Any]],
+    artists_by_id: Mapping[str, Mapping[str, Any]],
+) -> dict[str, Any]:
+    """
+    Leitet die Genre-Felder (Hybrid-Logik C) und 'total_tracks' eines Tracks
+    aus bereits geladenen Album-/Artist-Objekten ab. Führt keine Requests aus.
+    """
+    album = track.get("album") or {}
+    album_full = albums_by_id.get(album.get("id") or "") or {}
+
+    artists = track.get("artists") or []
+    artist_full: Mapping[str, Any] = {}
+    if artists and isinstance(artists[0], dict):
+        artist_full = artists_by_id.get(artists[0].get("id") or "") or {}
+
+    album_genres: list[str] = []
+    artist_genres: list[str] = []
+
+    # Album-Genres
+    raw_album_genres = album_full.get("genres") or []
+    if isinstance(raw_album_genres, list):
+        album_genres = [
+            g for g in (_normalize_genre(x) for x in raw_album_genres) if g
+        ]
+
+    # Artist-Genres (nur Primary Artist)
+    raw_artist_genres = artist_full.get("genres") or []
+    if isinstance(raw_artist_genres, list):
+        artist_genres = [
+            g for g in (_normalize_genre(x) for x in raw_artist_genres) if g
+        ]
+
+    # Hybrid-Logik C: erst Album, dann Artist
+    primary_genre: Optional[str] = None
+    if album_genres:
+        primary_genre = album_genres[0]
+    elif artist_genres:
+        primary_genre = artist_genres[0]
+
+    combined: list[str] = []
+    seen: set[str] = set()
+
+    def _add(g: Optional[str]) -> None:
+        if not g:
+            return
+        if g in seen:
+            return
+        seen.add(g)
+        combined.append(g)
+
+    # 1. Primary
+    _add(primary_genre)
+    # 2. Rest Album
+    for g in album_genres[1:]:
+        _add(g)
+        if len(combined) >= 3:
+            break
+    # 3. Artist-Genres
+    if len(combined) < 3:
+        for g in artist_genres:
+            _add(g)
+            if len(combined) >= 3:
+                break
+
+    return {
+        "primary_genre": primary_genre,
+        "genres_album": album_genres or None,
+        "genres_artist": artist_genres or None,
+        "genres_combined": combined or None,
+        "total_tracks": album_full.get("total_tracks") or album.get("total_tracks"),
+    }
+
+
 def _fetch_genres_for_tracks(
     token: str,
     tracks: list[dict[str, Any]],
@@ -121,117 +856,34 @@ def _fetch_genres_for_tracks(
     """
     Holt Album- und Artist-Genres für eine Trackliste.
 
+    Alben und Artists werden vorab gesammelt und gebündelt über die
+    Multi-ID-Endpoints geladen (statt ein Request pro Album/Artist).
+
     Rückgabe pro Track-ID:
     {
         "primary_genre": str | None,
         "genres_album": list[str] | None,
         "genres_artist": list[str] | None,
         "genres_combined": list[str] | None,
+        "total_tracks": int | None,   # Anzahl Tracks des Albums
     }
     """
+    albums_by_id, artists_by_id = _fetch_album_and_artist_lookups(token, tracks)
+    return _resolve_genres(tracks, albums_by_id, artists_by_id)
 
-    headers = {"Authorization": f"Bearer {token}"}
 
-    album_cache: dict[str, dict[str, Any]] = {}
-    artist_cache: dict[str, dict[str, Any]] = {}
+def _resolve_genres(
+    tracks: Iterable[Mapping[str, Any]],
+    albums_by_id: Mapping[str, Mapping[str, Any]],
+    artists_by_id: Mapping[str, Mapping[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """Genre-Infos pro Track-ID aus bereits geladenen Album-/Artist-Lookups."""
     result: dict[str, dict[str, Any]] = {}
-
     for t in tracks:
         track_id = t.get("id")
         if not track_id:
             continue
-
-        album = t.get("album") or {}
-        album_id = album.get("id")
-
-        artists = t.get("artists") or []
-        primary_artist_id: Optional[str] = None
-        if artists and isinstance(artists[0], dict):
-            primary_artist_id = artists[0].get("id")
-
-        album_genres: list[str] = []
-        artist_genres: list[str] = []
-
-        # Album-Genres
-        if album_id:
-            cached = album_cache.get(album_id)
-            if cached is None:
-                resp = requests.get(
-                    SPOTIFY_ALBUM_URL.format(album_id=album_id),
-                    headers=headers,
-                    timeout=10,
-                )
-                if resp.ok:
-                    cached = resp.json()
-                else:
-                    cached = {}
-                album_cache[album_id] = cached
-
-            raw_album_genres = cached.get("genres") or []
-            if isinstance(raw_album_genres, list):
-                album_genres = [
-                    g for g in (_normalize_genre(x) for x in raw_album_genres) if g
-                ]
-
-        # Artist-Genres (nur Primary Artist)
-        if primary_artist_id:
-            cached = artist_cache.get(primary_artist_id)
-            if cached is None:
-                resp = requests.get(
-                    SPOTIFY_ARTIST_URL.format(artist_id=primary_artist_id),
-                    headers=headers,
-                    timeout=10,
-                )
-                if resp.ok:
-                    cached = resp.json()
-                else:
-                    cached = {}
-                artist_cache[primary_artist_id] = cached
-
-            raw_artist_genres = cached.get("genres") or []
-            if isinstance(raw_artist_genres, list):
-                artist_genres = [
-                    g for g in (_normalize_genre(x) for x in raw_artist_genres) if g
-                ]
-
-        # Hybrid-Logik C: erst Album, dann Artist
-        primary_genre: Optional[str] = None
-        if album_genres:
-            primary_genre = album_genres[0]
-        elif artist_genres:
-            primary_genre = artist_genres[0]
-
-        combined: list[str] = []
-        seen: set[str] = set()
-
-        def _add(g: Optional[str]) -> None:
-            if not g:
-                return
-            if g in seen:
-                return
-            seen.add(g)
-            combined.append(g)
-
-        # 1. Primary
-        _add(primary_genre)
-        # 2. Rest Album
-        for g in album_genres[1:]:
-            _add(g)
-            if len(combined) >= 3:
-                break
-        # 3. Artist-Genres
-        if len(combined) < 3:
-            for g in artist_genres:
-                _add(g)
-                if len(combined) >= 3:
-                    break
-
-        result[track_id] = {
-            "primary_genre": primary_genre,
-            "genres_album": album_genres or None,
-            "genres_artist": artist_genres or None,
-            "genres_combined": combined or None,
-        }
+        result[track_id] = _resolve_genre_info(t, albums_by_id, artists_by_id)
 
     return result
 
@@ -249,12 +901,28 @@ def _build_extended_tracks(
     Baut aus rohen Spotify-Trackdaten + Audio Features eine Extended-Datenstruktur,
     die als Grundlage für ID3-Tagging, Dateinamen, Queue etc. dient.
     """
-    extended: List[Dict[str, Any]] = []
+    return list(
+        _iter_extended_tracks(playlist_full, audio_features_by_id, genre_info_by_track_id)
+    )
+
+
+def _iter_extended_tracks(
+    playlist_full: Mapping[str, Any],
+    audio_features_by_id: Mapping[str, Mapping[str, Any]],
+    genre_info_by_track_id: Mapping[str, Mapping[str, Any]],
+) -> Iterator[dict[str, Any]]:
+    """
+    Generator-Variante von _build_extended_tracks(): liefert die
+    Extended-Tracks einzeln (für den Streaming-Writer).
+    """
 
     # Alle Tracks aus dem zuvor angereicherten Playlist-Objekt holen
     raw_tracks: list[dict[str, Any]] = playlist_full.get("__all_tracks__", [])
 
-    for t in raw_tracks:
+    for raw in raw_tracks:
+        # Nur die zentral definierten Felder verwenden (siehe EXTENDED_TRACK_FIELDS)
+        t = _project(raw, EXTENDED_TRACK_FIELDS)
+
         track_id = t.get("id")
         name = t.get("name") or ""
         artists = t.get("artists") or []
@@ -291,8 +959,9 @@ def _build_extended_tracks(
 
         # 👉 Genre-Infos für diesen Track ziehen
         genre_info = genre_info_by_track_id.get(track_id, {}) if track_id else {}
+        total_tracks = genre_info.get("total_tracks") or album.get("total_tracks")
 
-        extended.append(
+        yield (
             {
                 # Identifikation
                 "spotify_track_id": track_id,
@@ -309,6 +978,7 @@ def _build_extended_tracks(
                 "release_date": release_date,
                 "track_number": track_number,
                 "disc_number": disc_number,
+                "total_tracks": total_tracks,
                 "explicit": is_explicit,
                 "duration_ms": duration_ms,
                 "isrc": isrc,
@@ -336,52 +1006,416 @@ def _build_extended_tracks(
             }
         )
 
-    return extended
+
+def _build_playlist_meta(
+    playlist_id: str,
+    playlist_full: Mapping[str, Any],
+    track_count: int,
+    limit: int | None = None,
+) -> Dict[str, Any]:
+    """
+    Baut den 'playlist'-Block der Extended-JSON.
+
+    Bei einem Teil-Export (limit) wird 'track_limit' gesetzt, damit die
+    Datei nicht als vollständiger Stand weiterverwendet wird.
+    """
+    meta_source = _project(playlist_full, PLAYLIST_META_FIELDS)
+    meta: Dict[str, Any] = {
+        "playlist_id": playlist_id,
+        "name": meta_source.get("name"),
+        "description": meta_source.get("description"),
+        "owner": (meta_source.get("owner") or {}).get("display_name"),
+        "spotify_url": (meta_source.get("external_urls") or {}).get("spotify"),
+        "snapshot_id": meta_source.get("snapshot_id"),
+        "total_tracks": track_count,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if limit is not None:
+        meta["track_limit"] = limit
+    return meta
+
+
+def _open_export_checkpoint(
+    playlist_id: str,
+    head: Mapping[str, Any],
+    limit: int | None = None,
+) -> Optional[ExportCheckpoint]:
+    """Checkpoint zum eben geladenen Playlist-Objekt (export_checkpoint)."""
+    try:
+        return export_checkpoint.open_checkpoint(
+            playlist_id, head.get("snapshot_id"), _track_page_fields(), limit
+        )
+    except OSError as exc:
+        print(f"[WARN] Checkpoint nicht nutzbar, Export läuft ohne: {exc}")
+        return None
 
 
 def fetch_playlist_tracks_extended(
     access_token: str,
     playlist_id: str,
+    limit: int | None = None,
+    stream_tracks: bool = False,
+    archive: bool = False,
+    checkpoint: bool = False,
 ) -> Dict[str, Any]:
     """
     High-Level: holt Playlist-Metadaten + Tracks + Audio-Features und
     gibt eine Struktur { playlist: {...}, tracks: [...] } zurück.
+
+    'limit' begrenzt Paging und Anreicherung auf die ersten 'limit' Tracks.
+
+    stream_tracks=True: 'tracks' ist ein Generator statt einer Liste, die
+    Extended-Tracks entstehen also erst beim Schreiben (siehe playlist_store).
+
+    archive=True: Rohdaten zusätzlich im response_archive ablegen.
+
+    checkpoint=True: Seiten und Anreicherung im export_checkpoint sichern
+    bzw. von einem abgebrochenen Lauf übernehmen. Aufräumen muss der
+    Aufrufer nach dem Schreiben (export_checkpoint.clear_checkpoint).
     """
-    playlist_full = _fetch_playlist_full(access_token, playlist_id)
+    head = _fetch_playlist_head(access_token, playlist_id)
+    saved = _open_export_checkpoint(playlist_id, head, limit) if checkpoint else None
+
+    playlist_full = _fetch_playlist_full(
+        access_token, playlist_id, limit=limit, head=head, checkpoint=saved
+    )
     all_tracks: list[dict[str, Any]] = playlist_full.get("__all_tracks__", [])
 
     audio_features_by_id = _fetch_audio_features(
         access_token,
         [t["id"] for t in all_tracks if t.get("id")],
+        saved,
     )
 
-    genre_info_by_track_id = _fetch_genres_for_tracks(
-        token=access_token,
-        tracks=all_tracks,
+    albums_by_id, artists_by_id = _fetch_album_and_artist_lookups(
+        access_token, all_tracks, saved
     )
+    genre_info_by_track_id = _resolve_genres(all_tracks, albums_by_id, artists_by_id)
+
+    if archive:
+        _archive_export(
+            playlist_id,
+            playlist_full,
+            audio_features_by_id,
+            albums_by_id,
+            artists_by_id,
+            limit=limit,
+        )
 
-    extended_tracks = _build_extended_tracks(
+    extended_tracks = _iter_extended_tracks(
         playlist_full,
         audio_features_by_id,
         genre_info_by_track_id,
     )
 
-    # Playlist-Metadaten extrahieren
-    playlist_meta = {
-        "playlist_id": playlist_id,
-        "name": playlist_full.get("name"),
-        "description": playlist_full.get("description"),
-        "owner": (playlist_full.get("owner") or {}).get("display_name"),
-        "spotify_url": (playlist_full.get("external_urls") or {}).get("spotify"),
-        "snapshot_id": playlist_full.get("snapshot_id"),
-        "total_tracks": len(extended_tracks),
-        "exported_at": datetime.now(timezone.utc).isoformat(),
+    return {
+        "playlist": _build_playlist_meta(
+            playlist_id, playlist_full, len(all_tracks), limit
+        ),
+        "tracks": extended_tracks if stream_tracks else list(extended_tracks),
     }
 
-    return {
-        "playlist": playlist_meta,
+
+# ---------------------------------------------------------------------------
+# Rohdaten-Archiv (response_archive) und Offline-Rebuild
+# ---------------------------------------------------------------------------
+
+def _archive_export(
+    playlist_id: str,
+    playlist_full: Mapping[str, Any],
+    audio_features_by_id: Mapping[str, Mapping[str, Any]],
+    albums_by_id: Mapping[str, Mapping[str, Any]],
+    artists_by_id: Mapping[str, Mapping[str, Any]],
+    limit: int | None = None,
+    extra: Optional[Mapping[str, Any]] = None,
+) -> None:
+    """
+    Legt die Rohdaten eines Exports im Archiv ab. Fehler beim Schreiben
+    brechen den Export nicht ab.
+    """
+    tracks = playlist_full.get("__all_tracks__", [])
+    playlist = {
+        k: v for k, v in playlist_full.items() if k not in ("tracks", "__all_tracks__")
+    }
+    try:
+        path = response_archive.archive_playlist(
+            playlist_id,
+            playlist,
+            tracks,
+            audio_features_by_id,
+            albums_by_id,
+            artists_by_id,
+            fields=_track_page_fields(),
+            track_limit=limit,
+            extra=extra,
+        )
+    except OSError as exc:
+        print(f"[WARN] Archiv für {playlist_id} nicht geschrieben: {exc}")
+        return
+    print(f"[ARCHIVE] Rohdaten archiviert: {path}")
+
+
+def rebuild_extended_from_archive(
+    playlist_id: str,
+    output_path: Path | None = None,
+    compact: bool | None = None,
+    gzip_output: bool | None = None,
+    fmt: str | None = None,
+) -> Path:
+    """
+    Baut die Extended-JSON einer Playlist aus dem Archiv neu – mit den
+    aktuellen Regeln für Extended-Tracks, Dateinamen und Genres, aber ohne
+    einen einzigen API-Request.
+
+    Neue Track-Felder (EXTENDED_TRACK_FIELDS) stehen erst nach einem neuen
+    Export im Archiv; in dem Fall wird gewarnt.
+    """
+    archived = response_archive.load_archived_playlist(playlist_id)
+    if archived is None:
+        raise FileNotFoundError(
+            f"Kein Archiv für Playlist {playlist_id} – zuerst mit --archive exportieren."
+        )
+
+    manifest = archived.manifest
+    if manifest.get("fields") != _track_page_fields():
+        print(
+            f"[WARN] Archiv von {playlist_id} nutzt einen älteren Feldumfang – "
+            "neu hinzugekommene Track-Felder bleiben leer (neu exportieren)."
+        )
+
+    settings = get_settings()
+    compact = settings.export_compact_json if compact is None else compact
+    gzip_output = settings.export_gzip if gzip_output is None else gzip_output
+    if output_path is None:
+        output_path = playlist_json_path(
+            playlist_id, gzip_output, (fmt or settings.default_format).lower()
+        )
+
+    playlist_full: Dict[str, Any] = dict(archived.playlist)
+    playlist_full["__all_tracks__"] = archived.tracks
+    limit = manifest.get("track_limit")
+
+    meta = _build_playlist_meta(playlist_id, playlist_full, len(archived.tracks), limit)
+    meta["exported_at"] = manifest.get("archived_at")
+    meta["rebuilt_at"] = datetime.now(timezone.utc).isoformat()
+
+    write_playlist_file(
+        output_path,
+        meta,
+        _iter_extended_tracks(
+            playlist_full,
+            archived.audio_features_by_id,
+            _resolve_genres(
+                archived.tracks, archived.albums_by_id, archived.artists_by_id
+            ),
+        ),
+        extra=archived.extra,
+        compact=compact,
+    )
+    return output_path
+
+
+# ---------------------------------------------------------------------------
+# Inkrementeller Export (snapshot_id)
+# ---------------------------------------------------------------------------
+
+def _fetch_playlist_snapshot_id(access_token: str, playlist_id: str) -> Optional[str]:
+    """Holt nur die aktuelle snapshot_id einer Playlist (sehr kleine Antwort)."""
+    resp = spotify_get(
+        SPOTIFY_PLAYLIST_URL.format(playlist_id=playlist_id),
+        params={"fields": "snapshot_id"},
+        access_token=access_token,
+    )
+    resp.raise_for_status()
+    return resp.json().get("snapshot_id")
+
+
+def _load_previous_export(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Lädt eine bestehende Extended-JSON (auch gzip) für den inkrementellen
+    Export. Gibt None zurück, wenn die Datei fehlt oder nicht verwertbar ist.
+    """
+    if not path.exists():
+        return None
+    try:
+        data = read_playlist_file(path)
+    except (OSError, ValueError, EOFError) as exc:
+        print(f"[WARN] Bestehende Extended-JSON nicht lesbar ({exc}) – Vollexport.")
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("tracks"), list):
+        return None
+    return data
+
+
+def _enrichment_from_previous(
+    track: Mapping[str, Any],
+) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Rekonstruiert Audio-Features und Genre-Infos eines bereits exportierten
+    Tracks, damit er ohne erneute API-Requests neu aufgebaut werden kann.
+    """
+    audio_feat: Dict[str, Any] = dict(track.get("audio_features") or {})
+    if not audio_feat:
+        derived = {
+            "tempo": track.get("bpm"),
+            "key": track.get("key_index"),
+            "mode": track.get("mode_index"),
+            "time_signature": track.get("time_signature"),
+        }
+        if any(v is not None for v in derived.values()):
+            audio_feat = derived
+
+    genre_info = {
+        "primary_genre": track.get("primary_genre"),
+        "genres_album": track.get("genres_album"),
+        "genres_artist": track.get("genres_artist"),
+        "genres_combined": track.get("genres_combined"),
+        "total_tracks": track.get("total_tracks"),
+    }
+    return audio_feat, genre_info
+
+
+def fetch_playlist_tracks_incremental(
+    access_token: str,
+    playlist_id: str,
+    previous: Mapping[str, Any],
+    archive: bool = False,
+    checkpoint: bool = False,
+) -> Dict[str, Any]:
+    """
+    Inkrementelle Variante von fetch_playlist_tracks_extended().
+
+    - Die Trackliste wird (projiziert) neu geholt.
+    - Audio-Features und Genres werden nur für neu hinzugekommene Tracks
+      abgefragt; bekannte Tracks übernehmen ihre Anreicherung aus 'previous'.
+    - Entfernte Tracks landen mit 'removed_at' im Top-Level-Block
+      'removed_tracks' (wieder hinzugefügte Tracks werden dort entfernt).
+    - archive=True: die Rohdaten bekannter Tracks kommen aus dem bisherigen
+      Archiv, die neuen aus den Abfragen dieses Laufs.
+    - checkpoint=True: wie bei fetch_playlist_tracks_extended().
+    """
+    head = _fetch_playlist_head(access_token, playlist_id)
+    saved = _open_export_checkpoint(playlist_id, head) if checkpoint else None
+
+    playlist_full = _fetch_playlist_full(
+        access_token, playlist_id, head=head, checkpoint=saved
+    )
+    all_tracks: list[dict[str, Any]] = playlist_full.get("__all_tracks__", [])
+
+    previous_by_id: Dict[str, Mapping[str, Any]] = {
+        t["spotify_track_id"]: t
+        for t in previous.get("tracks") or []
+        if t.get("spotify_track_id")
+    }
+    current_ids = {t["id"] for t in all_tracks if t.get("id")}
+
+    audio_features_by_id: Dict[str, Dict[str, Any]] = {}
+    genre_info_by_track_id: Dict[str, Dict[str, Any]] = {}
+    for track_id in current_ids & previous_by_id.keys():
+        feat, genre_info = _enrichment_from_previous(previous_by_id[track_id])
+        audio_features_by_id[track_id] = feat
+        genre_info_by_track_id[track_id] = genre_info
+
+    added_ids = [
+        tid
+        for tid in dict.fromkeys(t.get("id") for t in all_tracks)
+        if tid and tid not in previous_by_id
+    ]
+    albums_by_id: Dict[str, Dict[str, Any]] = {}
+    artists_by_id: Dict[str, Dict[str, Any]] = {}
+    added_features: Dict[str, Dict[str, Any]] = {}
+    if added_ids:
+        added_set = set(added_ids)
+        added_tracks = [t for t in all_tracks if t.get("id") in added_set]
+        added_features = _fetch_audio_features(access_token, added_ids, saved)
+        audio_features_by_id.update(added_features)
+        albums_by_id, artists_by_id = _fetch_album_and_artist_lookups(
+            access_token, added_tracks, saved
+        )
+        genre_info_by_track_id.update(
+            _resolve_genres(added_tracks, albums_by_id, artists_by_id)
+        )
+
+    extended_tracks = _build_extended_tracks(
+        playlist_full,
+        audio_features_by_id,
+        genre_info_by_track_id,
+    )
+
+    # Entfernte Tracks markieren (bisherige Markierungen bleiben erhalten)
+    now = datetime.now(timezone.utc).isoformat()
+    removed_tracks: List[Dict[str, Any]] = [
+        t for t in previous.get("removed_tracks") or []
+        if t.get("spotify_track_id") not in current_ids
+    ]
+    removed_ids = [tid for tid in previous_by_id if tid not in current_ids]
+    for track_id in removed_ids:
+        entry = dict(previous_by_id[track_id])
+        entry["removed_at"] = now
+        removed_tracks.append(entry)
+
+    print(
+        f"[EXPORT] Inkrementell: {len(added_ids)} neu, "
+        f"{len(removed_ids)} entfernt, "
+        f"{len(current_ids) - len(added_ids)} unverändert übernommen."
+    )
+
+    data: Dict[str, Any] = {
+        "playlist": _build_playlist_meta(playlist_id, playlist_full, len(extended_tracks)),
         "tracks": extended_tracks,
     }
+    if removed_tracks:
+        data["removed_tracks"] = removed_tracks
+
+    if archive:
+        _archive_incremental(
+            playlist_id,
+            playlist_full,
+            current_ids - set(added_ids),
+            added_features,
+            albums_by_id,
+            artists_by_id,
+            extra={"removed_tracks": removed_tracks} if removed_tracks else None,
+        )
+    return data
+
+
+def _archive_incremental(
+    playlist_id: str,
+    playlist_full: Mapping[str, Any],
+    known_ids: set[str],
+    audio_features_by_id: Mapping[str, Mapping[str, Any]],
+    albums_by_id: Mapping[str, Mapping[str, Any]],
+    artists_by_id: Mapping[str, Mapping[str, Any]],
+    extra: Optional[Mapping[str, Any]] = None,
+) -> None:
+    """
+    Archiviert einen inkrementellen Export. Die Rohdaten der übernommenen
+    Tracks stammen aus dem vorherigen Archiv; fehlt es (oder deckt es die
+    Tracks nicht ab), wird nicht archiviert.
+    """
+    try:
+        previous = response_archive.load_archived_playlist(playlist_id)
+    except (OSError, ValueError) as exc:
+        print(f"[WARN] Bisheriges Archiv von {playlist_id} nicht lesbar: {exc}")
+        previous = None
+
+    archived_ids = {t.get("id") for t in previous.tracks} if previous else set()
+    if previous is None or previous.manifest.get("track_limit") or not known_ids <= archived_ids:
+        print(
+            f"[INFO] Kein vollständiges Archiv für {playlist_id} – "
+            "inkrementeller Export wird nicht archiviert (einmal voll exportieren)."
+        )
+        return
+
+    _archive_export(
+        playlist_id,
+        playlist_full,
+        {**previous.audio_features_by_id, **audio_features_by_id},
+        {**previous.albums_by_id, **albums_by_id},
+        {**previous.artists_by_id, **artists_by_id},
+        extra=extra,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -392,51 +1426,296 @@ def export_playlist_to_json(
     playlist_id: str,
     output_path: Path | None = None,
     limit: int | None = None,
+    incremental: bool = False,
+    engine: str | None = None,
+    compact: bool | None = None,
+    gzip_output: bool | None = None,
+    fmt: str | None = None,
+    with_ytdlp: bool = False,
+    archive: bool | None = None,
 ) -> Path:
     """
     Exportiert eine öffentliche Playlist als Extended-JSON-Datei
     mit Top-Level-Struktur { playlist: {...}, tracks: [...] }.
-    """
-    token = get_access_token()
-    data = fetch_playlist_tracks_extended(token, playlist_id)
 
-    OUTPUT_DIRECTORY.mkdir(parents=True, exist_ok=True)
+    with_ytdlp=True: erzeugt zusätzlich die yt-dlp-Textliste aus der eben
+    geschriebenen Datei (ein Spotify-Abruf für beide Ausgaben).
 
-    if output_path is None:
-        output_path = OUTPUT_DIRECTORY / f"spotify_playlist_{playlist_id}.json"
+    fmt: "json" oder "jsonl" (Default: DefaultFormat) für den Standardpfad;
+    bei explizitem 'output_path' entscheidet dessen Endung.
 
-    assert output_path is not None
+    Die Datei wird Track für Track gestreamt und atomar ersetzt
+    (playlist_store.write_playlist_file). compact=True schreibt ohne
+    Einrückung und ohne rohes 'audio_features'-Dict, gzip_output=True als
+    .json.gz (Defaults: ExportCompactJson / ExportGzip).
+
+    incremental=True: Existiert die Ausgabedatei bereits, wird zuerst nur
+    die snapshot_id geprüft. Ist sie unverändert, endet der Export ohne
+    weitere Requests; sonst werden nur neue Tracks angereichert
+    (siehe fetch_playlist_tracks_incremental).
+
+    engine: "sync" oder "async" (Default: ExportEngine). Die Async-Engine
+    (async_exporter) lädt Seiten, Audio-Features und Genres gleichzeitig.
+
+    limit: nur die ersten 'limit' Tracks laden und anreichern (Vorschau).
+    Ein Teil-Export ersetzt keinen vollständigen Stand, daher wird
+    'incremental' mit gesetztem Limit ignoriert.
 
-    output_path.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+    archive=True: Rohdaten zusätzlich im response_archive ablegen, damit
+    `rebuild-extended` die Datei später offline neu bauen kann
+    (Default: ResponseArchiveEnabled).
+
+    Mit ExportCheckpointsEnabled landen geladene Seiten und Anreicherungs-
+    Batches unterwegs in data/checkpoints; ein abgebrochener Export setzt
+    beim nächsten Aufruf dort fort. Nach dem Schreiben wird aufgeräumt.
+    """
+    reset_http_stats()
+    metadata_cache.reset_cache_stats()
+
+    output_path, _ = _export_playlist_json(
+        playlist_id,
+        output_path=output_path,
+        limit=limit,
+        incremental=incremental,
+        engine=engine,
+        compact=compact,
+        gzip_output=gzip_output,
+        fmt=fmt,
+        archive=archive,
     )
 
+    if with_ytdlp:
+        ytdlp_path = _ytdlp_txt_path(playlist_id)
+        count = _write_ytdlp_txt(iter_playlist_tracks(output_path), ytdlp_path)
+        print(f"[EXPORT] yt-dlp-Trackliste ({count} Zeilen): {ytdlp_path}")
+
+    print(f"[HTTP] {format_http_stats()}")
+    print(f"[ETAG] {etag_cache.format_etag_stats()}")
+    print(f"[CACHE] {metadata_cache.format_cache_stats()}")
     return output_path
 
 
-def export_playlist_to_ytdlp_txt(
+def _export_playlist_json(
     playlist_id: str,
     output_path: Path | None = None,
     limit: int | None = None,
-) -> Path:
+    incremental: bool = False,
+    engine: str | None = None,
+    compact: bool | None = None,
+    gzip_output: bool | None = None,
+    fmt: str | None = None,
+    archive: bool | None = None,
+) -> tuple[Path, Optional[Dict[str, Any]]]:
     """
-    Erzeugt eine Textdatei mit Such-Queries für yt-dlp.
-    Pro Zeile:
-        ytsearch1:Artist - Title
+    Eigentlicher JSON-Export ohne Statistik-Ausgabe (auch für export-many).
+
+    Rückgabe: (Pfad, geschriebene Daten) – Daten sind None, wenn der
+    inkrementelle Export die bestehende Datei unverändert lässt. 'tracks'
+    ist nach dem Schreiben bereits verbraucht (Generator).
     """
+    settings = get_settings()
+    compact = settings.export_compact_json if compact is None else compact
+    gzip_output = settings.export_gzip if gzip_output is None else gzip_output
+    fmt = (fmt or settings.default_format).lower()
+    archive = settings.response_archive_enabled if archive is None else archive
+    checkpoint = settings.export_checkpoints_enabled
+
+    previous_path = output_path
+    if output_path is None:
+        output_path = playlist_json_path(playlist_id, gzip_output, fmt)
+        # Beim Wechsel des Formats (.json/.jsonl, gzip) die vorhandene Datei nutzen
+        previous_path = find_playlist_file(playlist_id) or output_path
+    elif gzip_output and output_path.suffix != ".gz":
+        output_path = output_path.with_name(output_path.name + ".gz")
+        previous_path = output_path
+
+    assert output_path is not None
+    assert previous_path is not None
+
     token = get_access_token()
-    data = fetch_playlist_tracks_extended(token, playlist_id)
-    tracks: List[Dict[str, Any]] = data.get("tracks", [])
 
-    OUTPUT_DIRECTORY.mkdir(parents=True, exist_ok=True)
+    if incremental and limit is not None:
+        print("[INFO] --limit gesetzt – inkrementeller Export wird übersprungen.")
+        incremental = False
+
+    previous = _load_previous_export(previous_path) if incremental else None
+    if previous is not None:
+        previous_playlist = previous.get("playlist") or {}
+        previous_snapshot = previous_playlist.get("snapshot_id")
+        current_snapshot = _fetch_playlist_snapshot_id(token, playlist_id)
+        if previous_playlist.get("track_limit") is not None:
+            # Teil-Export (--limit): trotz gleicher snapshot_id nicht vollständig
+            print(
+                f"[INFO] Bestehende Extended-JSON ist ein Teil-Export "
+                f"(track_limit {previous_playlist['track_limit']}) – "
+                "exportiere alle Tracks."
+            )
+        elif previous_snapshot and previous_snapshot == current_snapshot:
+            print(
+                f"[EXPORT] Playlist {playlist_id} unverändert "
+                f"(snapshot_id {current_snapshot}) – "
+                "bestehende Extended-JSON bleibt gültig."
+            )
+            return previous_path, None
+        data = fetch_playlist_tracks_incremental(
+            token, playlist_id, previous, archive=archive, checkpoint=checkpoint
+        )
+    elif (engine or settings.export_engine).lower() == "async":
+        # Lazy Import: async_exporter baut auf diesem Modul auf
+        from async_exporter import run_fetch_playlist_tracks_extended_async
+
+        data = run_fetch_playlist_tracks_extended_async(
+            token,
+            playlist_id,
+            limit=limit,
+            stream_tracks=True,
+            archive=archive,
+            checkpoint=checkpoint,
+        )
+    else:
+        data = fetch_playlist_tracks_extended(
+            token,
+            playlist_id,
+            limit=limit,
+            stream_tracks=True,
+            archive=archive,
+            checkpoint=checkpoint,
+        )
+
+    extra = {k: v for k, v in data.items() if k not in ("playlist", "tracks")}
+    write_playlist_file(
+        output_path,
+        data["playlist"],
+        data["tracks"],
+        extra=extra,
+        compact=compact,
+    )
+    if checkpoint:
+        # Erst jetzt ist alles Geholte in der (atomar ersetzten) Datei
+        export_checkpoint.clear_checkpoint(playlist_id)
 
-    if output_path is None:
-        filename = YTDLP_TEXTFILE_PATTERN.format(playlist_id=playlist_id)
-        output_path = OUTPUT_DIRECTORY / filename
+    return output_path, data
 
-    assert output_path is not None
 
+# ---------------------------------------------------------------------------
+# Mehrere Playlists in einem Prozess (export-many)
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PlaylistExportResult:
+    """Ergebnis eines einzelnen Exports innerhalb von export_many_playlists()."""
+    playlist_id: str
+    seconds: float
+    output_path: Optional[Path] = None
+    name: Optional[str] = None
+    track_count: Optional[int] = None
+    unchanged: bool = False
+    error: Optional[str] = None
+
+
+def read_playlist_ids_file(path: Path) -> List[str]:
+    """
+    Liest Playlist-IDs aus einer Textdatei (eine ID pro Zeile).
+    Leere Zeilen und Kommentare (#) werden ignoriert.
+    """
+    ids: List[str] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        value = line.split("#", 1)[0].strip()
+        if value:
+            ids.append(value)
+    return ids
+
+
+def export_many_playlists(
+    playlist_ids: List[str],
+    workers: int | None = None,
+    incremental: bool = False,
+    engine: str | None = None,
+    archive: bool | None = None,
+) -> List[PlaylistExportResult]:
+    """
+    Exportiert mehrere Playlists in einem Prozess mit gemeinsamem Worker-Pool.
+
+    - Token, HTTP-Session und Metadaten-Cache werden geteilt.
+    - Album-/Artist-Lookups laufen über einen gemeinsamen SharedLookupCache:
+      jedes Album / jeder Artist wird im ganzen Lauf höchstens einmal geholt.
+    - Fehler einer Playlist brechen den Lauf nicht ab, sondern landen im
+      Ergebnis ('error').
+
+    Rückgabe: ein PlaylistExportResult pro Playlist (Eingabereihenfolge).
+    """
+    global _shared_lookups
+
+    unique_ids = list(dict.fromkeys(pid.strip() for pid in playlist_ids if pid.strip()))
+    worker_count = max(
+        1, min(workers or get_settings().export_many_workers, len(unique_ids) or 1)
+    )
+
+    reset_http_stats()
+    metadata_cache.reset_cache_stats()
+    # Token einmal vorab holen, damit nicht alle Worker gleichzeitig anfragen
+    get_access_token()
+
+    shared = SharedLookupCache()
+    _shared_lookups = shared
+
+    def _run(playlist_id: str) -> PlaylistExportResult:
+        start = time.perf_counter()
+        try:
+            path, data = _export_playlist_json(
+                playlist_id,
+                incremental=incremental,
+                engine=engine,
+                archive=archive,
+            )
+        except Exception as exc:  # noqa: BLE001
+            return PlaylistExportResult(
+                playlist_id=playlist_id,
+                seconds=time.perf_counter() - start,
+                error=str(exc),
+            )
+
+        meta = (data or {}).get("playlist") or {}
+        return PlaylistExportResult(
+            playlist_id=playlist_id,
+            seconds=time.perf_counter() - start,
+            output_path=path,
+            name=meta.get("name"),
+            track_count=meta.get("total_tracks"),
+            unchanged=data is None,
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=worker_count) as pool:
+            results = list(pool.map(_run, unique_ids))
+    finally:
+        _shared_lookups = None
+
+    print(f"[HTTP] {format_http_stats()}")
+    print(f"[ETAG] {etag_cache.format_etag_stats()}")
+    print(f"[CACHE] {metadata_cache.format_cache_stats()}")
+    print(
+        f"[EXPORT] Geteilte Album-/Artist-Lookups: {shared.hits} Treffer, "
+        f"{shared.fetched} geladen."
+    )
+    return results
+
+
+def _ytdlp_txt_path(playlist_id: str) -> Path:
+    """Standardpfad der yt-dlp-Textliste (YTDLP_TextFilePattern)."""
+    settings = get_settings()
+    filename = settings.ytdlp_textfile_pattern.format(playlist_id=playlist_id)
+    return settings.output_directory / filename
+
+
+def _write_ytdlp_txt(
+    tracks: Iterable[Mapping[str, Any]],
+    output_path: Path,
+) -> int:
+    """
+    Schreibt die yt-dlp-Suchliste ('ytsearch1:Artist - Title' pro Zeile)
+    aus Extended-Tracks. Gibt die Anzahl Zeilen zurück.
+    """
     lines: List[str] = []
 
     for t in tracks:
@@ -449,5 +1728,82 @@ def export_playlist_to_ytdlp_txt(
         query = f"{artist} - {title}" if artist and title else (artist or title)
         lines.append(f"ytsearch1:{query}")
 
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text("\n".join(lines), encoding="utf-8")
+    return len(lines)
+
+
+def _is_extended_export_fresh(
+    access_token: str,
+    playlist_id: str,
+    path: Path,
+    limit: int | None = None,
+) -> bool:
+    """
+    True, wenn die Extended-Datei 'path' den aktuellen Stand der Playlist
+    enthält (gleiche snapshot_id) und – bei einem Teil-Export – mindestens
+    'limit' Tracks abdeckt. Kostet einen sehr kleinen Request.
+    """
+    try:
+        meta = read_playlist_meta(path)
+    except (OSError, ValueError, EOFError):
+        return False
+
+    track_limit = meta.get("track_limit")
+    if track_limit is not None and (limit is None or limit > track_limit):
+        return False
+
+    snapshot_id = meta.get("snapshot_id")
+    if not snapshot_id:
+        return False
+    return snapshot_id == _fetch_playlist_snapshot_id(access_token, playlist_id)
+
+
+def export_playlist_to_ytdlp_txt(
+    playlist_id: str,
+    output_path: Path | None = None,
+    limit: int | None = None,
+) -> Path:
+    """
+    Erzeugt eine Textdatei mit Such-Queries für yt-dlp.
+    Pro Zeile:
+        ytsearch1:Artist - Title
+
+    Ist bereits eine aktuelle Extended-Datei vorhanden (gleiche snapshot_id),
+    wird die Liste daraus erzeugt – ohne weitere API-Requests. Sonst werden
+    nur Titel und Artists geladen (YTDLP_TRACK_FIELDS), ohne Audio-Features
+    und Genres.
+    """
+    reset_http_stats()
+    metadata_cache.reset_cache_stats()
+    token = get_access_token()
+
+    if output_path is None:
+        output_path = _ytdlp_txt_path(playlist_id)
+
+    assert output_path is not None
+
+    tracks: Iterable[Mapping[str, Any]]
+    source = find_playlist_file(playlist_id)
+    if source is not None and _is_extended_export_fresh(token, playlist_id, source, limit):
+        print(f"[EXPORT] Nutze aktuelle Extended-Datei: {source}")
+        tracks = islice(iter_playlist_tracks(source), limit)
+    else:
+        playlist_full = _fetch_playlist_full(
+            token,
+            playlist_id,
+            limit=limit,
+            track_fields=YTDLP_TRACK_FIELDS,
+        )
+        tracks = (
+            {
+                "title": raw.get("name"),
+                "primary_artist": ((raw.get("artists") or [{}])[0] or {}).get("name"),
+            }
+            for raw in playlist_full.get("__all_tracks__", [])
+        )
+
+    _write_ytdlp_txt(tracks, output_path)
+    print(f"[HTTP] {format_http_stats()}")
+    print(f"[ETAG] {etag_cache.format_etag_stats()}")
     return output_path
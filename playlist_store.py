@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import IO, Any, Dict, Optional
+
+from config import get_settings
+
+
+# ---------------------------------------------------------------------------
+# Ablage der Extended-Playlist-Dateien
+# ---------------------------------------------------------------------------
+#
+# Zentrale Stelle für Schreiben und Lesen der Extended-JSON:
+# - Schreiben per Generator (Track für Track), damit nie der komplette
+#   JSON-String im Speicher liegt
+# - optional kompakt (ohne Einrückung, ohne rohes 'audio_features'-Dict)
+# - optional gzip (Endung .json.gz)
+# - atomar: erst in eine Temp-Datei im Zielordner, dann os.replace()
+#
+# Lesen erkennt gzip an den Magic Bytes, nicht an der Endung. Für Downloads
+# und Tagging gibt es zusätzlich einen inkrementellen Leser, der Tracks
+# einzeln liefert (iter_playlist_tracks).
+#
+# Alternativ zur JSON gibt es ein JSON-Lines-Format (.jsonl / .jsonl.gz):
+#   Zeile 1: Header {"__format__": ..., "version": 1, "playlist": {...}, ...}
+#   ab Zeile 2: ein Track pro Zeile
+# Das lässt sich ohne eigenen Parser Zeile für Zeile lesen und ist deutlich
+# schneller als die eingerückte JSON. Welches Format geschrieben wird, regelt
+# DefaultFormat ("json" / "jsonl"); gelesen wird immer die neueste Datei.
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Blockgröße beim inkrementellen Lesen (Zeichen)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Felder, die im kompakten Modus entfallen (Rohdaten, die bereits in
+# abgeleiteten Feldern wie 'bpm' / 'key_index' stecken)
+COMPACT_DROPPED_TRACK_FIELDS = ("audio_features",)
+
+FORMAT_JSON = "json"
+FORMAT_JSONL = "jsonl"
+PLAYLIST_FORMATS = (FORMAT_JSON, FORMAT_JSONL)
+
+# Kennung im Header-Datensatz der JSON-Lines-Dateien
+JSONL_FORMAT_ID = "trackbridge-extended-playlist"
+JSONL_FORMAT_VERSION = 1
+
+
+def playlist_json_path(
+    playlist_id: str,
+    gzip_output: bool = False,
+    fmt: str = FORMAT_JSON,
+) -> Path:
+    """Standardpfad der Extended-Datei einer Playlist (z. B. .json, .jsonl.gz)."""
+    if fmt not in PLAYLIST_FORMATS:
+        raise ValueError(f"Unbekanntes Playlist-Format: {fmt!r}")
+    suffix = f".{fmt}.gz" if gzip_output else f".{fmt}"
+    return get_settings().output_directory / f"spotify_playlist_{playlist_id}{suffix}"
+
+
+def find_playlist_file(playlist_id: str) -> Optional[Path]:
+    """
+    Sucht die vorhandene Extended-Datei einer Playlist (.json, .jsonl,
+    jeweils auch .gz). Existieren mehrere, gewinnt die zuletzt geschriebene.
+    """
+    candidates = [
+        p
+        for fmt in PLAYLIST_FORMATS
+        for p in (
+            playlist_json_path(playlist_id, False, fmt),
+            playlist_json_path(playlist_id, True, fmt),
+        )
+        if p.exists()
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: p.stat().st_mtime)
+
+
+def playlist_file_format(path: Path) -> str:
+    """Format einer Extended-Datei anhand der Endung (.jsonl[.gz] / sonst JSON)."""
+    name = path.name[:-3] if path.name.endswith(".gz") else path.name
+    return FORMAT_JSONL if name.endswith(".jsonl") else FORMAT_JSON
+
+
+# ---------------------------------------------------------------------------
+# Lesen
+# ---------------------------------------------------------------------------
+
+def is_gzip_file(path: Path) -> bool:
+    """True, wenn die Datei mit den gzip-Magic-Bytes beginnt."""
+    with path.open("rb") as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+def open_playlist_text(path: Path) -> IO[str]:
+    """Öffnet eine Extended-Datei als Text – gzip wird transparent entpackt."""
+    if is_gzip_file(path):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def read_playlist_file(path: Path) -> Dict[str, Any]:
+    """
+    Liest eine Extended-Datei komplett ein (JSON oder JSON Lines, jeweils
+    auch gzip) und liefert immer { playlist, tracks, ... }.
+    """
+    if playlist_file_format(path) == FORMAT_JSONL:
+        with open_playlist_text(path) as f:
+            data = _read_jsonl_header(f)
+            data["tracks"] = [json.loads(line) for line in f if line.strip()]
+        return data
+
+    with open_playlist_text(path) as f:
+        data = json.load(f)
+    return data
+
+
+def _read_jsonl_header(handle: IO[str]) -> Dict[str, Any]:
+    """Liest und prüft den Header-Datensatz (erste Zeile) einer JSONL-Datei."""
+    header = json.loads(handle.readline() or "null")
+    if not isinstance(header, dict) or header.get("__format__") != JSONL_FORMAT_ID:
+        raise ValueError("Unerwartetes JSONL-Format: Header-Datensatz fehlt.")
+    if int(header.get("version") or 0) > JSONL_FORMAT_VERSION:
+        raise ValueError(
+            f"JSONL-Version {header.get('version')} wird nicht unterstützt."
+        )
+
+    data = {k: v for k, v in header.items() if k not in ("__format__", "version")}
+    data.setdefault("playlist", {})
+    return data
+
+
+class _JsonStreamReader:
+    """
+    Minimaler inkrementeller Leser für die Top-Level-Struktur der
+    Extended-JSON: liest die Datei blockweise und decodiert einzelne Werte
+    per json.JSONDecoder.raw_decode, ohne den Rest der Datei zu laden.
+    """
+
+    def __init__(self, handle: IO[str], chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Liest den nächsten Block nach; False am Dateiende."""
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Bereits verarbeiteten Teil verwerfen, damit der Puffer klein bleibt
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def next_char(self) -> str:
+        """Überspringt Whitespace und liefert das nächste Zeichen (ohne es zu verbrauchen)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unerwartetes Dateiende in der Extended-JSON.")
+
+    def take(self) -> str:
+        """Liefert und verbraucht das nächste Zeichen (ohne Whitespace)."""
+        char = self.next_char()
+        self._pos += 1
+        return char
+
+    def expect(self, char: str) -> None:
+        if self.next_char() != char:
+            raise ValueError(
+                f"Unerwartetes Zeichen {self._buf[self._pos]!r} "
+                f"(erwartet {char!r}) in der Extended-JSON."
+            )
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decodiert den nächsten vollständigen JSON-Wert."""
+        self.next_char()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Zahlen/Literale am Pufferende könnten abgeschnitten sein
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+
+def read_playlist_meta(path: Path) -> Dict[str, Any]:
+    """
+    Liest nur den 'playlist'-Block einer Extended-Datei. Da der Block vorne
+    steht, wird dafür nur der Dateianfang gelesen.
+    """
+    if playlist_file_format(path) == FORMAT_JSONL:
+        with open_playlist_text(path) as f:
+            return dict(_read_jsonl_header(f).get("playlist") or {})
+
+    with open_playlist_text(path) as f:
+        reader = _JsonStreamReader(f)
+        reader.expect("{")
+        if reader.next_char() == "}":
+            return {}
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            value = reader.value()
+            if key == "playlist":
+                return dict(value or {})
+            if reader.take() == "}":
+                return {}
+
+
+def iter_playlist_tracks(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Liefert die Tracks einer Extended-Datei einzeln, ohne die Datei komplett
+    zu parsen. Bricht der Aufrufer ab (z. B. nach 'limit' Tracks), wird der
+    Rest der Datei nie gelesen – der Speicherbedarf bleibt unabhängig von
+    der Playlist-Größe.
+    """
+    if playlist_file_format(path) == FORMAT_JSONL:
+        with open_playlist_text(path) as f:
+            _read_jsonl_header(f)
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    with open_playlist_text(path) as f:
+        reader = _JsonStreamReader(f)
+        reader.expect("{")
+        if reader.next_char() == "}":
+            raise ValueError("Unerwartetes JSON-Format: 'tracks' fehlt.")
+
+        while True:
+            key = reader.value()
+            reader.expect(":")
+
+            if key == "tracks":
+                reader.expect("[")
+                if reader.next_char() == "]":
+                    return
+                while True:
+                    track = reader.value()
+                    if isinstance(track, dict):
+                        yield track
+                    sep = reader.take()
+                    if sep == "]":
+                        return
+                    if sep != ",":
+                        raise ValueError("Ungültige 'tracks'-Liste in der Extended-JSON.")
+
+            reader.value()  # andere Top-Level-Werte (z. B. 'playlist') überspringen
+            if reader.take() == "}":
+                raise ValueError("Unerwartetes JSON-Format: 'tracks' fehlt.")
+
+
+# ---------------------------------------------------------------------------
+# Schreiben
+# ---------------------------------------------------------------------------
+
+def _compact_track(track: Mapping[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in track.items() if k not in COMPACT_DROPPED_TRACK_FIELDS}
+
+
+def iter_playlist_json_chunks(
+    playlist: Mapping[str, Any],
+    tracks: Iterable[Mapping[str, Any]],
+    extra: Mapping[str, Any] | None = None,
+    compact: bool = False,
+) -> Iterator[str]:
+    """
+    Erzeugt die Extended-JSON { playlist, tracks, ...extra } stückweise.
+
+    'tracks' darf ein Generator sein und wird genau einmal durchlaufen.
+    Ohne 'compact' ist die Ausgabe identisch zu json.dumps(..., indent=2).
+    """
+    if compact:
+        def dump(value: Any, level: int) -> str:  # noqa: ARG001
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+        newline, pad, colon = "", "", ":"
+    else:
+        def dump(value: Any, level: int) -> str:
+            text = json.dumps(value, ensure_ascii=False, indent=2)
+            return text.replace("\n", "\n" + "  " * level)
+
+        newline, pad, colon = "\n", "  ", ": "
+
+    yield "{" + newline
+    yield f'{pad}"playlist"{colon}{dump(playlist, 1)},{newline}'
+
+    yield f'{pad}"tracks"{colon}['
+    first = True
+    for track in tracks:
+        if compact:
+            track = _compact_track(track)
+        yield ("" if first else ",") + newline + pad * 2 + dump(track, 2)
+        first = False
+    yield "]" if first else newline + pad + "]"
+
+    for key, value in (extra or {}).items():
+        yield f",{newline}{pad}{json.dumps(key)}{colon}{dump(value, 1)}"
+
+    yield newline + "}"
+
+
+def iter_playlist_jsonl_lines(
+    playlist: Mapping[str, Any],
+    tracks: Iterable[Mapping[str, Any]],
+    extra: Mapping[str, Any] | None = None,
+    compact: bool = False,
+) -> Iterator[str]:
+    """
+    Erzeugt eine JSON-Lines-Datei zeilenweise: Header (playlist + 'extra',
+    z. B. removed_tracks), danach ein Track pro Zeile.
+    """
+    def dump(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    header: Dict[str, Any] = {
+        "__format__": JSONL_FORMAT_ID,
+        "version": JSONL_FORMAT_VERSION,
+        "playlist": playlist,
+    }
+    header.update(extra or {})
+    yield dump(header) + "\n"
+
+    for track in tracks:
+        yield dump(_compact_track(track) if compact else track) + "\n"
+
+
+def write_playlist_file(
+    path: Path,
+    playlist: Mapping[str, Any],
+    tracks: Iterable[Mapping[str, Any]],
+    extra: Mapping[str, Any] | None = None,
+    compact: bool = False,
+) -> Path:
+    """
+    Schreibt eine Extended-Datei atomar (Temp-Datei + os.replace).
+
+    Das Format folgt der Endung (.json / .jsonl); endet 'path' auf .gz,
+    wird gzip-komprimiert geschrieben. Bei einem Fehler bleibt eine
+    bestehende Datei unverändert.
+    """
+    if playlist_file_format(path) == FORMAT_JSONL:
+        chunks = iter_playlist_jsonl_lines(playlist, tracks, extra, compact)
+    else:
+        chunks = iter_playlist_json_chunks(playlist, tracks, extra, compact)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    # mkstemp legt 0600 an – Exporte sollen wie bisher normal lesbar sein
+    os.chmod(tmp_path, 0o644)
+
+    try:
+        if path.suffix == ".gz":
+            handle: IO[str] = gzip.open(tmp_path, "wt", encoding="utf-8")
+        else:
+            handle = tmp_path.open("w", encoding="utf-8")
+        with handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return path
+
+
+def convert_playlist_file(
+    source: Path,
+    target: Path,
+    compact: bool = False,
+) -> Path:
+    """
+    Konvertiert eine Extended-Datei in das Format von 'target'
+    (JSON <-> JSON Lines, mit/ohne gzip). Die Quelle bleibt erhalten.
+    """
+    if source.resolve() == target.resolve():
+        raise ValueError("Quelle und Ziel der Konvertierung sind identisch.")
+
+    data = read_playlist_file(source)
+    extra = {k: v for k, v in data.items() if k not in ("playlist", "tracks")}
+    return write_playlist_file(
+        target,
+        data.get("playlist") or {},
+        data.get("tracks") or [],
+        extra=extra,
+        compact=compact,
+    )
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+from config import get_settings
+
+
+# ---------------------------------------------------------------------------
+# Prozessweiter Rate-Limiter für die Spotify Web API
+# ---------------------------------------------------------------------------
+#
+# Alle Web-API-Requests (Paging, Audio-Features, Album-/Artist-Lookups, auch
+# aus parallelen Exporten und der Async-Engine) holen sich vor dem Senden ein
+# Token aus demselben Token-Bucket:
+# - im Mittel max. SpotifyRateLimitPerSecond Requests pro Sekunde
+# - kurzfristig bis zu SpotifyRateLimitBurst Requests am Stück
+#
+# Kommt trotzdem ein 429 mit Retry-After, pausiert der Bucket für *alle*
+# Threads bis zum Ablauf der Wartezeit und halbiert die Rate (nicht unter
+# SpotifyRateLimitMinPerSecond). Jeder erfolgreiche Request hebt sie danach
+# schrittweise wieder auf den konfigurierten Wert an.
+
+# Faktor, um den die Rate nach einem 429 gesenkt wird
+THROTTLE_RATE_FACTOR = 0.5
+
+# Anteil der Basis-Rate, um den jeder erfolgreiche Request sie wieder anhebt
+RECOVERY_RATE_STEP = 0.02
+
+
+@dataclass
+class RateLimitStats:
+    """Zähler des Rate-Limiters für einen Lauf."""
+    waits: int = 0  # Requests, die auf ein Token warten mussten
+    wait_seconds: float = 0.0  # Summe der Wartezeiten aller Threads
+    throttle_events: int = 0  # 429-Antworten, die eine Pause ausgelöst haben
+    throttled_seconds: float = 0.0  # Dauer der globalen Pausen (Wanduhr)
+
+
+class TokenBucket:
+    """
+    Threadsicherer Token-Bucket: 'rate' Tokens pro Sekunde, max. 'burst'
+    angespart. rate <= 0 = unbegrenzt (acquire() kehrt sofort zurück).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int | None = None,
+        min_rate: float | None = None,
+    ) -> None:
+        self.base_rate = float(rate)
+        self.rate = self.base_rate
+        self.min_rate = min(
+            self.base_rate, float(min_rate if min_rate is not None else 1.0)
+        )
+        self.capacity = float(
+            burst if burst is not None and burst > 0 else max(1, int(rate))
+        )
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._stats = RateLimitStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.base_rate > 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Blockiert, bis ein Token frei ist (bzw. eine globale Pause vorbei ist).
+        Gibt die Wartezeit in Sekunden zurück.
+        """
+        if not self.enabled:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+        if waited > 0:
+            with self._lock:
+                self._stats.waits += 1
+                self._stats.wait_seconds += waited
+        return waited
+
+    def throttle(self, retry_after: float) -> None:
+        """
+        Reaktion auf ein 429: alle Threads pausieren 'retry_after' Sekunden,
+        danach läuft der Bucket leer und mit reduzierter Rate weiter.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            until = now + max(retry_after, 0.0)
+            if until > self._paused_until:
+                self._stats.throttled_seconds += until - max(now, self._paused_until)
+                self._paused_until = until
+
+            self._stats.throttle_events += 1
+            self.rate = max(self.min_rate, self.rate * THROTTLE_RATE_FACTOR)
+
+            # Nach der Pause nicht mit vollem Burst erneut ins Limit laufen
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+    def record_success(self) -> None:
+        """Hebt eine gedrosselte Rate schrittweise wieder an."""
+        if not self.enabled or self.rate >= self.base_rate:
+            return
+
+        with self._lock:
+            self.rate = min(
+                self.base_rate, self.rate + self.base_rate * RECOVERY_RATE_STEP
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Liefert eine Kopie der Zähler inkl. aktueller Rate."""
+        with self._lock:
+            stats: Dict[str, Any] = asdict(self._stats)
+            stats["current_rate"] = self.rate
+        return stats
+
+    def reset_stats(self) -> None:
+        """Setzt die Zähler zurück (die aktuelle Rate bleibt erhalten)."""
+        with self._lock:
+            self._stats = RateLimitStats()
+
+
+_limiter_lock = threading.Lock()
+_limiter: Optional[TokenBucket] = None
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Liefert den prozessweit geteilten Token-Bucket für die Web API."""
+    global _limiter
+
+    with _limiter_lock:
+        if _limiter is None:
+            settings = get_settings()
+            _limiter = TokenBucket(
+                settings.spotify_rate_limit_per_second,
+                settings.spotify_rate_limit_burst,
+                settings.spotify_rate_limit_min_per_second,
+            )
+        return _limiter
+
+
+def configure_rate_limiter(
+    rate: float,
+    burst: int | None = None,
+    min_rate: float | None = None,
+) -> TokenBucket:
+    """
+    Ersetzt den prozessweiten Token-Bucket (z. B. für Benchmarks gegen den
+    lokalen Stand-in-Server). Requests, die gerade warten, nutzen noch den alten.
+    """
+    global _limiter
+
+    settings = get_settings()
+    with _limiter_lock:
+        _limiter = TokenBucket(
+            rate,
+            burst if burst is not None else settings.spotify_rate_limit_burst,
+            min_rate if min_rate is not None else settings.spotify_rate_limit_min_per_second,
+        )
+        return _limiter
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """Zähler des prozessweiten Rate-Limiters."""
+    return get_rate_limiter().get_stats()
+
+
+def reset_rate_limit_stats() -> None:
+    """Setzt die Zähler des prozessweiten Rate-Limiters zurück."""
+    get_rate_limiter().reset_stats()
+
+
+def format_rate_limit_stats() -> str:
+    """Kompakte, einzeilige Darstellung der Limiter-Zähler für die CLI."""
+    limiter = get_rate_limiter()
+    if not limiter.enabled:
+        return "Limiter: aus"
+
+    stats = limiter.get_stats()
+    return (
+        f"Limiter: {stats['waits']}x gewartet ({stats['wait_seconds']:.1f}s) | "
+        f"Pausen: {stats['throttle_events']} ({stats['throttled_seconds']:.1f}s) | "
+        f"Rate: {stats['current_rate']:.1f}/s"
+    )
@@ -1,28 +1,198 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Optional
+import os
+import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
 
-from config import (
-    ALLOW_REENCODE_FOR_INCOMPATIBLE,
-    PREFERRED_HIGH_QUALITY_TARGET,
-    REMOVE_SOURCE_AFTER_REENCODE,
-)
+from config import get_settings
 from format_profiles import is_ext_compatible_with_active_profile
 
 
+# ---------------------------------------------------------------------------
+# Reencode-Scheduler
+# ---------------------------------------------------------------------------
+#
+# Alle Reencodes (Pipeline-Stufe von run-downloads, tag-playlist) laufen über
+# einen prozessweiten Scheduler statt im aufrufenden Thread:
+# - höchstens ReencodeWorkers ffmpeg-Prozesse gleichzeitig (0 = Anzahl
+#   CPU-Kerne), unabhängig von der Zahl der Download-Worker
+# - ffmpeg bekommt `-threads` (ReencodeFfmpegThreads, 0 = Kerne / Worker)
+#   und läuft mit `nice -n ReencodeNiceness`, damit Downloads und Tagging
+#   nicht ausgebremst werden
+# - Anfragen warten in der Queue des Schedulers; gemessen werden Wartezeit,
+#   ffmpeg-Laufzeit und Durchsatz (format_reencode_stats)
+#
+# ffmpeg ist selbst ein eigener Prozess – der Scheduler braucht daher nur
+# Threads, die auf ihren ffmpeg-Prozess warten.
+
+
+@dataclass
+class ReencodeStats:
+    """Zähler für einen Lauf."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    transcode_seconds: float = 0.0
+    input_bytes: int = 0
+
+
+_stats_lock = threading.Lock()
+_stats = ReencodeStats()
+
+
+def get_reencode_stats() -> Dict[str, float]:
+    """Liefert eine Kopie der Reencode-Zähler."""
+    with _stats_lock:
+        return asdict(_stats)
+
+
+def reset_reencode_stats() -> None:
+    """Setzt die Zähler zurück (z. B. zu Beginn von run-downloads)."""
+    global _stats
+
+    with _stats_lock:
+        _stats = ReencodeStats()
+
+
+def format_reencode_stats(wall_seconds: float | None = None) -> str:
+    """
+    Kompakte Darstellung der Zähler für die CLI. Mit 'wall_seconds'
+    (Laufzeit des Gesamtlaufs) zusätzlich der Durchsatz in Dateien/min.
+    """
+    stats = get_reencode_stats()
+    done = stats["completed"] + stats["failed"]
+    avg_wait = stats["queue_wait_seconds"] / done if done else 0.0
+    avg_transcode = stats["transcode_seconds"] / done if done else 0.0
+    line = (
+        f"Reencodes: {stats['completed']} ok, {stats['failed']} Fehler | "
+        f"Warten Ø {avg_wait:.1f} s (max {stats['max_queue_wait_seconds']:.1f} s) | "
+        f"ffmpeg Ø {avg_transcode:.1f} s"
+    )
+    if stats["transcode_seconds"] > 0:
+        mb_per_s = stats["input_bytes"] / 1_000_000 / stats["transcode_seconds"]
+        line += f" | {mb_per_s:.1f} MB/s pro ffmpeg"
+    if wall_seconds and done:
+        line += f" | {done / wall_seconds * 60:.1f} Dateien/min"
+    return line
+
+
+def resolve_reencode_workers(workers: int | None = None) -> int:
+    """Anzahl gleichzeitiger ffmpeg-Prozesse (ReencodeWorkers, 0 = CPU-Kerne)."""
+    if workers is None:
+        workers = get_settings().reencode_workers
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _ffmpeg_threads(workers: int) -> int:
+    threads = get_settings().reencode_ffmpeg_threads
+    if threads > 0:
+        return threads
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def _with_niceness(cmd: List[str]) -> List[str]:
+    """Stellt `nice -n <ReencodeNiceness>` voran (falls verfügbar und > 0)."""
+    niceness = get_settings().reencode_niceness
+    if niceness <= 0 or os.name != "posix" or shutil.which("nice") is None:
+        return cmd
+    return ["nice", "-n", str(niceness), *cmd]
+
+
+class ReencodeScheduler:
+    """
+    Thread-Pool mit 'workers' Plätzen für ffmpeg-Aufrufe. submit() stellt
+    einen Reencode in die Queue und liefert ein Future mit dem Zielpfad
+    (None bei Fehler).
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = max(1, workers)
+        self.ffmpeg_threads = _ffmpeg_threads(self.workers)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="reencode",
+        )
+
+    def submit(self, source: Path, target: Path, target_ext: str) -> Future[Optional[Path]]:
+        with _stats_lock:
+            _stats.submitted += 1
+        return self._pool.submit(
+            self._run, source, target, target_ext, time.perf_counter()
+        )
+
+    def _run(
+        self,
+        source: Path,
+        target: Path,
+        target_ext: str,
+        queued_at: float,
+    ) -> Optional[Path]:
+        started = time.perf_counter()
+        try:
+            input_bytes = source.stat().st_size
+        except OSError:
+            input_bytes = 0
+
+        ok = _run_ffmpeg(source, target, target_ext, self.ffmpeg_threads)
+
+        finished = time.perf_counter()
+        wait = started - queued_at
+        with _stats_lock:
+            if ok:
+                _stats.completed += 1
+            else:
+                _stats.failed += 1
+            _stats.queue_wait_seconds += wait
+            _stats.max_queue_wait_seconds = max(_stats.max_queue_wait_seconds, wait)
+            _stats.transcode_seconds += finished - started
+            _stats.input_bytes += input_bytes
+
+        return target if ok else None
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+_scheduler_lock = threading.Lock()
+_scheduler: Optional[ReencodeScheduler] = None
+
+
+def get_reencode_scheduler() -> ReencodeScheduler:
+    """
+    Prozessweiter Scheduler; wird neu angelegt, wenn sich ReencodeWorkers
+    (z. B. per `run-downloads --reencode-workers`) geändert hat.
+    """
+    global _scheduler
+
+    workers = resolve_reencode_workers()
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler.workers != workers:
+            if _scheduler is not None:
+                # laufende Reencodes des alten Schedulers dürfen fertig werden
+                _scheduler.shutdown(wait=False)
+            _scheduler = ReencodeScheduler(workers)
+        return _scheduler
+
+
 def should_reencode_file(path: Path) -> bool:
     """
     Entscheidet, ob eine Datei für das aktive DJ-Profil reencoded
     werden soll.
 
     Regeln:
-    - Reencode nur, wenn ALLOW_REENCODE_FOR_INCOMPATIBLE = True
+    - Reencode nur, wenn AllowReencodeForIncompatible = True
     - Reencode nur, wenn das aktuelle Format NICHT kompatibel ist
       (z. B. webm/opus im CDJ-Profil).
     """
-    if not ALLOW_REENCODE_FOR_INCOMPATIBLE:
+    if not get_settings().allow_reencode_for_incompatible:
         return False
 
     ext = path.suffix.lstrip(".").lower()
@@ -33,6 +203,7 @@ def build_ffmpeg_command(
     source: Path,
     target: Path,
     target_ext: str,
+    threads: int | None = None,
 ) -> list[str]:
     """
     Baut einen ffmpeg-Befehl für die Audio-Konvertierung.
@@ -40,35 +211,24 @@ def build_ffmpeg_command(
     Aktuell:
     - AIFF als bevorzugtes HQ-Format (pcm_s16le, 44.1 kHz, Stereo)
     - Keine Lautstärke-Normalisierung, kein weiteres Processing.
+    - threads: Wert für `-threads` (None = ffmpeg entscheidet)
     """
     target_ext = target_ext.lower()
 
+    cmd = [
+        "ffmpeg",
+        "-y",  # überschreiben ohne Rückfrage
+        "-i",
+        str(source),
+        "-vn",  # kein Video
+    ]
+    if threads:
+        cmd += ["-threads", str(threads)]
+
     # Wir könnten später pro Format unterschiedliche Parameter setzen.
-    if target_ext in ("aiff", "aif"):
+    if target_ext in ("aiff", "aif", "wav"):
         # Lossless PCM, 16 Bit, 44.1 kHz, Stereo – DJ- und DAW-tauglich
-        return [
-            "ffmpeg",
-            "-y",  # überschreiben ohne Rückfrage
-            "-i",
-            str(source),
-            "-vn",  # kein Video
-            "-acodec",
-            "pcm_s16le",
-            "-ar",
-            "44100",
-            "-ac",
-            "2",
-            str(target),
-        ]
-
-    if target_ext in ("wav",):
-        # Ähnlicher Ansatz, falls später WAV gewünscht ist
-        return [
-            "ffmpeg",
-            "-y",
-            "-i",
-            str(source),
-            "-vn",
+        return cmd + [
             "-acodec",
             "pcm_s16le",
             "-ar",
@@ -79,44 +239,20 @@ def build_ffmpeg_command(
         ]
 
     # Fallback: copy (für zukünftige Szenarien) – aktuell eher theoretisch
-    return [
-        "ffmpeg",
-        "-y",
-        "-i",
-        str(source),
-        "-vn",
+    return cmd + [
         "-acodec",
         "copy",
         str(target),
     ]
 
 
-def reencode_if_needed(downloaded: Path) -> Optional[Path]:
-    """
-    Führt – falls nötig und erlaubt – einen Reencode der Datei durch.
-
-    Ablauf:
-    - Wenn kein Reencode nötig -> None
-    - Wenn nötig:
-        - Zielendung aus PREFERRED_HIGH_QUALITY_TARGET (z. B. 'aiff')
-        - ffmpeg-Aufruf
-        - bei Erfolg: optional Quell-File löschen
-        - Rückgabe: Pfad zur neuen Datei
-    """
-    if not downloaded.exists():
-        return None
-
-    if not should_reencode_file(downloaded):
-        return None
-
-    target_ext = PREFERRED_HIGH_QUALITY_TARGET.lower().lstrip(".")
-    target_path = downloaded.with_suffix(f".{target_ext}")
-
-    cmd = build_ffmpeg_command(downloaded, target_path, target_ext)
+def _run_ffmpeg(source: Path, target: Path, target_ext: str, threads: int) -> bool:
+    """Führt ffmpeg aus (im Scheduler-Thread). True bei Erfolg."""
+    cmd = _with_niceness(build_ffmpeg_command(source, target, target_ext, threads))
 
     print(
-        f"[REENCODE] Starte HQ-Reencode für: {downloaded.name} "
-        f"-> {target_path.name}"
+        f"[REENCODE] Starte HQ-Reencode für: {source.name} "
+        f"-> {target.name}"
     )
     print(f"[REENCODE] ffmpeg: {' '.join(cmd)}")
 
@@ -132,24 +268,54 @@ def reencode_if_needed(downloaded: Path) -> Optional[Path]:
             "[REENCODE-ERROR] ffmpeg wurde nicht gefunden. "
             "Ist es im PATH installiert?"
         )
-        return None
+        return False
     except Exception as exc:  # noqa: BLE001
         print(f"[REENCODE-ERROR] Unerwarteter Fehler beim Reencode: {exc}")
-        return None
+        return False
 
     if result.returncode != 0:
         print(
             f"[REENCODE-ERROR] ffmpeg Rückgabecode {result.returncode} "
-            f"für Datei: {downloaded.name}"
+            f"für Datei: {source.name}"
         )
         if result.stderr:
             print("[REENCODE-ERROR] ffmpeg stderr:")
             print(result.stderr.strip())
+        return False
+
+    return True
+
+
+def reencode_if_needed(downloaded: Path) -> Optional[Path]:
+    """
+    Führt – falls nötig und erlaubt – einen Reencode der Datei durch.
+
+    Ablauf:
+    - Wenn kein Reencode nötig -> None
+    - Wenn nötig:
+        - Zielendung aus PreferredHighQualityTarget (z. B. 'aiff')
+        - ffmpeg-Aufruf über den ReencodeScheduler (blockiert, bis er
+          einen Platz hatte und fertig ist)
+        - bei Erfolg: optional Quell-File löschen
+        - Rückgabe: Pfad zur neuen Datei
+    """
+    if not downloaded.exists():
+        return None
+
+    if not should_reencode_file(downloaded):
+        return None
+
+    settings = get_settings()
+    target_ext = settings.preferred_high_quality_target.lower().lstrip(".")
+    target_path = downloaded.with_suffix(f".{target_ext}")
+
+    result = get_reencode_scheduler().submit(downloaded, target_path, target_ext).result()
+    if result is None:
         return None
 
     print(f"[REENCODE-OK] HQ-Datei erzeugt: {target_path.name}")
 
-    if REMOVE_SOURCE_AFTER_REENCODE:
+    if settings.remove_source_after_reencode:
         try:
             downloaded.unlink()
             print(f"[REENCODE] Quell-Datei entfernt: {downloaded.name}")
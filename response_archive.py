@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from config import DATA_DIR
+from util_files import atomic_write
+
+
+# ---------------------------------------------------------------------------
+# Archiv der Spotify-Antworten (Offline-Rebuild der Extended-JSON)
+# ---------------------------------------------------------------------------
+#
+# Ein Export mit Archiv legt die Rohdaten ab, aus denen die Extended-JSON
+# entsteht: Playlist-Objekt, Tracks (wie von der API geliefert, d. h. in der
+# Projektion EXTENDED_TRACK_FIELDS), Audio-Features sowie die Album-/Artist-
+# Lookups (ALBUM_/ARTIST_LOOKUP_FIELDS). `rebuild-extended` baut daraus die
+# Extended-JSON ohne Netzwerk neu (playlist_exporter.rebuild_extended_from_archive).
+#
+# Ablage unter data/archive:
+# - objects/<xx>/<sha256>.json.gz: inhaltsadressierte, gzip-komprimierte
+#   JSON-Objekte (gleicher Inhalt = gleiche Datei, wird nur einmal geschrieben)
+# - playlists/<playlist_id>.json: Manifest mit den Hashes
+#
+# Die Tracks werden in Blöcken zu ARCHIVE_CHUNK_SIZE (= eine API-Seite)
+# abgelegt, jeweils zusammen mit den Features/Alben/Artists genau dieser
+# Tracks. Unveränderte Seiten teilen sich so zwischen Exporten dieselben
+# Objekte.
+
+ARCHIVE_DIR = DATA_DIR / "archive"
+OBJECTS_DIR = ARCHIVE_DIR / "objects"
+MANIFESTS_DIR = ARCHIVE_DIR / "playlists"
+
+ARCHIVE_FORMAT_ID = "trackbridge-response-archive"
+ARCHIVE_FORMAT_VERSION = 1
+
+ARCHIVE_CHUNK_SIZE = 100
+
+
+@dataclass
+class ArchivedPlaylist:
+    """Aus dem Archiv geladene Rohdaten einer Playlist."""
+    playlist_id: str
+    manifest: Dict[str, Any]
+    playlist: Dict[str, Any]
+    tracks: List[Dict[str, Any]] = field(default_factory=list)
+    audio_features_by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    albums_by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    artists_by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------------------
+# Objekt-Store
+# ---------------------------------------------------------------------------
+
+def _object_path(digest: str) -> Path:
+    return OBJECTS_DIR / digest[:2] / f"{digest}.json.gz"
+
+
+def put_object(obj: Any) -> str:
+    """
+    Legt 'obj' als JSON ab und gibt den SHA-256 des (unkomprimierten,
+    kanonischen) JSON zurück. Bereits vorhandene Objekte werden nicht
+    neu geschrieben.
+    """
+    raw = json.dumps(
+        obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    ).encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+
+    path = _object_path(digest)
+    if not path.exists():
+        # mtime=0: gleiche Objekte ergeben byte-identische Dateien
+        atomic_write(path, gzip.compress(raw, compresslevel=6, mtime=0))
+    return digest
+
+
+def get_object(digest: str) -> Any:
+    """Liest ein Objekt anhand seines Hashes (FileNotFoundError, wenn es fehlt)."""
+    with gzip.open(_object_path(digest), "rb") as f:
+        return json.loads(f.read().decode("utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# Manifeste
+# ---------------------------------------------------------------------------
+
+def _manifest_path(playlist_id: str) -> Path:
+    return MANIFESTS_DIR / f"{playlist_id}.json"
+
+
+def archive_playlist(
+    playlist_id: str,
+    playlist: Mapping[str, Any],
+    tracks: List[Mapping[str, Any]],
+    audio_features_by_id: Mapping[str, Mapping[str, Any]],
+    albums_by_id: Mapping[str, Mapping[str, Any]],
+    artists_by_id: Mapping[str, Mapping[str, Any]],
+    fields: str,
+    track_limit: int | None = None,
+    extra: Optional[Mapping[str, Any]] = None,
+) -> Path:
+    """
+    Archiviert die Rohdaten eines Exports und ersetzt das Manifest der
+    Playlist. 'playlist' ist das Playlist-Objekt ohne Tracks, 'fields' der
+    beim Abruf verwendete Track-'fields'-Filter.
+    """
+    chunks: List[str] = []
+    for start in range(0, len(tracks), ARCHIVE_CHUNK_SIZE):
+        chunk_tracks = list(tracks[start : start + ARCHIVE_CHUNK_SIZE])
+        track_ids = [t.get("id") for t in chunk_tracks if t.get("id")]
+        album_ids = {(t.get("album") or {}).get("id") for t in chunk_tracks}
+        artist_ids = {
+            a.get("id") for t in chunk_tracks for a in t.get("artists") or [] if a
+        }
+        chunks.append(
+            put_object(
+                {
+                    "tracks": chunk_tracks,
+                    "audio_features": {
+                        tid: audio_features_by_id[tid]
+                        for tid in track_ids
+                        if tid in audio_features_by_id
+                    },
+                    "albums": {
+                        aid: albums_by_id[aid] for aid in album_ids if aid in albums_by_id
+                    },
+                    "artists": {
+                        aid: artists_by_id[aid] for aid in artist_ids if aid in artists_by_id
+                    },
+                }
+            )
+        )
+
+    manifest: Dict[str, Any] = {
+        "__format__": ARCHIVE_FORMAT_ID,
+        "version": ARCHIVE_FORMAT_VERSION,
+        "playlist_id": playlist_id,
+        "snapshot_id": playlist.get("snapshot_id"),
+        "archived_at": datetime.now(timezone.utc).isoformat(),
+        "track_count": len(tracks),
+        "track_limit": track_limit,
+        "fields": fields,
+        "playlist": put_object(dict(playlist)),
+        "chunks": chunks,
+        "extra": put_object(dict(extra)) if extra else None,
+    }
+
+    path = _manifest_path(playlist_id)
+    atomic_write(
+        path, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+    )
+    return path
+
+
+def read_manifest(playlist_id: str) -> Optional[Dict[str, Any]]:
+    """Manifest einer Playlist oder None, wenn (noch) nichts archiviert ist."""
+    path = _manifest_path(playlist_id)
+    if not path.exists():
+        return None
+
+    with path.open("r", encoding="utf-8") as f:
+        manifest: Dict[str, Any] = json.load(f)
+    if manifest.get("__format__") != ARCHIVE_FORMAT_ID:
+        raise ValueError(f"Kein TrackBridge-Archiv-Manifest: {path}")
+    if int(manifest.get("version") or 0) > ARCHIVE_FORMAT_VERSION:
+        raise ValueError(
+            f"Archiv-Version {manifest.get('version')} wird nicht unterstützt: {path}"
+        )
+    return manifest
+
+
+def load_archived_playlist(playlist_id: str) -> Optional[ArchivedPlaylist]:
+    """Lädt alle archivierten Rohdaten einer Playlist (None ohne Archiv)."""
+    manifest = read_manifest(playlist_id)
+    if manifest is None:
+        return None
+
+    archived = ArchivedPlaylist(
+        playlist_id=playlist_id,
+        manifest=manifest,
+        playlist=get_object(manifest["playlist"]),
+    )
+    for digest in manifest.get("chunks") or []:
+        chunk = get_object(digest)
+        archived.tracks.extend(chunk.get("tracks") or [])
+        archived.audio_features_by_id.update(chunk.get("audio_features") or {})
+        archived.albums_by_id.update(chunk.get("albums") or {})
+        archived.artists_by_id.update(chunk.get("artists") or {})
+    if manifest.get("extra"):
+        archived.extra = get_object(manifest["extra"])
+    return archived
+
+
+def list_archived_playlists() -> List[str]:
+    """IDs aller Playlists mit Manifest (sortiert)."""
+    if not MANIFESTS_DIR.exists():
+        return []
+    return sorted(p.stem for p in MANIFESTS_DIR.glob("*.json"))
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import subprocess
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from config import DATA_DIR, get_settings
+from sqlite_cache import CacheDatabase, StatsCounter
+from ytdlp_engine import is_available
+
+if TYPE_CHECKING:
+    from yt_dlp_runner import DownloadJob
+
+
+# ---------------------------------------------------------------------------
+# Suchauflösung: "ytsearch1:Artist - Title" -> konkretes Video
+# ---------------------------------------------------------------------------
+#
+# Ohne diese Stufe sucht yt-dlp bei jedem Download, jedem Retry und jedem
+# erneuten Lauf neu – derselbe Track in zehn Playlists also zehnmal.
+# resolve_jobs() löst die Suchanfragen vor dem Download auf:
+# - nur Metadaten (extract_flat, kein Format-Lookup, kein Download)
+# - begrenzt parallel (SearchResolveWorkers)
+# - Ergebnis in data/search_cache.db, Schlüssel = (Spotify-Track-ID,
+#   normalisierte Suchanfrage); "nichts gefunden" als negativer Eintrag mit
+#   SearchCacheNegativeTtlHours
+#
+# Danach lädt run-downloads direkt über die Video-URL (DownloadJob.resolved_url).
+# Schlägt ein Download mit aufgelöster URL fehl, verwirft der Runner den
+# Eintrag (forget_resolution) und sucht beim nächsten Versuch wieder.
+#
+# Gesucht wird mit dem Python-Paket yt_dlp (eine YoutubeDL-Instanz pro
+# Thread), ohne Paket mit `yt-dlp --flat-playlist --dump-single-json`.
+
+DB_PATH = DATA_DIR / "search_cache.db"
+
+SEARCH_PREFIX = "ytsearch1:"
+
+_thread_local = threading.local()
+
+
+class ResolveError(Exception):
+    """Suche fehlgeschlagen (Netzwerk, yt-dlp fehlt, ...) – wird nicht gecacht."""
+
+
+@dataclass
+class Resolution:
+    """Aufgelöstes Suchergebnis eines Tracks."""
+    video_id: str
+    url: str
+    title: str | None = None
+    duration: float | None = None
+
+
+@dataclass
+class ResolveStats:
+    """Zähler für einen Lauf."""
+    cached: int = 0  # Treffer aus dem Cache
+    negative_cached: int = 0  # "nichts gefunden" aus dem Cache
+    searched: int = 0  # tatsächlich gesucht
+    found: int = 0
+    not_found: int = 0
+    failed: int = 0  # Suche fehlgeschlagen, Job lädt weiter per Suchanfrage
+
+
+_stats = StatsCounter(ResolveStats)
+
+
+def get_resolve_stats() -> Dict[str, int]:
+    """Liefert eine Kopie der Zähler."""
+    return _stats.get()
+
+
+def reset_resolve_stats() -> None:
+    """Setzt die Zähler zurück (zu Beginn von resolve_jobs)."""
+    _stats.reset()
+
+
+def format_resolve_stats() -> str:
+    """Kompakte, einzeilige Darstellung der Zähler für die CLI."""
+    stats = get_resolve_stats()
+    return (
+        f"Cache: {stats['cached']} (+{stats['negative_cached']} ohne Treffer) | "
+        f"Gesucht: {stats['searched']} | Gefunden: {stats['found']} | "
+        f"Nicht gefunden: {stats['not_found']} | Fehler: {stats['failed']}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Schlüssel
+# ---------------------------------------------------------------------------
+
+def normalize_query(query: str) -> str:
+    """
+    Normalisierte Suchanfrage als Cache-Schlüssel: ohne 'ytsearch1:'-Präfix,
+    Unicode NFKC, klein geschrieben, Leerraum zusammengefasst.
+    """
+    if query.startswith(SEARCH_PREFIX):
+        query = query[len(SEARCH_PREFIX):]
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def _cache_key(job: "DownloadJob") -> Tuple[str, str]:
+    return job.spotify_track_id or "", normalize_query(job.search_query)
+
+
+# ---------------------------------------------------------------------------
+# SQLite-Helfer
+# ---------------------------------------------------------------------------
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Legt die Tabelle an (idempotent)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS resolutions (
+            spotify_track_id  TEXT NOT NULL,
+            query             TEXT NOT NULL,
+            video_id          TEXT,
+            url               TEXT,
+            title             TEXT,
+            duration          REAL,
+            resolved_at       REAL NOT NULL,
+            expires_at        REAL NOT NULL,
+            PRIMARY KEY (spotify_track_id, query)
+        );
+        """
+    )
+
+
+_db = CacheDatabase(DB_PATH, _init_schema)
+
+
+def _read_cached(
+    keys: Iterable[Tuple[str, str]],
+) -> Dict[Tuple[str, str], Optional[Resolution]]:
+    """
+    Gültige Cache-Einträge zu 'keys' (None = negativer Eintrag).
+    Keys ohne gültigen Eintrag fehlen im Ergebnis.
+    """
+    wanted = list(dict.fromkeys(keys))
+    if not wanted:
+        return {}
+
+    now = time.time()
+    found: Dict[Tuple[str, str], Optional[Resolution]] = {}
+    try:
+        with _db.connect() as conn:
+            for key in wanted:
+                row = conn.execute(
+                    """
+                    SELECT video_id, url, title, duration FROM resolutions
+                    WHERE spotify_track_id = ? AND query = ? AND expires_at > ?;
+                    """,
+                    (*key, now),
+                ).fetchone()
+                if row is None:
+                    continue
+                video_id, url, title, duration = row
+                found[key] = Resolution(video_id, url, title, duration) if video_id else None
+    except sqlite3.Error as exc:
+        print(f"[RESOLVE-WARN] Such-Cache nicht lesbar: {exc}")
+        return {}
+
+    return found
+
+
+def _store(key: Tuple[str, str], resolution: Optional[Resolution]) -> None:
+    settings = get_settings()
+    now = time.time()
+    if resolution is None:
+        expires_at = now + settings.search_cache_negative_ttl_hours * 3600
+        row = (*key, None, None, None, None, now, expires_at)
+    else:
+        row = (
+            *key,
+            resolution.video_id,
+            resolution.url,
+            resolution.title,
+            resolution.duration,
+            now,
+            now + settings.search_cache_ttl_days * 86400,
+        )
+
+    try:
+        with _db.connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO resolutions
+                    (spotify_track_id, query, video_id, url, title, duration,
+                     resolved_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+                """,
+                row,
+            )
+    except sqlite3.Error as exc:
+        print(f"[RESOLVE-WARN] Such-Cache nicht beschreibbar: {exc}")
+
+
+def forget_resolution(job: "DownloadJob") -> None:
+    """Löscht den Cache-Eintrag eines Jobs (z. B. Video nicht mehr ladbar)."""
+    try:
+        with _db.connect() as conn:
+            conn.execute(
+                "DELETE FROM resolutions WHERE spotify_track_id = ? AND query = ?;",
+                _cache_key(job),
+            )
+    except sqlite3.Error as exc:
+        print(f"[RESOLVE-WARN] Such-Cache nicht beschreibbar: {exc}")
+
+
+# ---------------------------------------------------------------------------
+# Suche (nur Metadaten)
+# ---------------------------------------------------------------------------
+
+def _entry_to_resolution(entry: Dict[str, Any]) -> Optional[Resolution]:
+    video_id = entry.get("id")
+    if not video_id:
+        return None
+    url = entry.get("webpage_url") or entry.get("url")
+    if not url or not str(url).startswith("http"):
+        url = f"https://www.youtube.com/watch?v={video_id}"
+    return Resolution(
+        video_id=video_id,
+        url=url,
+        title=entry.get("title"),
+        duration=entry.get("duration"),
+    )
+
+
+def _first_entry(info: Optional[Dict[str, Any]]) -> Optional[Resolution]:
+    entries = (info or {}).get("entries") or []
+    for entry in entries:
+        if entry:
+            return _entry_to_resolution(entry)
+    return None
+
+
+def _thread_ydl() -> Any:
+    """Eine YoutubeDL-Instanz pro Resolver-Thread (Extractors bleiben geladen)."""
+    ydl = getattr(_thread_local, "ydl", None)
+    if ydl is None:
+        from yt_dlp import YoutubeDL
+
+        ydl = YoutubeDL(
+            {
+                "quiet": True,
+                "no_warnings": True,
+                "noprogress": True,
+                "extract_flat": True,
+                "noplaylist": True,
+            }
+        )
+        _thread_local.ydl = ydl
+    return ydl
+
+
+def _search_with_library(query: str) -> Optional[Resolution]:
+    from yt_dlp.utils import DownloadError
+
+    try:
+        info = _thread_ydl().extract_info(query, download=False)
+        return _first_entry(info)
+    except DownloadError as exc:
+        raise ResolveError(str(exc)) from exc
+    except Exception as exc:  # noqa: BLE001
+        # Unerwartetes Suchergebnis o. Ä.: Job lädt weiter per Suchanfrage
+        raise ResolveError(f"{type(exc).__name__}: {exc}") from exc
+
+
+def _search_with_subprocess(query: str) -> Optional[Resolution]:
+    cmd = ["yt-dlp", "--flat-playlist", "--dump-single-json", "--no-warnings", query]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    except FileNotFoundError as exc:
+        raise ResolveError("yt-dlp wurde nicht gefunden. Ist es im PATH installiert?") from exc
+
+    if result.returncode != 0:
+        raise ResolveError(result.stderr.strip() or f"rc={result.returncode}")
+    try:
+        return _first_entry(json.loads(result.stdout))
+    except ValueError as exc:
+        raise ResolveError(f"Unerwartete Ausgabe von yt-dlp: {exc}") from exc
+
+
+def search(query: str) -> Optional[Resolution]:
+    """
+    Sucht 'query' (z. B. "ytsearch1:Artist - Title") ohne Download.
+    None = kein Treffer; ResolveError bei Fehlern.
+    """
+    if is_available():
+        return _search_with_library(query)
+    return _search_with_subprocess(query)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def _apply(job: "DownloadJob", resolution: Optional[Resolution]) -> None:
+    if resolution is not None:
+        job.video_id = resolution.video_id
+        job.resolved_url = resolution.url
+
+
+def resolve_jobs(
+    jobs: List["DownloadJob"],
+    search_missing: bool = True,
+    workers: int | None = None,
+) -> Dict[str, int]:
+    """
+    Setzt video_id/resolved_url der Jobs aus dem Cache und sucht (bei
+    search_missing) fehlende Einträge mit bis zu 'workers' Threads
+    (Default: SearchResolveWorkers). Jobs ohne Treffer behalten ihre
+    Suchanfrage. Gibt die Zähler des Laufs zurück.
+    """
+    reset_resolve_stats()
+    if not get_settings().search_resolve_enabled or not jobs:
+        return get_resolve_stats()
+
+    cached = _read_cached(_cache_key(job) for job in jobs)
+
+    pending: Dict[Tuple[str, str], List["DownloadJob"]] = {}
+    for job in jobs:
+        key = _cache_key(job)
+        if key in cached:
+            resolution = cached[key]
+            _stats.count(cached=int(resolution is not None), negative_cached=int(resolution is None))
+            _apply(job, resolution)
+        else:
+            # gleiche Anfrage mehrfach in der Playlist: nur einmal suchen
+            pending.setdefault(key, []).append(job)
+
+    if not search_missing or not pending:
+        return get_resolve_stats()
+
+    def resolve_one(item: Tuple[Tuple[str, str], List["DownloadJob"]]) -> None:
+        key, key_jobs = item
+        _stats.count(searched=1)
+        try:
+            resolution = search(key_jobs[0].search_query)
+        except ResolveError as exc:
+            _stats.count(failed=1)
+            print(
+                f"[RESOLVE-WARN] Suche fehlgeschlagen für "
+                f"{key_jobs[0].primary_artist} - {key_jobs[0].title}: {exc}"
+            )
+            return
+
+        _stats.count(found=int(resolution is not None), not_found=int(resolution is None))
+        _store(key, resolution)
+        for job in key_jobs:
+            _apply(job, resolution)
+
+    worker_count = workers if workers is not None else get_settings().search_resolve_workers
+    worker_count = max(1, min(worker_count, len(pending)))
+    print(
+        f"[RESOLVE] Suche {len(pending)} Track(s) auf YouTube "
+        f"({worker_count} parallel, nur Metadaten) ..."
+    )
+    if worker_count <= 1:
+        for item in pending.items():
+            resolve_one(item)
+    else:
+        with ThreadPoolExecutor(max_workers=worker_count) as pool:
+            list(pool.map(resolve_one, pending.items()))
+
+    return get_resolve_stats()
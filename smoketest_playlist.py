@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
 from typing import Any
 
-import requests
+from config import SPOTIFY_API_BASE_URL
+from spotify_client import get_access_token, spotify_get, SpotifyAuthError
 
-from spotify_client import get_access_token, SpotifyAuthError
 
-
-SPOTIFY_PLAYLIST_URL = "https://api.spotify.com/v1/playlists/4Bo5jqVdZTOQiXiY4PiiWC"
+# Basis-URL aus der Config (SpotifyApiBaseUrl / SPOTIFY_API_BASE_URL), damit
+# der Smoketest auch gegen benchmarks.spotify_standin läuft
+SPOTIFY_PLAYLIST_URL = f"{SPOTIFY_API_BASE_URL}/playlists/{{playlist_id}}"
 
 
 def fetch_playlist_tracks(access_token: str, playlist_id: str) -> list[dict[str, Any]]:
@@ -18,7 +20,6 @@ def fetch_playlist_tracks(access_token: str, playlist_id: str) -> list[dict[str,
 
     Rückgabe: Liste von Dicts mit artist, title, spotify_url.
     """
-    headers = {"Authorization": f"Bearer {access_token}"}
     url = SPOTIFY_PLAYLIST_URL.format(playlist_id=playlist_id)
 
     tracks: list[dict[str, Any]] = []
@@ -29,11 +30,14 @@ def fetch_playlist_tracks(access_token: str, playlist_id: str) -> list[dict[str,
     }
 
     while url:
-        resp = requests.get(url, headers=headers, params=params, timeout=10)
+        resp = spotify_get(url, params=params, access_token=access_token)
         resp.raise_for_status()
         data = resp.json()
 
-        items = data.get("tracks", {}).get("items", [])
+        # erste Antwort = Playlist-Objekt, 'next'-Seiten = reine Track-Seiten
+        page = data.get("tracks", data)
+
+        items = page.get("items", [])
         for item in items:
             track = item.get("track") or {}
             name = track.get("name") or ""
@@ -50,7 +54,7 @@ def fetch_playlist_tracks(access_token: str, playlist_id: str) -> list[dict[str,
             )
 
         # nächste Seite
-        next_url = data.get("tracks", {}).get("next")
+        next_url = page.get("next")
         url = next_url
         params = None  # ab jetzt steckt alles in next-URL
 
@@ -88,8 +92,8 @@ def run_smoketest(playlist_id: str) -> None:
 
 
 if __name__ == "__main__":
-    # 👉 HIER deine Test-Playlist-ID eintragen
-    TEST_PLAYLIST_ID = "4Bo5jqVdZTOQiXiY4PiiWC"
+    # 👉 Playlist-ID als Argument übergeben oder HIER eintragen
+    TEST_PLAYLIST_ID = sys.argv[1] if len(sys.argv) > 1 else "4Bo5jqVdZTOQiXiY4PiiWC"
 
     if TEST_PLAYLIST_ID == "DEINE_PLAYLIST_ID_HIER":
         print(
@@ -1,21 +1,293 @@
+from __future__ import annotations
+
 import base64
-from typing import Optional
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from collections.abc import Generator
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    DATA_DIR,
+    SPOTIFY_CLIENT_ID,
+    SPOTIFY_CLIENT_SECRET,
+    SPOTIFY_TOKEN_URL,
+    get_settings,
+)
+import etag_cache
+from rate_limiter import (
+    TokenBucket,
+    format_rate_limit_stats,
+    get_rate_limiter,
+    reset_rate_limit_stats,
+)
+from util_files import atomic_write, file_lock
+
+TOKEN_URL = SPOTIFY_TOKEN_URL
+
+# Token-Cache auf Platte (wird von allen Prozessen gemeinsam genutzt)
+TOKEN_CACHE_PATH = DATA_DIR / "spotify_token.json"
+TOKEN_LOCK_PATH = DATA_DIR / "spotify_token.lock"
+
+# So viele Sekunden vor Ablauf wird das Token bereits erneuert
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# Lock-Dateien, die älter sind, gelten als verwaist (abgestürzter Prozess)
+TOKEN_LOCK_STALE_SECONDS = 30
+
 
-from config import SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET
+# Statuscodes, bei denen ein Request automatisch wiederholt wird
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
-TOKEN_URL = "https://accounts.spotify.com/api/token"
+# Obergrenze für einzelne Wartezeiten (auch bei sehr großem Retry-After)
+MAX_BACKOFF_SECONDS = 60.0
 
 
 class SpotifyAuthError(Exception):
     """Fehler bei der Spotify-Authentifizierung."""
 
 
-def get_access_token() -> str:
+# ---------------------------------------------------------------------------
+# HTTP-Layer: gemeinsame Session, Retries, Statistik
+# ---------------------------------------------------------------------------
+
+@dataclass
+class HttpStats:
     """
-    Holt ein Access-Token via Client-Credentials-Flow.
-    Wirft SpotifyAuthError, wenn Env-Variablen fehlen oder keine Antwort kommt.
+    Zähler für den HTTP-Verkehr eines Laufs (z. B. eines Exports).
+    """
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0  # Anzahl 429-Antworten
+    errors: int = 0  # Verbindungsfehler / Timeouts
+    bytes_received: int = 0
+
+
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+_stats_lock = threading.Lock()
+_stats = HttpStats()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Liefert die prozessweit geteilte requests.Session.
+
+    Die Session hält Verbindungen per Keep-Alive offen; die Pool-Größe
+    kommt aus SpotifyHttpPoolSize (sollte >= Anzahl paralleler Worker sein).
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            pool_size = get_settings().spotify_http_pool_size
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _count(**deltas: int) -> None:
+    """Erhöht die HTTP-Zähler threadsicher."""
+    with _stats_lock:
+        for name, delta in deltas.items():
+            setattr(_stats, name, getattr(_stats, name) + delta)
+
+
+def get_http_stats() -> Dict[str, int]:
+    """Liefert eine Kopie der aktuellen HTTP-Zähler."""
+    with _stats_lock:
+        return asdict(_stats)
+
+
+def reset_http_stats() -> None:
+    """Setzt die HTTP-Zähler zurück (z. B. zu Beginn eines Exports)."""
+    global _stats
+
+    with _stats_lock:
+        _stats = HttpStats()
+    reset_rate_limit_stats()
+    etag_cache.reset_etag_stats()
+
+
+def format_http_stats() -> str:
+    """Kompakte, einzeilige Darstellung der HTTP-Zähler für die CLI."""
+    stats = get_http_stats()
+    return (
+        f"Requests: {stats['requests']} | Retries: {stats['retries']} | "
+        f"429: {stats['throttled']} | Fehler: {stats['errors']} | "
+        f"Daten: {stats['bytes_received'] / 1024:.1f} KiB | "
+        f"{format_rate_limit_stats()}"
+    )
+
+
+def _retry_delay(attempt: int, resp: Optional[requests.Response]) -> float:
+    """
+    Wartezeit vor dem nächsten Versuch.
+
+    - Retry-After (Sekunden) aus der Antwort hat Vorrang
+    - sonst exponentieller Backoff mit etwas Jitter
+    """
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), MAX_BACKOFF_SECONDS)
+            except ValueError:
+                pass
+
+    backoff = get_settings().spotify_http_backoff_seconds
+    delay = backoff * (2 ** attempt)
+    delay += random.uniform(0, backoff)
+    return min(delay, MAX_BACKOFF_SECONDS)
+
+
+def _send_with_retries(
+    method: str,
+    url: str,
+    limiter: Optional[TokenBucket] = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """
+    Schickt einen Request über die gemeinsame Session.
+
+    Wiederholt bei 429/5xx sowie Verbindungsfehlern/Timeouts bis zu
+    SpotifyHttpMaxRetries-mal. Nach dem letzten Versuch wird die letzte
+    Response zurückgegeben bzw. die letzte Exception weitergereicht.
+
+    Mit 'limiter' holt jeder Versuch vorher ein Token aus dem Bucket; ein 429
+    pausiert dann den ganzen Bucket (alle Threads) statt nur diesen Request.
+    """
+    session = get_http_session()
+    settings = get_settings()
+    max_retries = settings.spotify_http_max_retries
+    kwargs.setdefault("timeout", settings.spotify_http_timeout)
+
+    attempt = 0
+    while True:
+        resp: Optional[requests.Response] = None
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            _count(requests=1)
+            resp = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            _count(errors=1)
+            if attempt >= max_retries:
+                raise
+            print(f"[HTTP] Verbindungsfehler, neuer Versuch: {exc}")
+        else:
+            _count(bytes_received=len(resp.content))
+            if resp.status_code == 429:
+                _count(throttled=1)
+            elif limiter is not None and resp.status_code < 500:
+                limiter.record_success()
+            if (
+                resp.status_code not in RETRYABLE_STATUS_CODES
+                or attempt >= max_retries
+            ):
+                return resp
+
+        delay = _retry_delay(attempt, resp)
+        if resp is not None:
+            print(
+                f"[HTTP] Status {resp.status_code} – neuer Versuch "
+                f"in {delay:.1f}s ({attempt + 1}/{max_retries})"
+            )
+        _count(retries=1)
+        if (
+            limiter is not None
+            and limiter.enabled
+            and resp is not None
+            and resp.status_code == 429
+        ):
+            # Wartezeit übernimmt acquire() im nächsten Durchlauf
+            limiter.throttle(delay)
+        else:
+            time.sleep(delay)
+        attempt += 1
+
+
+# Prozessweiter Zustand: zuletzt bekanntes Token + Ablaufzeitpunkt (epoch)
+_token_lock = threading.Lock()
+_cached_token: Optional[Dict[str, Any]] = None
+
+# Tokens, die seit dem letzten neu geholten Token mit 401 abgelehnt wurden
+# (werden nicht mehr verwendet; geleert, sobald ein neues Token vorliegt)
+_rejected_tokens: set[str] = set()
+
+
+# ---------------------------------------------------------------------------
+# Token-Cache (Platte + Prozess)
+# ---------------------------------------------------------------------------
+
+def _is_token_valid(entry: Optional[Dict[str, Any]]) -> bool:
+    """
+    True, wenn das Cache-Objekt ein Token enthält, das noch länger als
+    TOKEN_REFRESH_MARGIN_SECONDS gültig ist.
+    """
+    if not entry or not entry.get("access_token"):
+        return False
+    try:
+        expires_at = float(entry.get("expires_at", 0))
+    except (TypeError, ValueError):
+        return False
+    return time.time() < expires_at - TOKEN_REFRESH_MARGIN_SECONDS
+
+
+def _read_token_cache() -> Optional[Dict[str, Any]]:
+    """
+    Liest das gecachte Token aus TOKEN_CACHE_PATH.
+
+    Der Cache ist an die Client-ID gebunden, damit ein Wechsel der
+    Credentials nicht mit einem fremden Token weiterarbeitet.
+    """
+    try:
+        data = json.loads(TOKEN_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get("client_id") != SPOTIFY_CLIENT_ID:
+        return None
+    return data
+
+
+def _write_token_cache(entry: Dict[str, Any]) -> None:
+    """
+    Schreibt den Token-Cache atomar (util_files.atomic_write), damit parallel
+    laufende Prozesse nie eine halb geschriebene Datei lesen.
+    """
+    try:
+        atomic_write(TOKEN_CACHE_PATH, json.dumps(entry).encode("utf-8"))
+    except OSError as exc:
+        print(f"[WARN] Token-Cache konnte nicht geschrieben werden: {exc}")
+
+
+@contextmanager
+def _token_file_lock(timeout: float = 15.0) -> Generator[None, None, None]:
+    """
+    Verhindert über eine Lock-Datei (util_files.file_lock), dass mehrere
+    Prozesse gleichzeitig ein neues Token holen. Gelingt der Lock nicht
+    innerhalb von 'timeout', wird ohne Lock weitergemacht – ein doppelt
+    geholtes Token ist harmlos.
+    """
+    with file_lock(TOKEN_LOCK_PATH, timeout, TOKEN_LOCK_STALE_SECONDS):
+        yield
+
+
+def _request_new_token() -> Dict[str, Any]:
+    """
+    Holt ein neues Access-Token via Client-Credentials-Flow und liefert
+    den Cache-Eintrag { access_token, expires_at, client_id }.
     """
     if not SPOTIFY_CLIENT_ID or not SPOTIFY_CLIENT_SECRET:
         raise SpotifyAuthError(
@@ -32,7 +304,7 @@ def get_access_token() -> str:
     }
     data = {"grant_type": "client_credentials"}
 
-    resp = requests.post(TOKEN_URL, headers=headers, data=data, timeout=10)
+    resp = _send_with_retries("POST", TOKEN_URL, headers=headers, data=data)
     resp.raise_for_status()
 
     payload = resp.json()
@@ -41,4 +313,154 @@ def get_access_token() -> str:
     if not token:
         raise SpotifyAuthError("Kein access_token in der Spotify-Antwort gefunden.")
 
-    return token
+    try:
+        expires_in = int(payload.get("expires_in", 3600))
+    except (TypeError, ValueError):
+        expires_in = 3600
+
+    return {
+        "access_token": token,
+        "expires_at": time.time() + expires_in,
+        "client_id": SPOTIFY_CLIENT_ID,
+    }
+
+
+def get_access_token(force_refresh: bool = False) -> str:
+    """
+    Liefert ein gültiges Access-Token (Client-Credentials-Flow).
+
+    Reihenfolge:
+    1. Prozess-Cache
+    2. Token-Cache auf Platte (data/spotify_token.json)
+    3. Neues Token von Spotify (wird anschließend in beide Caches geschrieben)
+
+    Ein Token wird TOKEN_REFRESH_MARGIN_SECONDS vor Ablauf erneuert.
+    Mit force_refresh=True wird immer ein neues Token geholt (z. B. nach 401).
+
+    Wirft SpotifyAuthError, wenn Env-Variablen fehlen oder keine Antwort kommt.
+    """
+    global _cached_token
+
+    with _token_lock:
+        if not force_refresh and _is_token_valid(_cached_token):
+            assert _cached_token is not None
+            return str(_cached_token["access_token"])
+
+        with _token_file_lock():
+            # Ein anderer Prozess hat evtl. gerade erneuert -> erst Platte prüfen
+            disk_entry = _read_token_cache()
+            if _is_token_valid(disk_entry):
+                assert disk_entry is not None
+                disk_token = disk_entry["access_token"]
+                stale_token = (_cached_token or {}).get("access_token")
+                usable = disk_token not in _rejected_tokens and (
+                    not force_refresh or disk_token != stale_token
+                )
+                if usable:
+                    _cached_token = disk_entry
+                    return str(disk_token)
+
+            entry = _request_new_token()
+            _write_token_cache(entry)
+            _cached_token = entry
+            # Abgelehnte Tokens stehen nicht mehr im Cache – nicht endlos merken
+            _rejected_tokens.clear()
+            return str(entry["access_token"])
+
+
+def invalidate_access_token(token: str | None = None) -> None:
+    """
+    Verwirft das gecachte Token (Prozess + Platte).
+
+    Wenn 'token' angegeben ist, wird nur verworfen, falls der Cache noch
+    genau dieses Token enthält – so überschreibt ein Thread nicht ein
+    Token, das ein anderer Thread gerade frisch geholt hat.
+    """
+    global _cached_token
+
+    with _token_lock:
+        if token is not None:
+            _rejected_tokens.add(token)
+        if token is not None and (_cached_token or {}).get("access_token") != token:
+            return
+        _cached_token = None
+        disk_entry = _read_token_cache()
+        if disk_entry is not None and (
+            token is None or disk_entry.get("access_token") == token
+        ):
+            try:
+                TOKEN_CACHE_PATH.unlink()
+            except OSError:
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Authentifizierte GET-Requests
+# ---------------------------------------------------------------------------
+
+def spotify_get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    access_token: str | None = None,
+    timeout: float | None = None,
+    revalidate: bool = True,
+) -> requests.Response:
+    """
+    Führt einen GET-Request gegen die Spotify Web API aus.
+
+    - Läuft über die gemeinsame Keep-Alive-Session inkl. Retries bei
+      429 (Retry-After wird beachtet), 5xx und Verbindungsfehlern.
+    - Jeder Versuch geht durch den prozessweiten Rate-Limiter
+      (SpotifyRateLimitPerSecond / SpotifyRateLimitBurst).
+    - Nutzt 'access_token' bzw. das gecachte Token aus get_access_token().
+      Ein bereits abgelehntes 'access_token' wird durch das aktuelle
+      Token aus dem Cache ersetzt.
+    - Bei 401 (Token abgelaufen/widerrufen) wird das Token einmalig
+      erneuert und der Request transparent wiederholt.
+    - revalidate=True: liegt für die URL eine Antwort mit ETag im
+      etag_cache, wird If-None-Match gesendet; ein 304 liefert den
+      gespeicherten Body als normale 200-Response.
+
+    Die Response wird unverändert zurückgegeben (Status-Prüfung beim Aufrufer).
+    """
+    if access_token and access_token not in _rejected_tokens:
+        token = access_token
+    else:
+        token = get_access_token()
+
+    request_kwargs: Dict[str, Any] = {"params": params}
+    if timeout is not None:
+        request_kwargs["timeout"] = timeout
+
+    cache_key = etag_cache.request_key(url, params) if revalidate else None
+    cached = etag_cache.lookup(cache_key) if cache_key else None
+
+    def _headers(bearer: str) -> Dict[str, str]:
+        headers = {"Authorization": f"Bearer {bearer}"}
+        if cached is not None:
+            headers["If-None-Match"] = cached.etag
+        return headers
+
+    limiter = get_rate_limiter()
+    resp = _send_with_retries(
+        "GET",
+        url,
+        limiter=limiter,
+        headers=_headers(token),
+        **request_kwargs,
+    )
+    if resp.status_code == 401:
+        invalidate_access_token(token)
+        fresh_token = get_access_token()
+
+        resp = _send_with_retries(
+            "GET",
+            url,
+            limiter=limiter,
+            headers=_headers(fresh_token),
+            **request_kwargs,
+        )
+
+    if cache_key is None:
+        return resp
+    return etag_cache.resolve(cache_key, cached, resp)
@@ -4,9 +4,7 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List, Set
 
-import requests  # nur für Album/Artist-Details
-
-from spotify_client import get_access_token
+from spotify_client import get_access_token, spotify_get
 from playlist_exporter import _fetch_playlist_full, _fetch_audio_features
 
 SPOTIFY_ALBUM_URL = "https://api.spotify.com/v1/albums/{album_id}"
@@ -19,7 +17,7 @@ def inspect_playlist_fields(playlist_id: str, limit: int = 20, output: Path | No
     token = get_access_token()
 
     # 1) Komplette Playlist inkl. aller Track-Objekte holen
-    playlist_full = _fetch_playlist_full(token, playlist_id)
+    playlist_full = _fetch_playlist_full(token, playlist_id, project_fields=False)
     raw_tracks: List[Dict[str, Any]] = playlist_full.get("__all_tracks__", [])
 
     if not raw_tracks:
@@ -66,25 +64,22 @@ def inspect_playlist_fields(playlist_id: str, limit: int = 20, output: Path | No
         audio_feature_keys.update(feat.keys())
 
     # 3) Optional: zusätzliche Album-/Artist-Felder über Detail-Endpoints
-    headers = {"Authorization": f"Bearer {token}"}
     album_keys_api: Set[str] = set()
     artist_keys_api: Set[str] = set()
 
     for album_id in list(album_ids)[:10]:
-        resp = requests.get(
+        resp = spotify_get(
             SPOTIFY_ALBUM_URL.format(album_id=album_id),
-            headers=headers,
-            timeout=10,
+            access_token=token,
         )
         resp.raise_for_status()
         album_data = resp.json()
         album_keys_api.update(album_data.keys())
 
     for artist_id in list(artist_ids)[:10]:
-        resp = requests.get(
+        resp = spotify_get(
             SPOTIFY_ARTIST_URL.format(artist_id=artist_id),
-            headers=headers,
-            timeout=10,
+            access_token=token,
         )
         resp.raise_for_status()
         artist_data = resp.json()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from collections.abc import Callable, Generator
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Generic, TypeVar
+
+
+# ---------------------------------------------------------------------------
+# Gemeinsame Basis der SQLite-Caches (metadata_cache, etag_cache,
+# search_resolver)
+# ---------------------------------------------------------------------------
+#
+# Alle Caches liegen als eigene Datei in data/ und werden von mehreren
+# Threads und Prozessen gleichzeitig genutzt:
+# - WAL-Modus + busy_timeout, damit Leser und Schreiber sich nicht blockieren
+# - jeder Zugriff öffnet eine eigene, kurzlebige Verbindung
+# - das Schema (Callback des Moduls) wird beim ersten Zugriff im Prozess
+#   angelegt
+#
+# StatsCounter hält die Zähler eines Laufs (Dataclass mit int-Feldern).
+
+StatsT = TypeVar("StatsT")
+
+
+class CacheDatabase:
+    """SQLite-Datei eines Caches mit einmaliger Schema-Initialisierung."""
+
+    def __init__(
+        self,
+        path: Path,
+        init_schema: Callable[[sqlite3.Connection], None],
+    ) -> None:
+        self.path = path
+        self._init_schema = init_schema
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+        self._writes_lock = threading.Lock()
+        self._writes_since_eviction = 0
+
+    @contextmanager
+    def connect(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Context-Manager für eine Verbindung; committet am Ende des Blocks.
+
+        Beim ersten Zugriff im Prozess werden WAL-Modus und Schema gesetzt.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA busy_timeout = 30000;")
+            if not self._schema_ready:
+                with self._schema_lock:
+                    if not self._schema_ready:
+                        conn.execute("PRAGMA journal_mode = WAL;")
+                        self._init_schema(conn)
+                        conn.commit()
+                        self._schema_ready = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def note_writes(self, count: int, interval: int) -> bool:
+        """
+        Zählt geschriebene Einträge. True, sobald seit der letzten Eviction
+        'interval' Einträge zusammengekommen sind (Zähler beginnt neu).
+        """
+        with self._writes_lock:
+            self._writes_since_eviction += count
+            if self._writes_since_eviction < interval:
+                return False
+            self._writes_since_eviction = 0
+            return True
+
+
+class StatsCounter(Generic[StatsT]):
+    """Threadsichere Zähler eines Laufs auf Basis einer Dataclass."""
+
+    def __init__(self, factory: Callable[[], StatsT]) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._stats = factory()
+
+    def count(self, **deltas: int) -> None:
+        """Erhöht die genannten Felder um die jeweiligen Werte."""
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self._stats, name, getattr(self._stats, name) + delta)
+
+    def get(self) -> Dict[str, Any]:
+        """Kopie der Zähler als Dict."""
+        with self._lock:
+            return asdict(self._stats)
+
+    def reset(self) -> None:
+        """Setzt alle Zähler zurück."""
+        with self._lock:
+            self._stats = self._factory()
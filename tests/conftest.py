@@ -0,0 +1,45 @@
+"""
+Gemeinsame Test-Umgebung: Projektordner im Importpfad, Spotify-Stand-in
+statt echter API und ein temporäres TRACKBRIDGE_DATA_DIR.
+
+config.py liest die Umgebung beim ersten Import – deshalb wird alles hier
+gesetzt, bevor ein Test Projektmodule importiert.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from benchmarks.spotify_standin import StandinServer, synthetic_fixtures  # noqa: E402
+
+STANDIN_PLAYLIST_ID = "standin"
+STANDIN_TRACKS = 300
+
+_server = StandinServer(synthetic_fixtures(STANDIN_PLAYLIST_ID, STANDIN_TRACKS)).start()
+_data_dir = tempfile.mkdtemp(prefix="trackbridge-test-")
+
+os.environ.update(
+    SPOTIFY_API_BASE_URL=_server.api_base_url,
+    SPOTIFY_TOKEN_URL=_server.token_url,
+    SPOTIFY_CLIENT_ID="test-client",
+    SPOTIFY_CLIENT_SECRET="test-secret",
+    TRACKBRIDGE_DATA_DIR=str(Path(_data_dir) / "data"),
+)
+
+
+@pytest.fixture(scope="session")
+def standin() -> StandinServer:
+    """Laufender Stand-in-Server mit STANDIN_TRACKS Tracks."""
+    import rate_limiter
+
+    rate_limiter.configure_rate_limiter(0)
+    return _server
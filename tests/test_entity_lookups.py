@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+import requests
+
+
+def test_connection_error_only_fails_its_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ein Batch ohne Verbindung bricht den Export nicht ab, sondern landet in 'failed'."""
+    import playlist_exporter
+
+    calls: list[str] = []
+
+    def fake_get(url: str, params: dict[str, Any], access_token: str) -> Any:
+        calls.append(params["ids"])
+        raise requests.ConnectionError("connection reset")
+
+    monkeypatch.setattr(playlist_exporter, "spotify_get", fake_get)
+
+    failed: set[str] = set()
+    result = playlist_exporter._fetch_entities_uncached(
+        "token",
+        "https://api.example/v1/albums",
+        ["offline-album-1", "offline-album-2", "offline-album-3"],
+        2,
+        "albums",
+        "album",
+        {},
+        failed=failed,
+    )
+
+    assert len(calls) == 2
+    assert result == {"offline-album-1": {}, "offline-album-2": {}, "offline-album-3": {}}
+    assert failed == {"offline-album-1", "offline-album-2", "offline-album-3"}
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pytest
+
+
+def test_open_checkpoint_does_not_reset_while_locked(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ein gesperrter Checkpoint wird nicht verworfen, sondern bleibt erhalten."""
+    import export_checkpoint
+    from util_files import file_lock
+
+    monkeypatch.setattr(export_checkpoint, "CHECKPOINT_LOCK_TIMEOUT_SECONDS", 0.1)
+
+    saved = export_checkpoint.open_checkpoint("locked", "snap-1", "fields")
+    assert saved is not None
+    saved.save_page(100, [{"id": "t1"}])
+
+    lock_path = export_checkpoint.CHECKPOINT_DIR / "locked.lock"
+    with file_lock(lock_path, timeout=1, stale_seconds=30) as locked:
+        assert locked
+        with pytest.raises(TimeoutError):
+            export_checkpoint.open_checkpoint("locked", "snap-2", "fields")
+
+    resumed = export_checkpoint.open_checkpoint("locked", "snap-1", "fields")
+    assert resumed is not None
+    assert resumed.load_page(100) == [{"id": "t1"}]
+
+    export_checkpoint.clear_checkpoint("locked")
+    assert not (export_checkpoint.CHECKPOINT_DIR / "locked").exists()
+    assert not lock_path.exists()
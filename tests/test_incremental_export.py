@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from conftest import STANDIN_PLAYLIST_ID, STANDIN_TRACKS
+
+
+def test_incremental_after_limited_export_exports_all_tracks(standin, tmp_path: Path) -> None:
+    """Ein Teil-Export (--limit) gilt trotz gleicher snapshot_id nicht als aktuell."""
+    import playlist_exporter
+    from playlist_store import read_playlist_file
+
+    output = tmp_path / "playlist.json"
+
+    playlist_exporter.export_playlist_to_json(STANDIN_PLAYLIST_ID, output_path=output, limit=50)
+    limited = read_playlist_file(output)
+    assert len(limited["tracks"]) == 50
+    assert limited["playlist"]["track_limit"] == 50
+
+    playlist_exporter.export_playlist_to_json(
+        STANDIN_PLAYLIST_ID, output_path=output, incremental=True
+    )
+    full = read_playlist_file(output)
+    assert len(full["tracks"]) == STANDIN_TRACKS
+    assert "track_limit" not in full["playlist"]
+    assert full["playlist"]["snapshot_id"] == limited["playlist"]["snapshot_id"]
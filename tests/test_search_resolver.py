@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+pytest.importorskip("yt_dlp")
+
+
+def test_unexpected_search_error_becomes_resolve_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Auch Fehler außerhalb von DownloadError lassen den Job bei der Suchanfrage."""
+    import search_resolver
+
+    class _BrokenYdl:
+        def extract_info(self, query: str, download: bool) -> Any:
+            raise KeyError("entries")
+
+    monkeypatch.setattr(search_resolver, "_thread_ydl", _BrokenYdl)
+
+    with pytest.raises(search_resolver.ResolveError, match="KeyError"):
+        search_resolver._search_with_library("ytsearch1:Artist - Title")
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def restore_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Stellt die prozessweiten Settings nach dem Test wieder her."""
+    import config
+
+    monkeypatch.setattr(config, "_settings", config.get_settings())
+
+
+def test_overrides_apply_after_import(restore_settings: None, tmp_path) -> None:
+    """override_settings() wirkt auch auf bereits importierte Module."""
+    from config import override_settings
+    from format_profiles import is_ext_compatible_with_active_profile
+    from playlist_store import playlist_json_path
+    from util_filenames import build_audio_filename
+
+    override_settings(
+        output_directory=tmp_path,
+        audio_output_extension="aiff",
+        dj_compatibility_profile="cdj2000nxs2",
+        deny_wav_completely=True,
+    )
+
+    assert playlist_json_path("abc").parent == tmp_path
+    assert build_audio_filename("Title", 3).endswith(".aiff")
+    assert not is_ext_compatible_with_active_profile("wav")
+    assert not is_ext_compatible_with_active_profile("webm")
+    assert is_ext_compatible_with_active_profile("flac")
+
+
+def test_search_resolve_can_be_disabled_at_runtime(restore_settings: None) -> None:
+    """SearchResolveEnabled=false per Override: resolve_jobs() fasst nichts an."""
+    from config import override_settings
+    from search_resolver import resolve_jobs
+
+    override_settings(search_resolve_enabled=False)
+
+    class _Untouchable:
+        def __getattr__(self, name: str) -> None:
+            raise AssertionError(f"Job wurde gelesen: {name}")
+
+    assert not any(resolve_jobs([_Untouchable()]).values())
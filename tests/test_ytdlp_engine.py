@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("yt_dlp")
+
+
+def test_failed_job_does_not_leak_into_next_job(tmp_path: Path) -> None:
+    """Ein Worker lädt nach einem Fehlschlag den nächsten Job normal herunter."""
+    from benchmarks.bench_download_engine import _make_handler
+    from yt_dlp_runner import build_format_selector
+    from ytdlp_engine import InProcessEngine
+
+    payload = bytes(16 * 1024)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(payload))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with InProcessEngine(build_format_selector(), workers=1) as engine:
+            failed = engine.download(
+                "http://127.0.0.1:1/missing.m4a", str(tmp_path / "missing.%(ext)s")
+            )
+            ok = engine.download(f"{base_url}/track.m4a", str(tmp_path / "track.%(ext)s"))
+    finally:
+        server.shutdown()
+
+    assert failed.returncode != 0
+    assert failed.stderr
+    assert ok.returncode == 0, ok.stderr
+    assert (tmp_path / "track.m4a").read_bytes() == payload
+    assert not list(tmp_path.glob("missing.*"))
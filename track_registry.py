@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from contextlib import contextmanager
 from collections.abc import Generator
 from dataclasses import dataclass
@@ -15,10 +16,13 @@ from typing import Optional
 
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 DB_PATH = DATA_DIR / "track_registry.db"
 
+# Schema wird beim ersten Zugriff angelegt, nicht beim Import
+_schema_lock = threading.Lock()
+_schema_ready = False
+
 
 # ---------------------------------------------------------------------------
 # Datamodel (Python-Seite)
@@ -58,10 +62,22 @@ class FileInfo:
 def get_connection() -> Generator[sqlite3.Connection, None, None]:
     """
     Context-Manager für eine SQLite-Verbindung.
+
+    Ordner und Schema werden beim ersten Zugriff im Prozess angelegt
+    (init_db), der Import des Moduls selbst hat keine Seiteneffekte.
     """
+    global _schema_ready
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(DB_PATH)
     try:
         conn.execute("PRAGMA foreign_keys = ON;")
+        if not _schema_ready:
+            with _schema_lock:
+                if not _schema_ready:
+                    _init_schema(conn)
+                    conn.commit()
+                    _schema_ready = True
         yield conn
         conn.commit()
     finally:
@@ -84,53 +100,57 @@ def init_db() -> None:
     """
     Legt die benötigten Tabellen an, falls sie noch nicht existieren
     und führt einfache Schema-Migrationen (z. B. source_url) durch.
-    """
-    with get_connection() as conn:
-        cur = conn.cursor()
 
-        # 1) Haupttabelle für Tracks
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tracks (
-                spotify_track_id TEXT PRIMARY KEY,
-                title            TEXT NOT NULL,
-                primary_artist   TEXT NOT NULL,
-                duration_ms      INTEGER,
-                best_file_id     INTEGER,
-                created_at       TEXT NOT NULL,
-                last_seen_at     TEXT NOT NULL,
-                reencode_status  TEXT,
-                tagging_status   TEXT,
-                source_url       TEXT,
-                FOREIGN KEY (best_file_id) REFERENCES files(id)
-            );
-            """
-        )
-
-        # 2) Tabelle für Dateien
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS files (
-                id             INTEGER PRIMARY KEY AUTOINCREMENT,
-                track_id       TEXT NOT NULL,
-                absolute_path  TEXT NOT NULL,
-                format         TEXT NOT NULL,
-                file_size      INTEGER,
-                mtime          INTEGER,
-                added_at       TEXT NOT NULL,
-                last_seen_at   TEXT NOT NULL,
-                is_missing     INTEGER NOT NULL DEFAULT 0,
-                FOREIGN KEY (track_id) REFERENCES tracks(spotify_track_id)
-            );
-            """
-        )
+    Passiert automatisch beim ersten get_connection(); expliziter Aufruf
+    nur nötig, um die DB vorab anzulegen.
+    """
+    with get_connection():
+        pass
 
-        # 3) Migration für ältere DBs: source_url-Spalte nachziehen (idempotent)
-        _ensure_column(conn, "tracks", "source_url", "TEXT")
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Tabellen + Migrationen (idempotent), siehe init_db()."""
+    cur = conn.cursor()
 
-# Beim Import einmal sicherstellen, dass die DB-Struktur vorhanden ist
-init_db()
+    # 1) Haupttabelle für Tracks
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tracks (
+            spotify_track_id TEXT PRIMARY KEY,
+            title            TEXT NOT NULL,
+            primary_artist   TEXT NOT NULL,
+            duration_ms      INTEGER,
+            best_file_id     INTEGER,
+            created_at       TEXT NOT NULL,
+            last_seen_at     TEXT NOT NULL,
+            reencode_status  TEXT,
+            tagging_status   TEXT,
+            source_url       TEXT,
+            FOREIGN KEY (best_file_id) REFERENCES files(id)
+        );
+        """
+    )
+
+    # 2) Tabelle für Dateien
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS files (
+            id             INTEGER PRIMARY KEY AUTOINCREMENT,
+            track_id       TEXT NOT NULL,
+            absolute_path  TEXT NOT NULL,
+            format         TEXT NOT NULL,
+            file_size      INTEGER,
+            mtime          INTEGER,
+            added_at       TEXT NOT NULL,
+            last_seen_at   TEXT NOT NULL,
+            is_missing     INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (track_id) REFERENCES tracks(spotify_track_id)
+        );
+        """
+    )
+
+    # 3) Migration für ältere DBs: source_url-Spalte nachziehen (idempotent)
+    _ensure_column(conn, "tracks", "source_url", "TEXT")
 
 
 # ---------------------------------------------------------------------------
@@ -3,11 +3,7 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-from config import (
-    AUDIO_FILENAME_TEMPLATE,
-    AUDIO_OUTPUT_EXTENSION,
-    MAX_FILENAME_LENGTH,
-)
+from config import get_settings
 
 
 INVALID_CHARS_PATTERN = re.compile(r'[<>:"/\\|?*\n\r\t]+')
@@ -47,13 +43,14 @@ def build_audio_filename(title: str, track_number: int | None = None) -> str:
     title_sanitized = sanitize_title(title)
     track_number_padded = format_track_number(track_number)
 
-    stem = AUDIO_FILENAME_TEMPLATE.format(
+    settings = get_settings()
+    stem = settings.audio_filename_template.format(
         track_number_padded=track_number_padded,
         title_sanitized=title_sanitized,
     )
 
-    stem_short = shorten_filename_stem(stem, MAX_FILENAME_LENGTH)
-    filename = f"{stem_short}.{AUDIO_OUTPUT_EXTENSION.lstrip('.')}"
+    stem_short = shorten_filename_stem(stem, settings.max_filename_length)
+    filename = f"{stem_short}.{settings.audio_output_extension.lstrip('.')}"
     return filename
 
 
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+
+# ---------------------------------------------------------------------------
+# Gemeinsame Datei-Helfer: atomares Schreiben, Lock-Dateien
+# ---------------------------------------------------------------------------
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Schreibt 'data' atomar nach 'path': erst in eine Temp-Datei im selben
+    Ordner, dann os.replace(). Leser sehen nie eine halb geschriebene Datei.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def file_lock(
+    path: Path,
+    timeout: float,
+    stale_seconds: float,
+) -> Generator[bool, None, None]:
+    """
+    Einfacher, plattformunabhängiger Lock über eine Lock-Datei (O_EXCL).
+
+    Liefert True, wenn der Lock gehalten wird. Lock-Dateien, die älter als
+    'stale_seconds' sind, gelten als verwaist (abgestürzter Prozess) und
+    werden entfernt. Gelingt der Lock nicht innerhalb von 'timeout', liefert
+    der Kontext False – ob dann ohne Lock weitergemacht wird, entscheidet
+    der Aufrufer.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    fd: Optional[int] = None
+
+    while fd is None:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = time.time() - path.stat().st_mtime
+                if age > stale_seconds:
+                    path.unlink()
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+        except OSError:
+            break
+
+    try:
+        yield fd is not None
+    finally:
+        if fd is not None:
+            os.close(fd)
+            try:
+                path.unlink()
+            except OSError:
+                pass
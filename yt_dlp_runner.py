@@ -2,33 +2,35 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
-from queue import Queue, Empty
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
 from tagging import apply_tags_to_file
 from track_registry import TrackInfo, register_file_for_track
 
-from config import (
-    OUTPUT_DIRECTORY,
-    MAX_PARALLEL_DOWNLOADS,
-    DOWNLOAD_MAX_RETRIES,
-    AUDIO_PREFERRED_FORMATS,
-    SKIP_EXISTING_FILES,
-    KNOWN_AUDIO_EXTENSIONS,
-    DJ_COMPATIBILITY_PROFILE,
-    DJ_WARN_ON_INCOMPATIBLE,
-    REGISTRY_ENABLED,
-    REGISTRY_STORE_SPOTIFY_URL,  # NEU
-    # ALLOW_REENCODE_FOR_INCOMPATIBLE,
-    # PREFERRED_HIGH_QUALITY_TARGET,
-)
+from config import get_settings
 
 from format_profiles import is_ext_compatible_with_active_profile
-from reencode_engine import reencode_if_needed
+from playlist_store import (
+    find_playlist_file,
+    iter_playlist_tracks,
+    playlist_json_path,
+    read_playlist_file,
+)
+from download_pipeline import Stage, format_pipeline_stats, run_pipeline
+from reencode_engine import (
+    format_reencode_stats,
+    get_reencode_stats,
+    reencode_if_needed,
+    reset_reencode_stats,
+    resolve_reencode_workers,
+)
+from search_resolver import forget_resolution, format_resolve_stats, resolve_jobs
+from ytdlp_engine import EngineResult, InProcessEngine, open_download_engine
 
 import subprocess
 import threading
 import time
-import json
+from concurrent.futures import ThreadPoolExecutor
 
 from util_filenames import build_audio_filename
 
@@ -53,7 +55,9 @@ class DownloadJob:
     - Status (queued, running, done, failed)
     - Fehlercodes
     - tatsächlicher Dateipfad
-    - YouTube-Video-ID (falls wir das später auflösen)
+
+    video_id / resolved_url setzt die Suchauflösung (search_resolver.py);
+    ist resolved_url gesetzt, lädt yt-dlp direkt dieses Video statt zu suchen.
     """
     playlist_id: str
     track_index: int  # 0-basiert
@@ -65,6 +69,13 @@ class DownloadJob:
     spotify_track_id: str | None = None
     spotify_url: str | None = None
     track_meta: Dict[str, Any] | None = None  # Extended-JSON-Daten für Tagging
+    video_id: str | None = None
+    resolved_url: str | None = None
+
+
+def download_source(job: DownloadJob) -> str:
+    """Was yt-dlp laden soll: aufgelöste Video-URL, sonst die Suchanfrage."""
+    return job.resolved_url or job.search_query
 
 
 # ---------------------------------------------------------------------------
@@ -74,14 +85,14 @@ class DownloadJob:
 def _get_playlist_json_path(playlist_id: str) -> Path:
     """
     Liefert den Pfad zur Extended-JSON einer Playlist auf Basis der
-    bisherigen Exportlogik.
+    bisherigen Exportlogik (.json oder .json.gz, die neuere gewinnt).
     """
-    return OUTPUT_DIRECTORY / f"spotify_playlist_{playlist_id}.json"
+    return find_playlist_file(playlist_id) or playlist_json_path(playlist_id)
 
 
 def load_playlist_data(playlist_id: str) -> Dict[str, Any]:
     """
-    Lädt die Extended-JSON der Playlist.
+    Lädt die Extended-JSON der Playlist (gzip wird transparent entpackt).
 
     Erwartete Struktur:
     {
@@ -96,8 +107,7 @@ def load_playlist_data(playlist_id: str) -> Dict[str, Any]:
             f"Extended-JSON für Playlist {playlist_id} nicht gefunden: {json_path}"
         )
 
-    raw = json_path.read_text(encoding="utf-8")
-    data: Dict[str, Any] = json.loads(raw)
+    data: Dict[str, Any] = read_playlist_file(json_path)
 
     if "tracks" not in data:
         raise ValueError(
@@ -107,6 +117,21 @@ def load_playlist_data(playlist_id: str) -> Dict[str, Any]:
     return data
 
 
+def iter_playlist_tracks_for(playlist_id: str) -> Iterator[Dict[str, Any]]:
+    """
+    Wie load_playlist_data(), liefert aber nur die Tracks – einzeln und
+    inkrementell geparst (siehe playlist_store.iter_playlist_tracks).
+    """
+    json_path = _get_playlist_json_path(playlist_id)
+
+    if not json_path.exists():
+        raise FileNotFoundError(
+            f"Extended-JSON für Playlist {playlist_id} nicht gefunden: {json_path}"
+        )
+
+    return iter_playlist_tracks(json_path)
+
+
 # ---------------------------------------------------------------------------
 # Download-Jobs aus Playlistdaten erzeugen
 # ---------------------------------------------------------------------------
@@ -122,19 +147,31 @@ def build_jobs_from_playlist_data(
     - Titel & Artist kommen aus 'title' / 'primary_artist'
     - Dateiname wird auf Basis von build_audio_filename() gebaut
     - Zielverzeichnis:
-      - Default: OUTPUT_DIRECTORY / playlist_id  (pro Playlist ein Unterordner)
+      - Default: OutputDirectory / playlist_id  (pro Playlist ein Unterordner)
     """
-    tracks: List[Dict[str, Any]] = data.get("tracks", [])
+    return list(
+        iter_jobs_from_tracks(playlist_id, data.get("tracks", []), per_playlist_subdir)
+    )
 
+
+def iter_jobs_from_tracks(
+    playlist_id: str,
+    tracks: Iterable[Dict[str, Any]],
+    per_playlist_subdir: bool = True,
+) -> Iterator[DownloadJob]:
+    """
+    Generator-Variante von build_jobs_from_playlist_data(): erzeugt die
+    Jobs einzeln, während 'tracks' (z. B. aus iter_playlist_tracks_for)
+    gelesen wird.
+    """
+    output_directory = get_settings().output_directory
     if per_playlist_subdir:
-        target_root = OUTPUT_DIRECTORY / playlist_id
+        target_root = output_directory / playlist_id
     else:
-        target_root = OUTPUT_DIRECTORY
+        target_root = output_directory
 
     target_root.mkdir(parents=True, exist_ok=True)
 
-    jobs: List[DownloadJob] = []
-
     for idx, t in enumerate(tracks):
         title = (t.get("title") or "").strip()
         primary_artist = (t.get("primary_artist") or "").strip()
@@ -177,8 +214,20 @@ def build_jobs_from_playlist_data(
             spotify_url=spotify_url,
             track_meta=t,  # Extended-JSON-Daten für Tagging
         )
-        jobs.append(job)
+        yield job
+
 
+def iter_download_jobs(
+    playlist_id: str,
+    limit: int | None = None,
+) -> Iterator[DownloadJob]:
+    """
+    Liefert die Download-Jobs einer Playlist lazy: die Extended-JSON wird
+    nur so weit gelesen, bis 'limit' Jobs erzeugt sind.
+    """
+    jobs = iter_jobs_from_tracks(playlist_id, iter_playlist_tracks_for(playlist_id))
+    if limit is not None and limit >= 0:
+        return islice(jobs, limit)
     return jobs
 
 
@@ -186,36 +235,42 @@ def build_jobs_from_playlist_data(
 # yt-dlp Befehle generieren (noch kein echter Download)
 # ---------------------------------------------------------------------------
 
-def build_yt_dlp_command(job: DownloadJob) -> List[str]:
+def build_format_selector() -> str:
     """
-    Erzeugt den yt-dlp Befehl für einen einzelnen Job.
+    Format-Selector für yt-dlp (subprocess und In-Process-Engine).
 
-    - Bevorzugt Audio-Formate aus AUDIO_PREFERRED_FORMATS (z. B. m4a),
+    - Bevorzugt Audio-Formate aus AudioPreferredFormats (z. B. m4a),
       ohne Re-Encode zu erzwingen.
     - Fällt zurück auf bestaudio/best, wenn kein bevorzugtes Format verfügbar ist.
     """
-    output_template = str(
-        job.target_dir / f"{job.output_stem}.%(ext)s"
-    )
-
-    # Format-Selector bauen:
     # z. B. "bestaudio[ext=m4a]/bestaudio[ext=mp3]/bestaudio/best"
     preferred_parts = [
         f"bestaudio[ext={ext}]"
-        for ext in AUDIO_PREFERRED_FORMATS
+        for ext in get_settings().audio_preferred_formats
         if ext
     ]
     preferred_parts.append("bestaudio/best")
-    format_selector = "/".join(preferred_parts)
+    return "/".join(preferred_parts)
+
+
+def build_output_template(job: DownloadJob) -> str:
+    """Ausgabe-Template (-o) eines Jobs: <target_dir>/<output_stem>.<ext>."""
+    return str(job.target_dir / f"{job.output_stem}.%(ext)s")
 
+
+def build_yt_dlp_command(job: DownloadJob) -> List[str]:
+    """
+    Erzeugt den yt-dlp Befehl für einen einzelnen Job
+    (Format-Selector siehe build_format_selector()).
+    """
     cmd = [
         "yt-dlp",
         "--no-playlist",
         "-f",
-        format_selector,
+        build_format_selector(),
         "-o",
-        output_template,
-        job.search_query,
+        build_output_template(job),
+        download_source(job),
     ]
     return cmd
 
@@ -234,15 +289,27 @@ def plan_downloads_for_playlist(
     - schneidet optional auf 'limit' zu
     - gibt die Jobs zurück
 
-    Diese Funktion führt NOCH KEINE Downloads aus.
+    Diese Funktion führt NOCH KEINE Downloads aus. Die Extended-JSON wird
+    nur bis zum 'limit'-ten Track gelesen (siehe iter_download_jobs).
     """
-    data = load_playlist_data(playlist_id)
-    jobs = build_jobs_from_playlist_data(playlist_id, data)
+    return list(iter_download_jobs(playlist_id, limit=limit))
 
-    if limit is not None and limit >= 0:
-        jobs = jobs[:limit]
 
-    return jobs
+def resolve_download_targets(
+    jobs: List[DownloadJob],
+    search_missing: bool = True,
+) -> None:
+    """
+    Setzt die YouTube-Ziele der Jobs aus dem Such-Cache und sucht (bei
+    search_missing) fehlende vorab, siehe search_resolver.resolve_jobs().
+    """
+    if not get_settings().search_resolve_enabled:
+        return
+
+    stats = resolve_jobs(jobs, search_missing=search_missing)
+    if any(stats.values()):
+        print(f"[RESOLVE] {format_resolve_stats()}")
+        print()
 
 
 def print_download_plan(jobs: List[DownloadJob]) -> None:
@@ -255,7 +322,10 @@ def print_download_plan(jobs: List[DownloadJob]) -> None:
         return
 
     print(f"[PLAN] Geplante Downloads: {len(jobs)}")
-    print(f"[PLAN] Max. parallele Downloads laut Config: {MAX_PARALLEL_DOWNLOADS}")
+    print(
+        "[PLAN] Max. parallele Downloads laut Config: "
+        f"{get_settings().max_parallel_downloads}"
+    )
     print()
 
     for job in jobs:
@@ -265,6 +335,8 @@ def print_download_plan(jobs: List[DownloadJob]) -> None:
         print(f"       Zieldatei: {job.target_dir / (job.output_stem + '.<ext>')}")
         if job.spotify_url:
             print(f"       Spotify:   {job.spotify_url}")
+        if job.resolved_url:
+            print(f"       YouTube:   {job.resolved_url}")
         cmd = build_yt_dlp_command(job)
         print(f"       yt-dlp:    {' '.join(cmd)}")
         print()
@@ -275,144 +347,102 @@ def _find_downloaded_file(job: DownloadJob) -> Path | None:
     Versucht, die tatsächlich heruntergeladene Audiodatei für einen Job
     im Zielverzeichnis zu finden.
 
-    Nutzt KNOWN_AUDIO_EXTENSIONS und den output_stem.
+    Nutzt KnownAudioExtensions und den output_stem.
     """
-    for ext in KNOWN_AUDIO_EXTENSIONS:
+    for ext in get_settings().known_audio_extensions:
         candidate = job.target_dir / f"{job.output_stem}.{ext}"
         if candidate.exists():
             return candidate
     return None
 
 
-def _run_single_job(job: DownloadJob) -> bool:
+def _download_job(
+    job: DownloadJob,
+    engine: InProcessEngine | None = None,
+) -> EngineResult:
     """
-    Führt einen einzelnen yt-dlp-Job aus.
-
-    - Achtet auf SkipExistingFiles
-    - Baut den Befehl
-    - Führt ihn via subprocess.run aus
-    - Gibt True zurück, wenn returncode == 0, sonst False
+    Reiner Download-Schritt eines Jobs: über die In-Process-Engine oder,
+    ohne Engine, als eigener yt-dlp-Prozess (build_yt_dlp_command).
     """
-
-    # 1) Optional: vorhandene Dateien prüfen
-    if SKIP_EXISTING_FILES:
-        existing_paths: list[Path] = []
-        for ext in KNOWN_AUDIO_EXTENSIONS:
-            candidate = job.target_dir / f"{job.output_stem}.{ext}"
-            if candidate.exists():
-                existing_paths.append(candidate)
-
-        if existing_paths:
-            print(
-                "[SKIP] Datei(en) existieren bereits für "
-                f"#{job.track_index + 1:02d}: "
-                f"{job.primary_artist} - {job.title}"
-            )
-            for p in existing_paths:
-                print(f"       -> {p}")
-            # Aus Sicht der Pipeline ist das ein „erfolgreicher“ Job
-            return True
-
-    # 2) Zielpfad sicherstellen
-    job.target_dir.mkdir(parents=True, exist_ok=True)
-
-    # 3) yt-dlp Kommando bauen und ausführen
-    cmd = build_yt_dlp_command(job)
-
-    print(
-        f"[RUN] Starte Download #{job.track_index + 1:02d}: "
-        f"{job.primary_artist} - {job.title}"
-    )
-    print(f"[RUN] Ziel: {job.target_dir / (job.output_stem + '.<ext>')}")
-    print(f"[RUN] yt-dlp: {' '.join(cmd)}")
+    if engine is not None:
+        return engine.download(download_source(job), build_output_template(job))
 
     try:
         result = subprocess.run(
-            cmd,
+            build_yt_dlp_command(job),
             capture_output=True,
             text=True,
             check=False,
         )
     except FileNotFoundError:
-        print("[ERROR] yt-dlp wurde nicht gefunden. Ist es im PATH installiert?")
-        return False
+        return EngineResult(
+            127, "yt-dlp wurde nicht gefunden. Ist es im PATH installiert?"
+        )
     except Exception as exc:  # noqa: BLE001
-        print(f"[ERROR] Unerwarteter Fehler beim Start von yt-dlp: {exc}")
+        return EngineResult(1, f"Unerwarteter Fehler beim Start von yt-dlp: {exc}")
+
+    return EngineResult(result.returncode, result.stderr or "")
+
+
+@dataclass
+class _StagedFile:
+    """Ein Track zwischen den Pipeline-Stufen (Datei liegt bereits auf der Platte)."""
+    job: DownloadJob
+    path: Path
+
+
+def _skip_existing(job: DownloadJob) -> bool:
+    """True (mit Ausgabe), wenn SkipExistingFiles greift."""
+    settings = get_settings()
+    if not settings.skip_existing_files:
         return False
 
-    if result.returncode == 0:
-        print(
-            f"[OK] Download abgeschlossen: "
-            f"{job.primary_artist} - {job.title}"
-        )
+    existing_paths: list[Path] = []
+    for ext in settings.known_audio_extensions:
+        candidate = job.target_dir / f"{job.output_stem}.{ext}"
+        if candidate.exists():
+            existing_paths.append(candidate)
 
-        # Tatsächlich heruntergeladene Datei ermitteln
-        downloaded = _find_downloaded_file(job)
-        if downloaded is not None:
-            ext = downloaded.suffix.lstrip(".").lower()
+    if not existing_paths:
+        return False
 
-            # 1) Kompatibilitäts-Warnung (unabhängig vom Reencode)
-            if DJ_WARN_ON_INCOMPATIBLE and not is_ext_compatible_with_active_profile(ext):
-                print(
-                    "[WARN] Das heruntergeladene Format ist möglicherweise "
-                    "nicht mit dem aktiven DJ-Profil kompatibel."
-                )
-                print(
-                    f"       Datei:  {downloaded.name} "
-                    f"(.{ext}) - Profil: {DJ_COMPATIBILITY_PROFILE}"
-                )
-                print(
-                    "       Hinweis: Für CDJ-Player sind Formate wie WAV/AIFF/"
-                    "ALAC/AAC/MP3/FLAC ideal. WEBM/Opus sind dort oft nicht "
-                    "direkt abspielbar."
-                )
+    print(
+        "[SKIP] Datei(en) existieren bereits für "
+        f"#{job.track_index + 1:02d}: "
+        f"{job.primary_artist} - {job.title}"
+    )
+    for p in existing_paths:
+        print(f"       -> {p}")
+    return True
 
-            # 2) Optionaler HQ-Reencode für inkompatible Formate
-            active_path = downloaded
-            new_path = reencode_if_needed(downloaded)
-            if new_path is not None:
-                active_path = new_path
-                print(
-                    f"[RUN] Aktive HQ-Datei für diesen Track: {new_path.name}"
-                )
 
-            # 3) Tagging-Hook: Metadaten aus Extended-JSON anwenden
-            if job.track_meta is not None:
-                try:
-                    apply_tags_to_file(active_path, job.track_meta)
-                    print(f"[TAG] Tags angewendet: {active_path.name}")
-                except Exception as exc:  # noqa: BLE001
-                    print(
-                        f"[TAG-ERROR] Tagging fehlgeschlagen für "
-                        f"{active_path.name}: {exc}"
-                    )
-
-            # 4) Registry-Hook: Datei in der Track-Registry erfassen (optional)
-            if REGISTRY_ENABLED and job.spotify_track_id and active_path.exists():
-                try:
-                    meta = job.track_meta or {}
-                    duration_ms = meta.get("duration_ms")
-
-                    source_url = None
-                    if REGISTRY_STORE_SPOTIFY_URL:
-                        source_url = job.spotify_url
-
-                    track_info = TrackInfo(
-                        spotify_track_id=job.spotify_track_id,
-                        title=job.title,
-                        primary_artist=job.primary_artist,
-                        duration_ms=duration_ms,
-                        source_url=source_url,
-                    )
-                    register_file_for_track(track_info, active_path)
-                    print(f"[REG] Datei registriert: {active_path}")
-                except Exception as exc:  # noqa: BLE001
-                    print(
-                        f"[REG-ERROR] Registrierung fehlgeschlagen für "
-                        f"{active_path}: {exc}"
-                    )
+def _run_download_attempt(
+    job: DownloadJob,
+    engine: InProcessEngine | None = None,
+) -> bool:
+    """
+    Ein Downloadversuch eines Jobs (Prozess pro Job oder In-Process-Engine).
+    Gibt True zurück, wenn returncode == 0, sonst False.
+    """
+    job.target_dir.mkdir(parents=True, exist_ok=True)
 
+    print(
+        f"[RUN] Starte Download #{job.track_index + 1:02d}: "
+        f"{job.primary_artist} - {job.title}"
+    )
+    print(f"[RUN] Ziel: {job.target_dir / (job.output_stem + '.<ext>')}")
+    if engine is None:
+        print(f"[RUN] yt-dlp: {' '.join(build_yt_dlp_command(job))}")
+    else:
+        print(f"[RUN] yt-dlp (in-process): {download_source(job)}")
 
+    result = _download_job(job, engine)
+
+    if result.returncode == 0:
+        print(
+            f"[OK] Download abgeschlossen: "
+            f"{job.primary_artist} - {job.title}"
+        )
         return True
 
     print(
@@ -422,45 +452,144 @@ def _run_single_job(job: DownloadJob) -> bool:
     if result.stderr:
         print("[ERROR] yt-dlp stderr:")
         print(result.stderr.strip())
+    if job.resolved_url:
+        # Video evtl. gelöscht/gesperrt: beim nächsten Versuch wieder suchen
+        print(
+            f"[RESOLVE] Verwerfe aufgelöstes Video {job.video_id} für "
+            f"{job.primary_artist} - {job.title}"
+        )
+        forget_resolution(job)
+        job.video_id = None
+        job.resolved_url = None
     return False
 
 
-def _worker_thread(
-    name: str,
-    queue: Queue[DownloadJob],
+# ---------------------------------------------------------------------------
+# Pipeline-Stufen (download -> reencode -> tag -> register)
+# ---------------------------------------------------------------------------
+
+def _download_stage(
+    job: DownloadJob,
+    engine: InProcessEngine | None,
+    max_retries: int,
     results: Dict[int, bool],
-) -> None:
+) -> _StagedFile | None:
     """
-    Worker, der aus der Queue Jobs zieht, mit Retries ausführt und
-    das Ergebnis im 'results'-Dict (track_index -> Erfolg) speichert.
+    Stufe 'download': Download mit Retries. Das Ergebnis des Jobs landet in
+    'results' (track_index -> Erfolg); die Datei geht an die nächste Stufe.
     """
-    while True:
-        try:
-            job = queue.get_nowait()
-        except Empty:
-            return
+    if _skip_existing(job):
+        # Aus Sicht der Pipeline ist das ein „erfolgreicher“ Job
+        results[job.track_index] = True
+        return None
 
-        success = False
-        attempts = DOWNLOAD_MAX_RETRIES + 1
+    success = False
+    attempts = max_retries + 1
+    worker = threading.current_thread().name
 
-        for attempt in range(1, attempts + 1):
+    for attempt in range(1, attempts + 1):
+        print(
+            f"[WORKER {worker}] Versuch {attempt}/{attempts} für "
+            f"#{job.track_index + 1:02d}: {job.primary_artist} - {job.title}"
+        )
+        success = _run_download_attempt(job, engine)
+        if success:
+            break
+        if attempt < attempts:
             print(
-                f"[WORKER {name}] Versuch {attempt}/{attempts} für "
-                f"#{job.track_index + 1:02d}: {job.primary_artist} - {job.title}"
+                f"[WORKER {worker}] Retry geplant für "
+                f"{job.primary_artist} - {job.title}"
             )
-            success = _run_single_job(job)
-            if success:
-                break
-            else:
-                if attempt < attempts:
-                    print(
-                        f"[WORKER {name}] Retry geplant für "
-                        f"{job.primary_artist} - {job.title}"
-                    )
-                    time.sleep(1.0)  # kleiner Backoff
+            time.sleep(1.0)  # kleiner Backoff
+
+    results[job.track_index] = success
+    if not success:
+        return None
+
+    # Tatsächlich heruntergeladene Datei ermitteln
+    downloaded = _find_downloaded_file(job)
+    if downloaded is None:
+        return None
+    return _StagedFile(job, downloaded)
+
+
+def _reencode_stage(staged: _StagedFile) -> _StagedFile:
+    """Stufe 'reencode': DJ-Kompatibilität prüfen, optional HQ-Reencode."""
+    downloaded = staged.path
+    ext = downloaded.suffix.lstrip(".").lower()
+
+    # 1) Kompatibilitäts-Warnung (unabhängig vom Reencode)
+    settings = get_settings()
+    if settings.dj_warn_on_incompatible and not is_ext_compatible_with_active_profile(ext):
+        print(
+            "[WARN] Das heruntergeladene Format ist möglicherweise "
+            "nicht mit dem aktiven DJ-Profil kompatibel."
+        )
+        print(
+            f"       Datei:  {downloaded.name} "
+            f"(.{ext}) - Profil: {settings.dj_compatibility_profile}"
+        )
+        print(
+            "       Hinweis: Für CDJ-Player sind Formate wie WAV/AIFF/"
+            "ALAC/AAC/MP3/FLAC ideal. WEBM/Opus sind dort oft nicht "
+            "direkt abspielbar."
+        )
+
+    # 2) Optionaler HQ-Reencode für inkompatible Formate
+    new_path = reencode_if_needed(downloaded)
+    if new_path is not None:
+        staged.path = new_path
+        print(
+            f"[RUN] Aktive HQ-Datei für diesen Track: {new_path.name}"
+        )
+    return staged
+
 
-        results[job.track_index] = success
-        queue.task_done()
+def _tag_stage(staged: _StagedFile) -> _StagedFile | None:
+    """Stufe 'tag': Metadaten aus der Extended-JSON anwenden."""
+    job, active_path = staged.job, staged.path
+
+    if job.track_meta is not None:
+        try:
+            apply_tags_to_file(active_path, job.track_meta)
+            print(f"[TAG] Tags angewendet: {active_path.name}")
+        except Exception as exc:  # noqa: BLE001
+            print(
+                f"[TAG-ERROR] Tagging fehlgeschlagen für "
+                f"{active_path.name}: {exc}"
+            )
+
+    if get_settings().registry_enabled and job.spotify_track_id and active_path.exists():
+        return staged
+    return None
+
+
+def _register_stage(staged: _StagedFile) -> None:
+    """Stufe 'register': Datei in der Track-Registry erfassen (ein Schreiber)."""
+    job, active_path = staged.job, staged.path
+    try:
+        meta = job.track_meta or {}
+        duration_ms = meta.get("duration_ms")
+
+        source_url = None
+        if get_settings().registry_store_spotify_url:
+            source_url = job.spotify_url
+
+        track_info = TrackInfo(
+            spotify_track_id=job.spotify_track_id,
+            title=job.title,
+            primary_artist=job.primary_artist,
+            duration_ms=duration_ms,
+            source_url=source_url,
+        )
+        register_file_for_track(track_info, active_path)
+        print(f"[REG] Datei registriert: {active_path}")
+    except Exception as exc:  # noqa: BLE001
+        print(
+            f"[REG-ERROR] Registrierung fehlgeschlagen für "
+            f"{active_path}: {exc}"
+        )
+    return None
 
 
 def run_downloads_for_playlist(
@@ -471,79 +600,81 @@ def run_downloads_for_playlist(
     Startet die Downloads für eine Playlist basierend auf der Extended-JSON.
 
     - nutzt plan_downloads_for_playlist() für die Jobliste
-    - entscheidet anhand MAX_PARALLEL_DOWNLOADS, ob sequentiell oder parallel
-    - verwendet DOWNLOAD_MAX_RETRIES für Wiederholungsversuche
+    - verarbeitet die Jobs als Pipeline (download_pipeline.py) mit eigenen
+      Worker-Pools je Stufe:
+        download  max_parallel_downloads (mit download_max_retries Retries)
+        reencode  reencode_workers (0 = CPU-Kerne, ffmpeg über den
+                  ReencodeScheduler in reencode_engine.py)
+        tag       tag_workers
+        register  1 (SQLite, nur bei RegistryEnabled)
+      verbunden über Queues mit pipeline_queue_size Plätzen
+    - download_engine: "subprocess" (yt-dlp-Prozess pro Job) oder
+      "inprocess" (langlebige Worker-Prozesse, siehe ytdlp_engine.py)
+
+    Alle Werte kommen beim Aufruf aus get_settings(), d. h. inkl.
+    CLI-Overrides (`run-downloads --jobs/--retries/--engine/...`).
     """
+    settings = get_settings()
+    max_parallel = settings.max_parallel_downloads
+    max_retries = settings.download_max_retries
+
     jobs = plan_downloads_for_playlist(playlist_id, limit=limit)
     if not jobs:
         print("[RUN] Keine Downloads geplant - Abbruch.")
         return
 
+    resolve_download_targets(jobs)
+
+    download_workers = max(1, min(max_parallel, len(jobs)))
+    reencode_workers = resolve_reencode_workers(settings.reencode_workers)
+    engine = open_download_engine(
+        settings.download_engine,
+        build_format_selector(),
+        download_workers,
+    )
+
     print(
         f"[RUN] Starte Downloads für Playlist {playlist_id} "
         f"({len(jobs)} Track(s))"
     )
-    print(f"[RUN] Konfiguration: max. parallele Downloads = {MAX_PARALLEL_DOWNLOADS}")
-    print(f"[RUN] Konfiguration: max. Retries pro Job     = {DOWNLOAD_MAX_RETRIES}")
+    print(f"[RUN] Konfiguration: max. parallele Downloads = {max_parallel}")
+    print(f"[RUN] Konfiguration: max. Retries pro Job     = {max_retries}")
+    print(f"[RUN] Konfiguration: parallele Reencodes      = {reencode_workers}")
+    print(f"[RUN] Konfiguration: parallele Tagging-Worker = {settings.tag_workers}")
+    print(f"[RUN] Konfiguration: Queue-Plätze je Stufe    = {settings.pipeline_queue_size}")
+    print(
+        "[RUN] Konfiguration: Download-Engine          = "
+        f"{engine.name if engine is not None else 'subprocess'}"
+    )
     print()
 
-    # Sequential Mode
-    if MAX_PARALLEL_DOWNLOADS <= 1:
-        results: Dict[int, bool] = {}
-        for job in jobs:
-            success = False
-            attempts = DOWNLOAD_MAX_RETRIES + 1
-            for attempt in range(1, attempts + 1):
-                print(
-                    f"[RUN] Versuch {attempt}/{attempts} für "
-                    f"#{job.track_index + 1:02d}: {job.primary_artist} - {job.title}"
-                )
-                success = _run_single_job(job)
-                if success:
-                    break
-                elif attempt < attempts:
-                    print(
-                        f"[RUN] Retry geplant für "
-                        f"{job.primary_artist} - {job.title}"
-                    )
-                    # optionaler kleiner Backoff
-                    time.sleep(1.0)
-
-            results[job.track_index] = success
-
-        _print_summary(jobs, results)
-        return
-
-    # Parallel Mode mit Threads
-    job_queue: Queue[DownloadJob] = Queue()
-    results_parallel: Dict[int, bool] = {}
-
-    for job in jobs:
-        job_queue.put(job)
+    results: Dict[int, bool] = {}
+    stages = [
+        Stage(
+            "download",
+            download_workers,
+            lambda job: _download_stage(job, engine, max_retries, results),
+        ),
+        Stage("reencode", reencode_workers, _reencode_stage),
+        Stage("tag", settings.tag_workers, _tag_stage),
+    ]
+    if settings.registry_enabled:
+        stages.append(Stage("register", 1, _register_stage))
 
-    workers: list[threading.Thread] = []
-    worker_count = min(MAX_PARALLEL_DOWNLOADS, len(jobs))
+    reset_reencode_stats()
+    try:
+        stats = run_pipeline(jobs, stages, settings.pipeline_queue_size)
+    finally:
+        if engine is not None:
+            engine.close()
 
-    print(f"[RUN] Starte {worker_count} Worker-Thread(s).")
+    _print_summary(jobs, results)
     print()
-
-    for i in range(worker_count):
-        t = threading.Thread(
-            target=_worker_thread,
-            args=(f"W{i+1}", job_queue, results_parallel),
-            daemon=True,
-        )
-        t.start()
-        workers.append(t)
-
-    # Warten, bis Queue leer ist
-    job_queue.join()
-
-    # Optional: auf Threads warten
-    for t in workers:
-        t.join(timeout=0.1)
-
-    _print_summary(jobs, results_parallel)
+    print(f"[PIPELINE] Laufzeit {stats.wall_seconds:.1f} s")
+    for line in format_pipeline_stats(stats):
+        print(f"[PIPELINE] {line}")
+    if get_reencode_stats()["submitted"]:
+        print(f"[REENCODE] {format_reencode_stats(stats.wall_seconds)}")
 
 
 def _print_summary(
@@ -576,10 +707,87 @@ def _print_summary(
                 )
 
 
+def _retag_single_job(job: DownloadJob, update_registry: bool) -> str:
+    """
+    Tagging (und optional Registry-Update) für eine bereits heruntergeladene
+    Datei. Inkompatible Formate werden vorher – falls erlaubt – über den
+    ReencodeScheduler reencoded.
+    Rückgabe: "tagged", "skipped" (keine Datei) oder "failed".
+    """
+    audio_path = _find_downloaded_file(job)
+    if audio_path is None:
+        print(
+            f"[TAG-SKIP] Keine Datei gefunden für "
+            f"#{job.track_index + 1:02d}: "
+            f"{job.primary_artist} - {job.title}"
+        )
+        return "skipped"
+
+    new_path = reencode_if_needed(audio_path)
+    if new_path is not None:
+        audio_path = new_path
+
+    # 1) Tagging anwenden
+    meta = job.track_meta or {}
+    try:
+        apply_tags_to_file(audio_path, meta)
+        print(f"[TAG] Tags angewendet: {audio_path.name}")
+    except Exception as exc:  # noqa: BLE001
+        print(
+            f"[TAG-ERROR] Tagging fehlgeschlagen für "
+            f"{audio_path.name}: {exc}"
+        )
+        return "failed"
+
+    # 2) Optional Registry-Update
+    settings = get_settings()
+    if settings.registry_enabled and update_registry and job.spotify_track_id:
+        try:
+            duration_ms = meta.get("duration_ms")
+            source_url = job.spotify_url if settings.registry_store_spotify_url else None
+
+            track_info = TrackInfo(
+                spotify_track_id=job.spotify_track_id,
+                title=job.title,
+                primary_artist=job.primary_artist,
+                duration_ms=duration_ms,
+                source_url=source_url,
+            )
+            register_file_for_track(track_info, audio_path)
+            print(f"[REG] Datei registriert (Tag-Run): {audio_path}")
+        except Exception as exc:  # noqa: BLE001
+            print(
+                f"[REG-ERROR] Registrierung (Tag-Run) fehlgeschlagen "
+                f"für {audio_path}: {exc}"
+            )
+
+    return "tagged"
+
+
+def _retag_with_retries(
+    job: DownloadJob,
+    update_registry: bool,
+    max_retries: int,
+) -> str:
+    """_retag_single_job() mit bis zu 'max_retries' Wiederholungen bei "failed"."""
+    outcome = _retag_single_job(job, update_registry)
+    for attempt in range(1, max_retries + 1):
+        if outcome != "failed":
+            break
+        print(
+            f"[TAG-PLAYLIST] Retry {attempt}/{max_retries} für "
+            f"{job.primary_artist} - {job.title}"
+        )
+        time.sleep(1.0)  # kleiner Backoff
+        outcome = _retag_single_job(job, update_registry)
+    return outcome
+
+
 def retag_downloads_for_playlist(
     playlist_id: str,
     limit: int | None = None,
     update_registry: bool = True,
+    jobs: int | None = None,
 ) -> None:
     """
     Wendet das Tagging (und optional Registry-Update) auf bereits
@@ -588,83 +796,56 @@ def retag_downloads_for_playlist(
     Voraussetzung:
     - Extended-JSON der Playlist existiert (export wurde bereits ausgeführt)
     - Die Audiodateien liegen im erwarteten Zielordner
+
+    jobs: Anzahl Dateien, die gleichzeitig getaggt werden (Default:
+    tag_workers aus get_settings(), CLI `tag-playlist --jobs`). Fehlgeschlagene
+    Dateien werden bis zu download_max_retries Mal erneut versucht
+    (`tag-playlist --retries`).
     """
+    settings = get_settings()
+    max_retries = settings.download_max_retries
 
-    data = load_playlist_data(playlist_id)
-    jobs = build_jobs_from_playlist_data(playlist_id, data)
+    download_jobs = list(iter_download_jobs(playlist_id, limit=limit))
 
-    if limit is not None and limit >= 0:
-        jobs = jobs[:limit]
-
-    if not jobs:
+    if not download_jobs:
         print(f"[TAG-PLAYLIST] Keine Tracks für Playlist {playlist_id} gefunden.")
         return
 
+    worker_count = max(1, min(jobs or settings.tag_workers, len(download_jobs)))
+
     print(
         f"[TAG-PLAYLIST] Starte Tagging für Playlist {playlist_id} "
-        f"({len(jobs)} Track(s))"
+        f"({len(download_jobs)} Track(s), {worker_count} Worker)"
     )
     print(
         f"[TAG-PLAYLIST] Registry-Update: "
-        f"{'aktiv' if (REGISTRY_ENABLED and update_registry) else 'deaktiviert'}"
+        f"{'aktiv' if (settings.registry_enabled and update_registry) else 'deaktiviert'}"
     )
     print()
 
-    tagged = 0
-    skipped = 0
-    failed = 0
-
-    for job in jobs:
-        audio_path = _find_downloaded_file(job)
-        if audio_path is None:
-            print(
-                f"[TAG-SKIP] Keine Datei gefunden für "
-                f"#{job.track_index + 1:02d}: "
-                f"{job.primary_artist} - {job.title}"
-            )
-            skipped += 1
-            continue
-
-        # 1) Tagging anwenden
-        meta = job.track_meta or {}
-        try:
-            apply_tags_to_file(audio_path, meta)
-            print(f"[TAG] Tags angewendet: {audio_path.name}")
-            tagged += 1
-        except Exception as exc:  # noqa: BLE001
-            print(
-                f"[TAG-ERROR] Tagging fehlgeschlagen für "
-                f"{audio_path.name}: {exc}"
-            )
-            failed += 1
-            continue
-
-        # 2) Optional Registry-Update
-        if REGISTRY_ENABLED and update_registry and job.spotify_track_id:
-            try:
-                duration_ms = meta.get("duration_ms")
-                source_url = job.spotify_url if REGISTRY_STORE_SPOTIFY_URL else None
-
-                track_info = TrackInfo(
-                    spotify_track_id=job.spotify_track_id,
-                    title=job.title,
-                    primary_artist=job.primary_artist,
-                    duration_ms=duration_ms,
-                    source_url=source_url,
-                )
-                register_file_for_track(track_info, audio_path)
-                print(f"[REG] Datei registriert (Tag-Run): {audio_path}")
-            except Exception as exc:  # noqa: BLE001
-                print(
-                    f"[REG-ERROR] Registrierung (Tag-Run) fehlgeschlagen "
-                    f"für {audio_path}: {exc}"
+    reset_reencode_stats()
+    started = time.perf_counter()
+    if worker_count <= 1:
+        outcomes = [
+            _retag_with_retries(job, update_registry, max_retries)
+            for job in download_jobs
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=worker_count) as pool:
+            outcomes = list(
+                pool.map(
+                    lambda job: _retag_with_retries(job, update_registry, max_retries),
+                    download_jobs,
                 )
+            )
 
     print()
     print("====== TAG-PLAYLIST-SUMMARY ======")
-    print(f"Getaggte Dateien:        {tagged}")
-    print(f"Übersprungen (fehlt):    {skipped}")
-    print(f"Fehler beim Tagging:     {failed}")
+    print(f"Getaggte Dateien:        {outcomes.count('tagged')}")
+    print(f"Übersprungen (fehlt):    {outcomes.count('skipped')}")
+    print(f"Fehler beim Tagging:     {outcomes.count('failed')}")
     print("==================================")
+    if get_reencode_stats()["submitted"]:
+        print(f"[REENCODE] {format_reencode_stats(time.perf_counter() - started)}")
 
 # Ende yt_dlp_runner.py
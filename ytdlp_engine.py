@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import importlib.util
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+# ---------------------------------------------------------------------------
+# In-Process-Engine für yt-dlp (DownloadEngine = "inprocess")
+# ---------------------------------------------------------------------------
+#
+# Die Standard-Engine startet pro Track und Versuch ein eigenes `yt-dlp`
+# (Interpreterstart, Import, Extractor-Initialisierung – oft ~1 s, bevor
+# überhaupt ein Byte geladen wird). Diese Engine nutzt yt-dlp als Bibliothek:
+# - ein Pool langlebiger Worker-Prozesse (ein Prozess pro Download-Worker)
+# - jeder Prozess importiert yt_dlp einmal; pro Job entsteht eine frische
+#   YoutubeDL-Instanz mit dem Ausgabe-Template des Jobs (Optionen nur über
+#   die öffentliche API, kein Zustand aus dem vorherigen Job). Bereits
+#   importierte Extractor-Module bleiben im Prozess geladen.
+# - Format-Selector und Ausgabe-Template sind dieselben wie im
+#   subprocess-Befehl (yt_dlp_runner.build_format_selector /
+#   build_output_template)
+#
+# Nachbearbeitung (Reencode, Tagging, Registry) bleibt im Hauptprozess.
+# Ist das Python-Paket yt_dlp nicht installiert, fällt open_download_engine()
+# auf die subprocess-Engine zurück.
+
+ENGINE_SUBPROCESS = "subprocess"
+ENGINE_INPROCESS = "inprocess"
+DOWNLOAD_ENGINES = (ENGINE_SUBPROCESS, ENGINE_INPROCESS)
+
+
+@dataclass
+class EngineResult:
+    """Ergebnis eines Downloads – wie returncode/stderr von subprocess.run."""
+    returncode: int
+    stderr: str = ""
+
+
+def is_available() -> bool:
+    """True, wenn das Python-Paket yt_dlp importierbar ist."""
+    return importlib.util.find_spec("yt_dlp") is not None
+
+
+def build_ydl_options(
+    format_selector: str,
+    output_template: str,
+    logger: Any = None,
+) -> Dict[str, Any]:
+    """
+    YoutubeDL-Optionen, die `yt-dlp --no-playlist -f <format_selector>
+    -o <output_template>` entsprechen (ohne Fortschrittsausgabe).
+    """
+    options: Dict[str, Any] = {
+        "format": format_selector,
+        "outtmpl": output_template,
+        "noplaylist": True,
+        "quiet": True,
+        "no_warnings": True,
+        "noprogress": True,
+    }
+    if logger is not None:
+        options["logger"] = logger
+    return options
+
+
+# ---------------------------------------------------------------------------
+# Worker-Prozess
+# ---------------------------------------------------------------------------
+
+class _CollectingLogger:
+    """Sammelt Fehlermeldungen eines Jobs (Ersatz für stderr)."""
+
+    def __init__(self) -> None:
+        self.errors: List[str] = []
+
+    def debug(self, msg: str) -> None:
+        pass
+
+    def info(self, msg: str) -> None:
+        pass
+
+    def warning(self, msg: str) -> None:
+        pass
+
+    def error(self, msg: str) -> None:
+        self.errors.append(msg)
+
+
+_format_selector: Optional[str] = None
+
+
+def _init_worker(format_selector: str) -> None:
+    """Initializer des Pools: yt_dlp einmal pro Worker-Prozess importieren."""
+    global _format_selector
+
+    importlib.import_module("yt_dlp")
+    _format_selector = format_selector
+
+
+def _download_in_worker(query: str, output_template: str) -> EngineResult:
+    """Lädt einen Job mit einer eigenen YoutubeDL-Instanz."""
+    from yt_dlp import YoutubeDL
+    from yt_dlp.utils import DownloadError
+
+    assert _format_selector is not None
+    logger = _CollectingLogger()
+    options = build_ydl_options(_format_selector, output_template, logger)
+
+    try:
+        with YoutubeDL(options) as ydl:
+            returncode = ydl.download([query])
+    except DownloadError as exc:
+        returncode = 1
+        if not logger.errors:
+            logger.errors.append(str(exc))
+    except Exception as exc:  # noqa: BLE001
+        returncode = 1
+        logger.errors.append(f"{type(exc).__name__}: {exc}")
+
+    return EngineResult(returncode, "\n".join(logger.errors))
+
+
+# ---------------------------------------------------------------------------
+# Engine im Hauptprozess
+# ---------------------------------------------------------------------------
+
+class InProcessEngine:
+    """
+    Pool langlebiger yt-dlp-Worker-Prozesse. download() blockiert den
+    aufrufenden Download-Thread, bis ein Worker den Job erledigt hat.
+    """
+
+    name = ENGINE_INPROCESS
+
+    def __init__(self, format_selector: str, workers: int) -> None:
+        self.format_selector = format_selector
+        self.workers = max(1, workers)
+
+        self._lock = threading.Lock()
+        self._pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # "spawn": die Download-Threads des Hauptprozesses laufen bereits,
+        # fork wäre hier nicht sicher
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.format_selector,),
+        )
+
+    def download(self, query: str, output_template: str) -> EngineResult:
+        with self._lock:
+            pool = self._pool
+        try:
+            return pool.submit(_download_in_worker, query, output_template).result()
+        except BrokenProcessPool as exc:
+            # Worker abgestürzt: Pool ersetzen, damit Retries wieder laufen
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = self._new_pool()
+            return EngineResult(1, f"yt-dlp-Worker abgebrochen: {exc}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "InProcessEngine":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def open_download_engine(
+    name: str,
+    format_selector: str,
+    workers: int,
+) -> Optional[InProcessEngine]:
+    """
+    Liefert die In-Process-Engine für name == "inprocess", sonst None
+    (= ein yt-dlp-Prozess pro Job). Ohne installiertes yt_dlp-Paket gibt es
+    eine Warnung und ebenfalls None.
+    """
+    if name != ENGINE_INPROCESS:
+        return None
+
+    if not is_available():
+        print(
+            "[WARN] DownloadEngine 'inprocess' benötigt das Python-Paket yt_dlp "
+            "(pip install yt-dlp) – nutze yt-dlp als Subprozess."
+        )
+        return None
+
+    return InProcessEngine(format_selector, workers)